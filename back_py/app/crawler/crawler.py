@@ -1,8 +1,10 @@
 import time
 import csv
 import os
-import re
-import hashlib
+import sys
+import threading
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
@@ -10,10 +12,16 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
+
+# crawler 디렉터리에서 단독 실행해도 app 패키지(카탈로그 버전)를 import 할 수 있도록
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from app.services.catalog_version import bump_catalog_version
 
 # ✅ DB & Vector utils
-from db_utils import save_to_mysql
+from db_utils import save_many_to_mysql
 from vector_utils import save_to_vector_db
+from listing_parser import parse_listing_html, make_product, parse_memory_price, parse_plain_price, is_memory_category
 
 
 # -----------------------
@@ -35,6 +43,15 @@ CONFIG = {
 
 OUTPUT_CSV = f"./data/danawa_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
 
+CRAWL_WORKERS = int(os.getenv("CRAWL_WORKERS", "3"))      # 동시에 띄울 Chrome 수
+PAGE_TIMEOUT = float(os.getenv("CRAWL_PAGE_TIMEOUT", "15"))  # 목록 로딩/페이지 전환 최대 대기(초)
+
+ITEM_SELECTOR = "div.main_prodlist > ul.product_list > li.prod_item"
+
+# html: page_source 한 번 받아 lxml로 파싱 / webdriver: 기존 요소별 조회
+CRAWL_PARSE_MODE = os.getenv("CRAWL_PARSE_MODE", "html")
+CRAWL_SNAPSHOT_DIR = os.getenv("CRAWL_SNAPSHOT_DIR", "")   # 지정하면 페이지별 HTML 저장
+
 
 # -----------------------
 # 드라이버 초기화
@@ -46,25 +63,59 @@ def init_driver():
     chrome_options.add_argument("--disable-dev-shm-usage")
     service = Service()
     driver = webdriver.Chrome(service=service, options=chrome_options)
-    driver.implicitly_wait(5)
+    # 암묵적 대기는 끔: 없는 요소(스펙/가격 누락)마다 5초씩 멈추지 않도록, 대기는 WebDriverWait 조건으로만
+    driver.implicitly_wait(0)
     return driver
 
 
+class DriverPool:
+    """Chrome 드라이버를 최대 size개까지 만들어 돌려 쓰는 풀"""
+
+    def __init__(self, size: int):
+        self.size = size
+        self._idle = []
+        self._all = []
+        self._creating = 0   # 만드는 중인 드라이버 수 (자리 예약)
+        self._available = threading.Condition()
+
+    def acquire(self):
+        with self._available:
+            while not self._idle and len(self._all) + self._creating >= self.size:
+                self._available.wait()
+            if self._idle:
+                return self._idle.pop()
+            self._creating += 1
+
+        try:
+            driver = init_driver()
+        except Exception:
+            # 실패하면 예약한 자리를 돌려주고 기다리던 쪽이 다시 시도하게 함
+            with self._available:
+                self._creating -= 1
+                self._available.notify()
+            raise
+        with self._available:
+            self._creating -= 1
+            self._all.append(driver)
+        return driver
+
+    def release(self, driver):
+        with self._available:
+            self._idle.append(driver)
+            self._available.notify()
+
+    def quit_all(self):
+        for driver in self._all:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+
 # -----------------------
 # 유틸
 # -----------------------
 
-def stable_id_from_link(link: str, category: str = "", capacity: str = "", name: str ="") -> str:
-    """링크 + 카테고리 + 용량을 조합해서 고유 ID 생성"""
-    if not capacity:
-        capacity = "N/A"
-    match = re.search(r"pcode=(\d+)",link)
-    pcode = match.group(1) if match else link
-    unique_key = f"{category}_{capacity}_{pcode}_{name}"
-    return hashlib.sha256(unique_key.encode("utf-8-sig")).hexdigest()[:16]
-
-
-
 def ensure_csv_header(path: str):
     """CSV 파일 생성 및 헤더 보장"""
     os.makedirs(os.path.dirname(path), exist_ok=True)
@@ -90,144 +141,208 @@ def append_to_csv(product: dict):
         ])
 
 
-def clean_capacity(category: str, raw_text: str):
-    """RAM/HDD 용량 정제"""
-    if not raw_text:
-        return ""
+# -----------------------
+# 크롤링 로직
+# -----------------------
+def wait_for_items(driver):
+    """상품 목록이 나타날 때까지 대기 (없으면 빈 리스트)"""
+    try:
+        return WebDriverWait(driver, PAGE_TIMEOUT).until(
+            EC.presence_of_all_elements_located((By.CSS_SELECTOR, ITEM_SELECTOR))
+        )
+    except TimeoutException:
+        return []
+
 
-    text = raw_text.strip()
+def move_to_page(driver, page: int, previous_first):
+    """기본 URL을 다시 열지 않고 movePage()로 이동한 뒤, 이전 목록이 교체될 때까지 대기"""
+    driver.execute_script(f"movePage({page});")
+    if previous_first is not None:
+        WebDriverWait(driver, PAGE_TIMEOUT).until(EC.staleness_of(previous_first))
+    return wait_for_items(driver)
 
-    # RAM: 수량형, 벌크 등 제외
-    if category.upper().startswith("RAM"):
-        skip_words = ["수량", "벌크", "세트", "패키지"]
-        if any(word in text for word in skip_words):
-            return ""
 
-    # HDD: 쉼표 뒤 모델명 제거
-    if category.upper().startswith("HDD"):
-        text = text.split(",")[0].strip()
+def parse_item(item, category: str):
+    """[webdriver 모드] 상품 li 하나 → 상품 dict 목록 (메모리류는 용량별 변형 상품 여러 개)"""
+    results = []
+
+    name_el = item.find_element(By.CSS_SELECTOR, "p.prod_name a")
+    base_name = name_el.text.strip()
+
+    # 스펙
+    try:
+        spec_el = item.find_element(By.CLASS_NAME, "spec_list")
+        spec_text = spec_el.get_attribute("textContent").strip()
+    except:
+        spec_text = ""
+
+    # ✅ 용량별 변형 상품 추출 (RAM, SSD, HDD 등)
+    if is_memory_category(category):
+        variant_elems = item.find_elements(By.CSS_SELECTOR, "div.prod_pricelist ul li")
+        for v in variant_elems:
+            try:
+                raw_capacity = v.find_element(By.CSS_SELECTOR, "p.memory_sect span.text").text.strip()
+            except:
+                raw_capacity = ""
+            try:
+                price = parse_memory_price(v.find_element(By.CSS_SELECTOR, "p.price_sect strong").text)
+            except:
+                price = None
+
+            try:
+                link = v.find_element(By.CSS_SELECTOR, "p.price_sect a").get_attribute("href")
+            except:
+                link = name_el.get_attribute("href")
+
+            results.append(make_product(category, base_name, spec_text, price, link, raw_capacity))
+    else:
+        # 일반 상품 (CPU 등)
+        try:
+            price = parse_plain_price(item.find_element(By.CSS_SELECTOR, "p.price_sect strong").text)
+        except:
+            price = None
+
+        results.append(make_product(category, base_name, spec_text, price, name_el.get_attribute("href")))
+
+    return results
+
+
+def save_snapshot(driver, category: str, page: int):
+    """현재 목록 페이지 HTML 저장 (오프라인 파싱/회귀 비교용)"""
+    os.makedirs(CRAWL_SNAPSHOT_DIR, exist_ok=True)
+    path = os.path.join(CRAWL_SNAPSHOT_DIR, f"{category}_p{page}.html")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(driver.page_source)
 
-    return text
 
-# -----------------------
-# 크롤링 로직
-# -----------------------
 def parse_products(driver, category: str, url: str, max_pages: int):
     results = []
 
+    # 기본 URL은 한 번만 열고, 이후 페이지는 movePage()로 이동
+    driver.get(url)
+    items = wait_for_items(driver)
+
     for page in range(1, max_pages + 1):
         print(f"  🔹 {category} {page}페이지 크롤링 중...")
-        driver.get(url)
-        time.sleep(2)
 
         if page > 1:
             try:
-                js_code = f"movePage({page});"
-                driver.execute_script(js_code)
-                time.sleep(2.5)  # 페이지 로딩 대기
+                items = move_to_page(driver, page, items[0] if items else None)
             except Exception as e:
                 print(f"⚠️ 페이지 이동 실패 (page={page}): {e}")
-                continue
+                break
 
-        items = driver.find_elements(
-            By.CSS_SELECTOR, "div.main_prodlist > ul.product_list > li.prod_item"
-        )
         if not items:
             print(f"[{category}] page {page}: no items found")
             break
 
-        for item in items:
-            try:
-                name_el = item.find_element(By.CSS_SELECTOR, "p.prod_name a")
-                base_name = name_el.text.strip()
+        if CRAWL_SNAPSHOT_DIR:
+            save_snapshot(driver, category, page)
 
-                # 스펙
-                try:
-                    spec_el = item.find_element(By.CLASS_NAME, "spec_list")
-                    spec_text = spec_el.get_attribute("textContent").strip()
-                except:
-                    spec_text = ""
-
-                is_memeory_category = category.upper() in ["RAM", "SSD", "HDD"]
-                # ✅ 용량별 변형 상품 추출 (RAM, SSD, HDD 등)
-                if is_memeory_category:
-                    variant_elems = item.find_elements(By.CSS_SELECTOR, "div.prod_pricelist ul li")
-                    for v in variant_elems:
-                        try:
-                            raw_capacity = v.find_element(By.CSS_SELECTOR, "p.memory_sect span.text").text.strip()
-                        except:
-                            raw_capacity = ""
-                        capacity = clean_capacity(category, raw_capacity)
-                        if not capacity:
-                            capacity="N/A"
-                        try:
-                            price_text = v.find_element(By.CSS_SELECTOR, "p.price_sect strong").text.strip()
-                            price = int(price_text.replace(",", "").replace("원", ""))
-                        except:
-                            price = None
-
-                        try:
-                            link = v.find_element(By.CSS_SELECTOR, "p.price_sect a").get_attribute("href")
-                        except:
-                            link = name_el.get_attribute("href")
-
-                        results.append({
-                            "id": stable_id_from_link(link,category,capacity,f"{base_name} ({capacity})" if capacity else base_name),
-                            "name": f"{base_name} ({capacity})" if capacity else base_name,
-                            "price": price,
-                            "capacity": capacity,
-                            "link": link,
-                            "category": category,
-                            "spec": spec_text,
-                            "updated_at": datetime.now().isoformat(),
-                        })
-                else:
-                    # 일반 상품 (CPU 등)
-                    try:
-                        price_el = item.find_element(By.CSS_SELECTOR, "p.price_sect strong")
-                        price_text = price_el.text.replace(",", "").replace("원", "").strip()
-                        price = int(price_text) if price_text.isdigit() else None
-                    except:
-                        price = None
-
-                    link = name_el.get_attribute("href")
-
-                    results.append({
-                        "id": stable_id_from_link(link,category,"N/A",base_name),
-                        "name": base_name,
-                        "price": price,
-                        "capacity": "N/A",
-                        "link": link,
-                        "category": category,
-                        "spec": spec_text,
-                        "updated_at": datetime.now().isoformat(),
-                    })
+        if CRAWL_PARSE_MODE == "html":
+            # 페이지 소스를 한 번만 받아서 lxml로 전체 상품 파싱 (요소별 WebDriver 호출 없음)
+            results.extend(parse_listing_html(driver.page_source, category, driver.current_url))
+            continue
 
+        for item in items:
+            try:
+                results.extend(parse_item(item, category))
             except Exception:
                 continue
 
     return results
 
 
+def crawl_category(pool: DriverPool, category: str, url: str, max_pages: int):
+    driver = pool.acquire()
+    try:
+        return parse_products(driver, category, url, max_pages)
+    finally:
+        pool.release(driver)
+
+
+def crawl_all(config: dict, workers: int = CRAWL_WORKERS):
+    """카테고리들을 드라이버 풀(최대 workers개)에서 병렬 크롤링. 끝나는 순서대로 (카테고리, 상품목록) 반환"""
+    pool = DriverPool(workers)
+    try:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="crawl") as executor:
+            futures = {
+                executor.submit(crawl_category, pool, category, url, max_pages): category
+                for category, (url, max_pages) in config.items()
+            }
+            for future in as_completed(futures):
+                category = futures[future]
+                try:
+                    yield category, future.result()
+                except Exception as e:
+                    print(f"❌ [{category}] 크롤링 실패: {e}")
+                    yield category, []
+    finally:
+        pool.quit_all()
+
+
 # -----------------------
 # 메인 실행
 # -----------------------
-def main():
-    driver = init_driver()
-    ensure_csv_header(OUTPUT_CSV)
+def fixture_config(path: str, max_pages: int = 3):
+    """로컬 HTML(fixture)로 모든 카테고리 URL을 바꿔치기 (브라우저 동작 검증용)"""
+    url = path if "://" in path else f"file://{os.path.abspath(path)}"
+    return {category: (url, max_pages) for category in CONFIG}
+
 
-    for category, (url, max_pages) in CONFIG.items():
-        print(f"\n▶ 카테고리: {category}")
-        products = parse_products(driver, category, url, max_pages)
+def main(config: dict = None, workers: int = CRAWL_WORKERS, dry_run: bool = False):
+    config = config or CONFIG
+    if not dry_run:
+        ensure_csv_header(OUTPUT_CSV)
+
+    started = time.perf_counter()
+    vector_total = {}
+    mysql_changed = 0
+    for category, products in crawl_all(config, workers):
+        print(f"\n▶ 카테고리: {category} ({len(products)}개)")
+        if dry_run:
+            continue
 
         for p in products:
             append_to_csv(p)
-            save_to_mysql(p)
-        save_to_vector_db(products)
 
-    driver.quit()
-    print(f"\n✅ 모든 크롤링 및 저장 완료 → {OUTPUT_CSV}")
+        # 카테고리 단위 일괄 upsert (청크마다 트랜잭션 1회)
+        stats = save_many_to_mysql(products)
+        print(f"🗄️ [MySQL] {category}: 신규 {stats['inserted']} / 변경 {stats['updated']} / 동일 {stats['unchanged']} / 실패 {stats['failed']}")
+        mysql_changed += stats["inserted"] + stats["updated"]
+        for k, v in save_to_vector_db(products).items():
+            vector_total[k] = vector_total.get(k, 0) + v
+
+    # 전체 카테고리 반영이 끝난 뒤 한 번만, 실제로 바뀐 게 있을 때만 서빙 쪽 캐시(hint 결과 등) 무효화
+    # (카테고리마다 올리면 크롤링 도중 캐시가 계속 비워져서 부분 반영 상태로 다시 채워짐)
+    vector_changed = sum(vector_total.get(k, 0) for k in ("new", "reembedded", "metadata_updated", "removed"))
+    if mysql_changed or vector_changed:
+        try:
+            bump_catalog_version()
+        except Exception as e:
+            print(f"⚠️ [CatalogVersion] 버전 갱신 실패: {e}")
+    elif not dry_run:
+        print("ℹ️ [CatalogVersion] 변경 없음 → 캐시 유지")
+
+    if vector_total:
+        print(
+            f"\n🧾 [Chroma] 이번 크롤링 변경분: 신규 {vector_total['new']} / 재임베딩 {vector_total['reembedded']} / "
+            f"메타데이터만 {vector_total['metadata_updated']} / 삭제 {vector_total['removed']} (동일 {vector_total['unchanged']}, 임베딩 실패 {vector_total['embed_failed']})"
+        )
+    print(f"\n✅ 모든 크롤링 및 저장 완료 → {OUTPUT_CSV} ({time.perf_counter() - started:.1f}s)")
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="다나와 상품 크롤러")
+    parser.add_argument("--workers", type=int, default=CRAWL_WORKERS, help="동시에 띄울 Chrome 수")
+    parser.add_argument("--categories", help="쉼표로 구분한 카테고리만 크롤링 (예: CPU,RAM)")
+    parser.add_argument("--fixture", help="다나와 대신 사용할 로컬 목록 HTML 경로 또는 URL")
+    parser.add_argument("--dry-run", action="store_true", help="CSV/MySQL/Chroma 저장 없이 크롤링만")
+    args = parser.parse_args()
+
+    config = fixture_config(args.fixture) if args.fixture else dict(CONFIG)
+    if args.categories:
+        wanted = set(args.categories.split(","))
+        config = {c: v for c, v in config.items() if c in wanted}
+
+    main(config, args.workers, args.dry_run)
@@ -1,41 +1,98 @@
-import mysql.connector
+import os
+import sys
+from itertools import islice
 from datetime import datetime
 
-def get_connection():
-    return mysql.connector.connect(
-        host="db",        
-        user="root",
-        password="1234",
-        database="project",
-        charset="utf8mb4",
-        collation="utf8mb4_unicode_ci"
-    )
+# crawler 디렉터리에서 단독 실행해도 app 패키지(공용 커넥션 풀)를 import 할 수 있도록
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from app.services.db_pool import get_connection
+from app.services.product_classifier import classify_product, CLASSIFIED_COLUMNS
+
+# 한 트랜잭션(= executemany 1회)에 넣을 최대 행 수
+MYSQL_BATCH_SIZE = int(os.getenv("MYSQL_BATCH_SIZE", "500"))
+
+# 분류 컬럼(가짜 부품 / 메모리 세대 / NVMe / 소켓 / 칩셋 / 인터페이스 / 용량(W) / 규격)은 CLASSIFIED_COLUMNS 순서
+_CLASSIFIED_UPDATES = ",\n        ".join(f"{col}=VALUES({col})" for col in CLASSIFIED_COLUMNS)
+UPSERT_SQL = f"""
+    INSERT INTO {{table}} (fingerprint, name, category, spec, price, capacity, link, updated_at, {', '.join(CLASSIFIED_COLUMNS)})
+    VALUES ({', '.join(['%s'] * (8 + len(CLASSIFIED_COLUMNS)))})
+    ON DUPLICATE KEY UPDATE
+        price=VALUES(price),
+        capacity=VALUES(capacity),
+        spec=VALUES(spec),
+        updated_at=VALUES(updated_at),
+        {_CLASSIFIED_UPDATES}
+"""
 
-def save_to_mysql(product):
-    conn = get_connection()
-    cursor = conn.cursor()
-
-    cursor.execute(
-        """
-        INSERT INTO product (fingerprint, name, category, spec, price, capacity, link, updated_at)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-        ON DUPLICATE KEY UPDATE
-            price=VALUES(price),
-            capacity=VALUES(capacity),
-            spec=VALUES(spec),
-            updated_at=VALUES(updated_at)
-        """,
-        (
-            product["id"],               # ✅ stable_id_from_link(link) → fingerprint로 사용
-            product["name"],
-            product["category"],
-            product["spec"],
-            int(product.get("price") or 0),
-            product.get("capacity"),
-            product["link"],
-            datetime.now()
-        ),
+def _to_row(product, now):
+    c = classify_product(product)   # ✅ 분류 + 스펙 속성 파싱 (적재 시 1회)
+    return (
+        product["id"],               # ✅ stable_id_from_link(link) → fingerprint로 사용
+        product["name"],
+        product["category"],
+        product["spec"],
+        int(product.get("price") or 0),
+        product.get("capacity"),
+        product["link"],
+        now,
+        *(c[col] for col in CLASSIFIED_COLUMNS),
     )
 
-    conn.commit()
-    conn.close()
+def save_to_mysql(product, table="product"):
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(UPSERT_SQL.format(table=table), _to_row(product, datetime.now()))
+        cursor.close()
+        conn.commit()
+
+def _chunks(iterable, size):
+    it = iter(iterable)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+def save_many_to_mysql(products, chunk_size=MYSQL_BATCH_SIZE, table="product"):
+    """제품 목록(또는 스트림)을 chunk_size 단위 executemany + 트랜잭션 1회로 upsert.
+    반환: {"inserted", "updated", "unchanged", "failed"}"""
+    stats = {"inserted": 0, "updated": 0, "unchanged": 0, "failed": 0}
+
+    with get_connection() as conn:
+        cursor = conn.cursor()
+
+        for chunk in _chunks(products, chunk_size):
+            # 같은 청크 안 중복 id는 마지막 값만 사용
+            chunk = list({p["id"]: p for p in chunk}.values())
+            now = datetime.now()
+            rows = [_to_row(p, now) for p in chunk]
+
+            try:
+                # 기존 값과 비교해서 신규/변경/동일 분류 (updated_at은 항상 갱신되므로 비교 제외)
+                placeholders = ", ".join(["%s"] * len(rows))
+                cursor.execute(
+                    f"SELECT fingerprint, spec, price, capacity, {', '.join(CLASSIFIED_COLUMNS)} FROM {table} WHERE fingerprint IN ({placeholders})",
+                    tuple(row[0] for row in rows)
+                )
+                existing = {fp: tuple(values) for fp, *values in cursor.fetchall()}
+
+                cursor.executemany(UPSERT_SQL.format(table=table), rows)
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                stats["failed"] += len(rows)
+                print(f"❌ [MySQL] 일괄 저장 실패 ({len(rows)}건 롤백): {e}")
+                continue
+
+            for row in rows:
+                before = existing.get(row[0])
+                if before is None:
+                    stats["inserted"] += 1
+                elif before != (row[3], row[4], row[5], *row[8:]):
+                    stats["updated"] += 1
+                else:
+                    stats["unchanged"] += 1
+
+        cursor.close()
+
+    return stats
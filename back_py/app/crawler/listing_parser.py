@@ -0,0 +1,180 @@
+import re
+import sys
+import json
+import time
+import hashlib
+import argparse
+from datetime import datetime
+from urllib.parse import urljoin
+
+from lxml import html as lxml_html
+
+
+# -----------------------
+# 공통 유틸 (WebDriver / HTML 파서 모드 공용)
+# -----------------------
+def stable_id_from_link(link: str, category: str = "", capacity: str = "", name: str ="") -> str:
+    """링크 + 카테고리 + 용량을 조합해서 고유 ID 생성"""
+    if not capacity:
+        capacity = "N/A"
+    match = re.search(r"pcode=(\d+)",link)
+    pcode = match.group(1) if match else link
+    unique_key = f"{category}_{capacity}_{pcode}_{name}"
+    return hashlib.sha256(unique_key.encode("utf-8-sig")).hexdigest()[:16]
+
+
+def clean_capacity(category: str, raw_text: str):
+    """RAM/HDD 용량 정제"""
+    if not raw_text:
+        return ""
+
+    text = raw_text.strip()
+
+    # RAM: 수량형, 벌크 등 제외
+    if category.upper().startswith("RAM"):
+        skip_words = ["수량", "벌크", "세트", "패키지"]
+        if any(word in text for word in skip_words):
+            return ""
+
+    # HDD: 쉼표 뒤 모델명 제거
+    if category.upper().startswith("HDD"):
+        text = text.split(",")[0].strip()
+
+    return text
+
+
+def is_memory_category(category: str) -> bool:
+    return category.upper() in ["RAM", "SSD", "HDD"]
+
+
+def parse_memory_price(price_text: str):
+    """메모리형 변형 가격 ("12,340원" → 12340, 숫자가 아니면 None)"""
+    try:
+        return int(price_text.strip().replace(",", "").replace("원", ""))
+    except (AttributeError, ValueError):
+        return None
+
+
+def parse_plain_price(price_text: str):
+    """일반 상품 가격 ("12,340원" → 12340, 숫자가 아니면 None)"""
+    if price_text is None:
+        return None
+    price_text = price_text.replace(",", "").replace("원", "").strip()
+    return int(price_text) if price_text.isdigit() else None
+
+
+def make_product(category: str, base_name: str, spec_text: str, price, link: str, raw_capacity: str = None):
+    """크롤링 결과 dict 생성. raw_capacity가 None이면 일반 상품, 아니면 용량별 변형 상품"""
+    if raw_capacity is None:
+        return {
+            "id": stable_id_from_link(link,category,"N/A",base_name),
+            "name": base_name,
+            "price": price,
+            "capacity": "N/A",
+            "link": link,
+            "category": category,
+            "spec": spec_text,
+            "updated_at": datetime.now().isoformat(),
+        }
+
+    capacity = clean_capacity(category, raw_capacity)
+    if not capacity:
+        capacity="N/A"
+    return {
+        "id": stable_id_from_link(link,category,capacity,f"{base_name} ({capacity})" if capacity else base_name),
+        "name": f"{base_name} ({capacity})" if capacity else base_name,
+        "price": price,
+        "capacity": capacity,
+        "link": link,
+        "category": category,
+        "spec": spec_text,
+        "updated_at": datetime.now().isoformat(),
+    }
+
+
+# -----------------------
+# 페이지 소스 한 번에 파싱 (lxml)
+# -----------------------
+def _cls(name: str) -> str:
+    """CSS 클래스 셀렉터(.name)에 해당하는 XPath 조건"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+ITEM_XPATH = f"//div[{_cls('main_prodlist')}]/ul[{_cls('product_list')}]/li[{_cls('prod_item')}]"
+NAME_XPATH = f".//p[{_cls('prod_name')}]//a"
+SPEC_XPATH = f".//*[{_cls('spec_list')}]"
+VARIANT_XPATH = f".//div[{_cls('prod_pricelist')}]//ul//li"
+CAPACITY_XPATH = f".//p[{_cls('memory_sect')}]//span[{_cls('text')}]"
+PRICE_XPATH = f".//p[{_cls('price_sect')}]//strong"
+PRICE_LINK_XPATH = f".//p[{_cls('price_sect')}]//a"
+
+
+def _first(el, xpath):
+    found = el.xpath(xpath)
+    return found[0] if found else None
+
+
+def _visible_text(el):
+    """WebDriver .text 와 같게 공백을 정리한 텍스트"""
+    return " ".join(el.text_content().split()) if el is not None else None
+
+
+def parse_listing_html(page_source: str, category: str, base_url: str = "") -> list[dict]:
+    """목록 페이지 HTML 한 장 → 상품 dict 목록 (WebDriver 모드와 같은 모양)"""
+    tree = lxml_html.fromstring(page_source)
+    results = []
+
+    for item in tree.xpath(ITEM_XPATH):
+        try:
+            name_el = _first(item, NAME_XPATH)
+            if name_el is None:
+                continue
+            base_name = _visible_text(name_el)
+            name_link = urljoin(base_url, name_el.get("href") or "")
+
+            spec_el = _first(item, SPEC_XPATH)
+            spec_text = spec_el.text_content().strip() if spec_el is not None else ""
+
+            # ✅ 용량별 변형 상품 추출 (RAM, SSD, HDD 등)
+            if is_memory_category(category):
+                for v in item.xpath(VARIANT_XPATH):
+                    raw_capacity = _visible_text(_first(v, CAPACITY_XPATH)) or ""
+                    price = parse_memory_price(_visible_text(_first(v, PRICE_XPATH)))
+                    link_el = _first(v, PRICE_LINK_XPATH)
+                    link = urljoin(base_url, link_el.get("href")) if link_el is not None and link_el.get("href") else name_link
+                    results.append(make_product(category, base_name, spec_text, price, link, raw_capacity))
+            else:
+                # 일반 상품 (CPU 등)
+                price = parse_plain_price(_visible_text(_first(item, PRICE_XPATH)))
+                results.append(make_product(category, base_name, spec_text, price, name_link))
+        except Exception:
+            continue
+
+    return results
+
+
+# -----------------------
+# 저장된 HTML 스냅샷 오프라인 파싱 / 벤치마크
+# -----------------------
+# 실행: python listing_parser.py fixtures/danawa_list_snapshot.html RAM --repeat 100
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="다나와 목록 HTML 스냅샷 오프라인 파싱")
+    parser.add_argument("path", help="저장된 목록 페이지 HTML")
+    parser.add_argument("category", help="CONFIG 카테고리 (예: CPU, RAM)")
+    parser.add_argument("--base-url", default="https://prod.danawa.com/list/")
+    parser.add_argument("--repeat", type=int, default=1, help="파싱 반복 횟수 (벤치마크용)")
+    parser.add_argument("--json", action="store_true", help="파싱 결과를 JSON으로 출력 (회귀 비교용)")
+    args = parser.parse_args()
+
+    with open(args.path, encoding="utf-8") as f:
+        source = f.read()
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        products = parse_listing_html(source, args.category, args.base_url)
+    elapsed = (time.perf_counter() - start) / args.repeat
+
+    if args.json:
+        # updated_at 은 실행 시각이라 비교 대상에서 제외
+        json.dump([{k: v for k, v in p.items() if k != "updated_at"} for p in products], sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    print(f"✅ {len(products)}개 상품 / 페이지당 {elapsed * 1000:.2f}ms", file=sys.stderr)
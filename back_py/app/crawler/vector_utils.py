@@ -1,14 +1,34 @@
 import os
+import sys
+import time
+import random
+import hashlib
 import chromadb
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from openai import OpenAI
 
+# crawler 디렉터리에서 단독 실행해도 app 패키지를 import 할 수 있도록
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from app.services.token_utils import count_tokens
+from app.services.product_classifier import classify_product
+
 # ✅ Chroma 초기화 (로컬 폴더에 저장됨)
-client = chromadb.PersistentClient(path="/app/chroma")  # 경로는 자유롭게 변경 가능
+client = chromadb.PersistentClient(path=os.getenv("CHROMA_PATH", "/app/chroma"))  # 경로는 자유롭게 변경 가능
 collection = client.get_or_create_collection(name="products")
 
-# ✅ OpenAI 클라이언트 (환경변수 OPENAI_API_KEY 사용)
+# ✅ OpenAI 클라이언트 (환경변수 OPENAI_API_KEY 사용, OPENAI_BASE_URL 지정 시 로컬 가짜 서버로 테스트 가능)
 openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
+# ✅ 임베딩 적재 파이프라인 설정
+EMBED_CHUNK_TOKENS = int(os.getenv("EMBED_CHUNK_TOKENS", "50000"))   # 요청 1회당 최대 토큰 (API 한도 300k)
+EMBED_CHUNK_MAX_DOCS = int(os.getenv("EMBED_CHUNK_MAX_DOCS", "512"))  # 요청 1회당 최대 문장 수 (API 한도 2048)
+EMBED_CONCURRENCY = int(os.getenv("EMBED_CONCURRENCY", "4"))          # 동시에 보낼 임베딩 요청 수
+EMBED_MAX_RETRIES = int(os.getenv("EMBED_MAX_RETRIES", "4"))          # 청크별 재시도 횟수
+EMBED_BACKOFF = float(os.getenv("EMBED_BACKOFF", "1.0"))              # 재시도 대기 기본값(초), 2배씩 증가
+
+# 이번 크롤링 결과가 기존 대비 이 비율보다 적으면 부분 크롤링으로 보고 삭제(prune)를 건너뜀
+VECTOR_PRUNE_MIN_RATIO = float(os.getenv("VECTOR_PRUNE_MIN_RATIO", "0.5"))
+
 def get_openai_embeddings(texts: list[str]):
     """여러 문장을 한 번에 임베딩"""
     response = openai_client.embeddings.create(
@@ -17,38 +37,169 @@ def get_openai_embeddings(texts: list[str]):
     )
     return [item.embedding for item in response.data]
 
-def save_to_vector_db(products):
-    """여러 제품을 한 번에 임베딩 + 저장"""
+def chunk_documents(texts: list[str], max_tokens: int = EMBED_CHUNK_TOKENS, max_docs: int = EMBED_CHUNK_MAX_DOCS):
+    """토큰 예산/문장 수 한도 안에서 인덱스 묶음으로 분할 → [(인덱스 목록, 토큰 수)]"""
+    chunks, current, current_tokens = [], [], 0
+    for i, text in enumerate(texts):
+        tokens = count_tokens(text)
+        if current and (current_tokens + tokens > max_tokens or len(current) >= max_docs):
+            chunks.append((current, current_tokens))
+            current, current_tokens = [], 0
+        current.append(i)
+        current_tokens += tokens
+    if current:
+        chunks.append((current, current_tokens))
+    return chunks
+
+def _embed_with_retry(texts: list[str], max_retries: int = EMBED_MAX_RETRIES):
+    for attempt in range(max_retries + 1):
+        try:
+            return get_openai_embeddings(texts)
+        except Exception as e:
+            if attempt == max_retries:
+                raise
+            delay = EMBED_BACKOFF * (2 ** attempt) * (1 + random.random() * 0.25)
+            print(f"⚠️ [Embedding] 청크({len(texts)}개) 실패 → {delay:.1f}s 후 재시도 ({attempt + 1}/{max_retries}): {e}")
+            time.sleep(delay)
+
+def ingest_documents(ids, texts, metadatas, concurrency: int = EMBED_CONCURRENCY, stored_ids: set = None):
+    """토큰 예산 단위 청크를 동시에 임베딩하고, 끝나는 청크부터 바로 Chroma에 upsert.
+    실패한 청크만 빠지고 나머지는 저장된다. 반환: 처리량 통계 (stored_ids 를 주면 저장된 id 를 담아 줌)"""
+    stats = {"docs": 0, "tokens": 0, "chunks": 0, "failed_chunks": 0, "failed_docs": 0}
+    if not texts:
+        return stats
+
+    chunks = chunk_documents(texts)
+    started = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="embed") as executor:
+        futures = {
+            executor.submit(_embed_with_retry, [texts[i] for i in idx]): (idx, tokens)
+            for idx, tokens in chunks
+        }
+        for future in as_completed(futures):
+            idx, tokens = futures[future]
+            try:
+                embeddings = future.result()
+                # upsert는 메인 스레드에서 청크 단위로 (끝나는 대로 저장)
+                collection.upsert(
+                    ids=[ids[i] for i in idx],
+                    embeddings=embeddings,
+                    metadatas=[metadatas[i] for i in idx],
+                    documents=[texts[i] for i in idx]
+                )
+                stats["chunks"] += 1
+                stats["docs"] += len(idx)
+                stats["tokens"] += tokens
+                if stored_ids is not None:
+                    stored_ids.update(ids[i] for i in idx)
+            except Exception as e:
+                stats["failed_chunks"] += 1
+                stats["failed_docs"] += len(idx)
+                print(f"❌ [Chroma] 청크({len(idx)}개) 적재 실패: {e}")
+
+    elapsed = time.perf_counter() - started
+    stats["seconds"] = round(elapsed, 3)
+    stats["docs_per_s"] = round(stats["docs"] / elapsed, 1) if elapsed else 0.0
+    stats["tokens_per_s"] = round(stats["tokens"] / elapsed, 1) if elapsed else 0.0
+    print(
+        f"🧠 [Chroma] 적재 {stats['docs']}개 / {stats['chunks']}청크 / {stats['tokens']}토큰 "
+        f"({stats['docs_per_s']} docs/s, {stats['tokens_per_s']} tokens/s, 실패 {stats['failed_chunks']}청크)"
+    )
+    return stats
+
+def document_text(p):
+    """임베딩 대상 문장 (이 문장이 바뀔 때만 다시 임베딩)"""
+    return f"{p['category']} 제품 {p['name']}의 주요 스펙은 {p['spec']}입니다."
+
+def text_hash(text: str):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+def build_metadata(p, doc_hash: str):
+    return {
+        "name": p["name"],
+        "category": p["category"],
+        "price": int(p.get("price") or 0),   # Chroma 메타데이터는 None 불가 → MySQL과 같이 0
+        "link": p["link"],
+        "doc_hash": doc_hash,
+        **classify_product(p),               # is_accessory / mem_gen / is_nvme / socket ... → 검색 where 절에서 사용
+    }
+
+def _existing_entries(categories):
+    """카테고리에 이미 저장된 id → (문서 해시, 메타데이터)"""
+    where = {"category": {"$in": sorted(categories)}} if len(categories) > 1 else {"category": next(iter(categories))}
+    stored = collection.get(where=where, include=["metadatas", "documents"])
+
+    existing = {}
+    for id_, meta, doc in zip(stored["ids"], stored["metadatas"], stored["documents"]):
+        meta = meta or {}
+        # doc_hash 가 없는 예전 데이터는 저장된 문서로 해시 계산 → 재임베딩 없이 이어서 사용
+        existing[id_] = (meta.get("doc_hash") or text_hash(doc or ""), meta)
+    return existing
+
+def save_to_vector_db(products, prune: bool = True):
+    """증분 동기화: 신규/문장 변경분만 임베딩, 가격 등 메타데이터만 바뀐 건 update, 사라진 id는 삭제"""
+    summary = {"new": 0, "reembedded": 0, "metadata_updated": 0, "unchanged": 0, "removed": 0, "embed_failed": 0}
     if not products:
-        return
+        return summary
     print(f"💡 입력 제품 수: {len(products)}")
     unique = {p["id"]: p for p in products}
     print(f"💡 중복 제거 후 남은 수: {len(unique)}")
     products = list(unique.values())
 
-    texts = [f"{p['category']} 제품 {p['name']}의 주요 스펙은 {p['spec']}입니다." for p in products]
-    ids = [p["id"] for p in products]
-    metadatas = [
-        {
-            "name": p["name"],
-            "category": p["category"],
-            "price": p["price"],
-            "link": p["link"],
-        }
-        for p in products
-    ]
-
     try:
-        # ✅ 1회 요청으로 모든 텍스트 임베딩 생성
-        embeddings = get_openai_embeddings(texts)
-
-        # ✅ 한 번에 Chroma에 추가
-        collection.upsert(
-            ids=ids,
-            embeddings=embeddings,
-            metadatas=metadatas,
-            documents=texts
+        existing = _existing_entries({p["category"] for p in products})
+
+        embed_ids, embed_texts, embed_metas = [], [], []
+        meta_ids, meta_updates = [], []
+        new_ids = set()
+
+        for p in products:
+            text = document_text(p)
+            h = text_hash(text)
+            metadata = build_metadata(p, h)
+            old = existing.get(p["id"])
+
+            if old is not None and old[0] == h:
+                # 문장이 같으면 임베딩 재사용 (메타데이터만 다르면 update)
+                if old[1] != metadata:
+                    meta_ids.append(p["id"])
+                    meta_updates.append(metadata)
+                else:
+                    summary["unchanged"] += 1
+                continue
+
+            if old is None:
+                new_ids.add(p["id"])
+            embed_ids.append(p["id"])
+            embed_texts.append(text)
+            embed_metas.append(metadata)
+
+        if embed_texts:
+            # ✅ 신규/변경 문장만 청크 단위로 동시 임베딩 + 적재 (실제로 저장된 것만 셈)
+            stored = set()
+            summary["embed_failed"] = ingest_documents(embed_ids, embed_texts, embed_metas, stored_ids=stored)["failed_docs"]
+            summary["new"] = len(stored & new_ids)
+            summary["reembedded"] = len(stored - new_ids)
+
+        if meta_ids:
+            # ✅ 가격 등만 바뀐 경우 임베딩 없이 메타데이터만 갱신
+            collection.update(ids=meta_ids, metadatas=meta_updates)
+            summary["metadata_updated"] = len(meta_ids)
+
+        removed = [id_ for id_ in existing if id_ not in unique]
+        if prune and removed:
+            if len(unique) < len(existing) * VECTOR_PRUNE_MIN_RATIO:
+                print(f"⚠️ [Chroma] 크롤링 결과가 기존의 {VECTOR_PRUNE_MIN_RATIO:.0%} 미만 → 삭제 {len(removed)}건 건너뜀")
+            else:
+                collection.delete(ids=removed)
+                summary["removed"] = len(removed)
+
+        print(
+            f"🧠 [Chroma] 증분 동기화: 신규 {summary['new']} / 재임베딩 {summary['reembedded']} / "
+            f"메타데이터 {summary['metadata_updated']} / 동일 {summary['unchanged']} / 삭제 {summary['removed']} / 임베딩 실패 {summary['embed_failed']}"
         )
-        print(f"🧠 [Chroma] {len(products)}개 제품 일괄 임베딩 완료")
     except Exception as e:
-        print(f"❌ [Chroma] 일괄 임베딩 실패: {e}")
+        print(f"❌ [Chroma] 증분 동기화 실패: {e}")
+
+    return summary
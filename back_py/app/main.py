@@ -1,8 +1,18 @@
-from fastapi import FastAPI
+import json
+import threading
+import time
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 
 # 라우터 import
-from app.routers import ai_router, data_router
+from app.routers import ai_router, data_router, admin_router
+from app.services.schema import ensure_schema
+from app.services.metrics import start_request_timing, observe_http, render_metrics
+from app.services import traffic_recorder
+from app.services.catalog_version import bump_catalog_version
+from app.services.data_service import EMBEDDING_MODEL, backfill_unclassified
+from app.services.prompt_builder import PROMPT_MODEL
+from app.services.token_utils import warm_encodings
 
 # -----------------------------------------------------
 # FastAPI 앱 생성
@@ -30,11 +40,99 @@ app.add_middleware(
     allow_headers=["*"],        # 모든 헤더 허용
 )
 
+# -----------------------------------------------------
+# 요청 지표 + 디버그 타이밍
+# -----------------------------------------------------
+# 요청 헤더 X-Debug-Timing: 1 → 응답 헤더 Server-Timing 에 단계별 시간(ms) / DB 쿼리 수 / 캐시 적중 기록
+# (스트리밍 응답은 헤더가 먼저 나가므로 마지막에 {"type": "timing"} 이벤트로 전달)
+@app.middleware("http")
+async def timing_middleware(request: Request, call_next):
+    started = time.perf_counter()
+    timing = start_request_timing() if request.headers.get("x-debug-timing") == "1" else None
+
+    response = await call_next(request)
+
+    # 라벨 수가 늘지 않도록 매칭된 라우트만 경로로 기록 (경로 변수가 있으면 라우트 템플릿)
+    route = request.scope.get("route")
+    if route is None:
+        label = "unmatched"
+    else:
+        label = route.path if request.scope.get("path_params") else request.url.path
+    observe_http(request.method, label, response.status_code, time.perf_counter() - started)
+    if timing is not None:
+        response.headers["Server-Timing"] = timing.server_timing()
+    return response
+
+# -----------------------------------------------------
+# 트래픽 기록 (TRAFFIC_RECORD_PATH 를 지정했을 때만 등록)
+# -----------------------------------------------------
+# 견적 요청을 익명화해서 JSON 한 줄씩 기록 → python -m bench.replay run --log <파일> 로 재생
+if traffic_recorder.recording_enabled():
+    @app.middleware("http")
+    async def traffic_record_middleware(request: Request, call_next):
+        if request.method != "POST" or request.url.path not in traffic_recorder.RECORD_PATHS:
+            return await call_next(request)
+
+        started = time.monotonic()
+        body = await request.body()   # 본문은 캐시되어 라우터에서도 그대로 읽힘
+        response = await call_next(request)
+
+        try:
+            message = json.loads(body or b"{}").get("message")
+        except (ValueError, AttributeError):
+            message = None
+
+        # 스트림 응답도 마지막 줄까지 보낸 시점을 지연시간으로 기록
+        body_iterator = response.body_iterator
+
+        async def recorded_body():
+            try:
+                async for chunk in body_iterator:
+                    yield chunk
+            finally:
+                traffic_recorder.record_request(
+                    request.url.path, request.headers.get("session-id"), message,
+                    response.status_code, started, (time.monotonic() - started) * 1000
+                )
+        response.body_iterator = recorded_body()
+        return response
+    print(f"🎙️ [TrafficRecorder] 기록 중 → {traffic_recorder.TRAFFIC_RECORD_PATH}")
+
 # -----------------------------------------------------
 # 라우터 등록
 # -----------------------------------------------------
 app.include_router(ai_router.router, prefix="/ai", tags=["AI 견적"])
 app.include_router(data_router.router, prefix="/data", tags=["데이터 관리"])
+app.include_router(admin_router.router, prefix="/admin", tags=["운영 관리"])
+
+# -----------------------------------------------------
+# 시작 시 DB 인덱스 보장 + 분류 메타데이터 없는 Chroma 문서 채우기 (실패해도 서버는 뜨도록)
+# -----------------------------------------------------
+def backfill_chroma_in_background():
+    try:
+        if backfill_unclassified():
+            bump_catalog_version()   # 검색 결과가 달라지므로 hint 캐시 무효화
+    except Exception as e:
+        print(f"⚠️ [Backfill] Chroma 분류 채우기 실패: {e}")
+
+@app.on_event("startup")
+def startup():
+    try:
+        ensure_schema()
+    except Exception as e:
+        print(f"⚠️ [Schema] 인덱스 확인 실패: {e}")
+    # 토큰 인코딩 파일을 요청 경로에서 내려받지 않도록 시작할 때 미리 읽음
+    print(f"🔢 [Tokens] tiktoken 인코딩: {warm_encodings(PROMPT_MODEL, EMBEDDING_MODEL)}")
+    # 다 채울 때까지는 검색 시 미분류 문서를 그 자리에서 분류해서 씀
+    threading.Thread(target=backfill_chroma_in_background, name="chroma-backfill", daemon=True).start()
+
+# -----------------------------------------------------
+# Prometheus 지표
+# -----------------------------------------------------
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
 
 # -----------------------------------------------------
 # 루트 경로
@@ -0,0 +1,59 @@
+from fastapi import APIRouter
+from app.services.data_service import hint_cache_stats, flush_hint_cache
+from app.services.embedding_cache import cache_stats as embedding_cache_stats
+from app.services.catalog_version import get_catalog_version
+from app.services.catalog_snapshot import snapshot_stats
+from app.services.db_pool import pool_stats
+from app.services.response_cache import response_cache_stats, flush_response_cache
+from app.services.single_flight import single_flight_stats
+from app.services.traffic_recorder import recorder_stats
+
+router = APIRouter()
+
+@router.get("/hint-cache")
+def inspect_hint_cache():
+    """hint_products 결과 캐시 상태 (적중률/크기/카탈로그 버전)"""
+    return hint_cache_stats()
+
+@router.delete("/hint-cache")
+def clear_hint_cache():
+    flush_hint_cache()
+    return {"success": True, "message": "hint 캐시를 비웠습니다.", "stats": hint_cache_stats()}
+
+@router.get("/embedding-cache")
+def inspect_embedding_cache():
+    return embedding_cache_stats()
+
+@router.get("/catalog-version")
+def catalog_version():
+    return {"version": get_catalog_version()}
+
+@router.get("/catalog-snapshot")
+def inspect_catalog_snapshot():
+    """인메모리 카탈로그 스냅샷 상태 (버전/행 수/메모리 사용량)"""
+    return snapshot_stats()
+
+@router.get("/response-cache")
+def inspect_response_cache():
+    """첫 질문 견적 응답 캐시 상태 (적중률/절약한 GPT 호출 수)"""
+    return response_cache_stats()
+
+@router.delete("/response-cache")
+def clear_response_cache():
+    flush_response_cache()
+    return {"success": True, "message": "응답 캐시를 비웠습니다.", "stats": response_cache_stats()}
+
+@router.get("/single-flight")
+def inspect_single_flight():
+    """동시 중복 요청 합치기 현황 (실제 실행 / 합쳐진 호출 / 리더 실패)"""
+    return single_flight_stats()
+
+@router.get("/traffic-recorder")
+def inspect_traffic_recorder():
+    """트래픽 기록 상태 (TRAFFIC_RECORD_PATH 지정 시 동작)"""
+    return recorder_stats()
+
+@router.get("/pool")
+def db_pool_stats():
+    """MySQL 커넥션 풀 상태 (사용 중/대기 시간/생성 수)"""
+    return pool_stats()
@@ -1,7 +1,10 @@
 from fastapi import APIRouter, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from app.services.ai_service import process_chat_request
+from app.services.ai_service import process_chat_request, stream_chat_request
+from app.services.metrics import current_timing
 import traceback
+import json
 import sys
 
 router = APIRouter()
@@ -24,3 +27,27 @@ async def ai_query(req: ChatRequest, request: Request):
         traceback.print_exc()
         sys.stdout.flush()
         return {"success": False, "error": str(e)}
+
+
+# 스트리밍 버전: 한 줄에 이벤트 하나 (NDJSON)
+#   검색이 끝나면 바로 첫 줄(stage)을 보내고, GPT 토큰 / 부품별 견적 / 최종 견적 순으로 이어서 보낸다.
+@router.post("/query/stream")
+async def ai_query_stream(req: ChatRequest, request: Request):
+    session_id = request.headers.get("session-id")
+    if not session_id:
+        return {"success": False, "message": "세션 ID가 누락되었습니다."}
+
+    async def events():
+        try:
+            async for event in stream_chat_request(session_id, req.message):
+                # 디버그 타이밍 요청이면 done 직전에 단계별 시간 전달
+                timing = current_timing()
+                if event.get("type") == "done" and timing is not None:
+                    yield json.dumps({"type": "timing", **timing.as_dict()}, ensure_ascii=False) + "\n"
+                yield json.dumps(event, ensure_ascii=False) + "\n"
+        except Exception as e:
+            traceback.print_exc()
+            sys.stdout.flush()
+            yield json.dumps({"type": "error", "error": str(e)}, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
@@ -1,13 +1,84 @@
-from fastapi import APIRouter
-from app.services.data_service import get_connection
+import csv
+import io
+import json
+
+from fastapi import APIRouter, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from app.services.product_listing import (
+    PAGE_MAX_LIMIT, ListingError, parse_fields, decode_cursor, fetch_page, iter_products,
+)
 
 router = APIRouter()
 
 @router.get("/list")
-def list_data(limit: int = 10):
-    conn = get_connection()
-    cursor = conn.cursor(dictionary=True)
-    cursor.execute("SELECT * FROM product LIMIT %s", (limit,))
-    result = cursor.fetchall()
-    conn.close()
-    return result
+def list_data(response: Response, limit: int = 10):
+    """기존 호환용: 전체 컬럼, 앞에서부터 limit 개 (정렬은 /products 와 같음).
+    기존 호출이 422 로 깨지지 않도록 검증 대신 PAGE_MAX_LIMIT 로 잘라서 응답하고,
+    잘랐으면 X-Limit-Clamped 헤더(요청값 → 적용값)와 로그로 알림"""
+    if limit <= 0:
+        return []
+    if limit > PAGE_MAX_LIMIT:
+        print(f"⚠️ [List] limit {limit} → {PAGE_MAX_LIMIT} 로 잘림 (전체 목록은 /data/products 커서 사용)")
+        response.headers["X-Limit-Clamped"] = f"{limit}->{PAGE_MAX_LIMIT}"
+    try:
+        return fetch_page(fields="*", limit=min(limit, PAGE_MAX_LIMIT))["items"]
+    except ListingError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/products")
+def list_products(
+    category: str = None,
+    min_price: int = None,
+    max_price: int = None,
+    fields: str = Query(None, description="쉼표로 구분한 컬럼 (기본: spec 제외 전체, '*': 전체)"),
+    cursor: str = Query(None, description="이전 응답의 next_cursor"),
+    limit: int = Query(100, ge=1, le=PAGE_MAX_LIMIT),
+):
+    """상품 목록 키셋 페이지네이션 (category, price, id 순). next_cursor 가 null 이면 마지막 페이지"""
+    try:
+        return fetch_page(fields, category, min_price, max_price, cursor, limit)
+    except ListingError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/products/export")
+def export_products(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    category: str = None,
+    min_price: int = None,
+    max_price: int = None,
+    fields: str = None,
+    cursor: str = None,
+    limit: int = Query(0, ge=0, description="0 이면 조건에 맞는 전체"),
+):
+    """조건에 맞는 상품을 NDJSON / CSV 로 스트리밍 (서버측 커서, 메모리에 모으지 않음)"""
+    try:
+        columns = parse_fields(fields)
+        if cursor:
+            decode_cursor(cursor)
+    except ListingError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    batches = iter_products(columns, category, min_price, max_price, cursor, limit)
+
+    def ndjson_lines():
+        for rows in batches:
+            yield "".join(json.dumps(row, ensure_ascii=False, default=str) + "\n" for row in rows)
+
+    def csv_lines():
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=columns)
+        writer.writeheader()
+        for rows in batches:
+            writer.writerows(rows)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue()
+
+    if format == "csv":
+        return StreamingResponse(
+            csv_lines(), media_type="text/csv; charset=utf-8",
+            headers={"Content-Disposition": 'attachment; filename="products.csv"'},
+        )
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
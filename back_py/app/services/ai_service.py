@@ -2,11 +2,32 @@ import os
 import json
 import re
 import sys
-from openai import OpenAI
-from app.services.session_service import get_messages, append_message
-from app.services.data_service import get_hint_products, get_connection
-
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+import time
+import asyncio
+import hashlib
+from openai import AsyncOpenAI
+from app.services.session_service import get_last_estimate, append_messages
+from app.services.data_service import get_hint_products, PURPOSE_KEYWORDS, DEFAULT_BUDGET
+from app.services.product_lookup import lookup_products
+from app.services.build_solver import solve_build, SLOT_ORDER
+from app.services.prompt_builder import build_candidate_table, PROMPT_MODEL
+from app.services.token_utils import count_tokens
+from app.services import response_cache
+from app.services.single_flight import AsyncSingleFlight
+from app.services.metrics import stage, observe_llm, record_llm_usage
+
+# 비동기 클라이언트: 응답 대기 중에도 다른 요청을 처리
+client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+
+# 견적 엔진
+#   llm        : 후보 목록을 GPT에 주고 고르게 함 (기존 방식)
+#   solver     : 예산/호환성 조합기만 사용 (LLM 호출 없음, 이전 견적을 고치는 후속 요청은 solver_llm 처럼 처리)
+#   solver_llm : 조합기 결과를 초안으로 주고 GPT가 요청에 맞게 다듬음
+ESTIMATE_ENGINE = os.getenv("ESTIMATE_ENGINE", "llm")
+ESTIMATE_ENGINES = ("llm", "solver", "solver_llm")
+
+# 프롬프트가 완전히 같은 GPT 호출은 진행 중인 것 하나만 실제로 보냄
+_completion_flight = AsyncSingleFlight("llm_completion")
 
 
 # -------------------------------------
@@ -20,7 +41,7 @@ def parse_query(query: str):
     if match:
         budget = int(match.group(1)) * 10000
 
-    for keyword in ["사무", "게임", "롤", "영상", "편집", "디자인", "작업"]:
+    for keyword in PURPOSE_KEYWORDS:
         if keyword in query:
             purpose = keyword
             break
@@ -41,147 +62,86 @@ def parse_query(query: str):
 # -------------------------------------
 # 🧠 Chroma 기반 제품 목록 생성
 # -------------------------------------
-def build_prompt(query: str):
+def build_prompt(query: str, hint_products=None, draft=None, previous_estimate=None):
+    """→ (프롬프트, 후보 표, 이전 견적의 id 표기). 모델은 후보 표의 id로 답한다"""
     budget, purpose, cooler_type, board_type = parse_query(query)
-    hint_products = get_hint_products(budget, purpose)
-    grouped_json = json.dumps(hint_products, ensure_ascii=False, indent=2)
-
-    prompt = f"""
-    사용자의 요청: "{query}"
-    분석 결과:
-    - 예산: {budget if budget else "명시 안됨"}
-    - 용도: {purpose if purpose else "명시 안됨"}
-    - 쿨러 타입: {cooler_type or "자동 선택"}
-    - 메인보드 타입: {board_type or "자동 선택"}
-
-    아래는 사용할 수 있는 제품 목록이다.
-    반드시 아래 JSON 목록 안에 존재하는 name, price, link만 사용해야 한다.
-
-    제품 목록(JSON):
-    {grouped_json}
-
-    견적 구성 규칙 (호환성 필수 준수):
-    1. [중요] CPU와 메인보드는 동일 브랜드여야 함 (인텔-인텔, AMD-AMD).
-    2. [중요] 소켓 규격이 일치해야 함 (LGA1700 ↔ B660/B760/Z790 등).
-    3. [중요] 램은 메인보드가 지원하는 규격(DDR4/DDR5)과 일치해야 함.
-    4. 예산 분배: GPU에 가장 많은 투자를 하고, 나머지는 밸런스를 맞춰라.
-    5. 이전 견적(JSON)이 제공된다면, 그것을 기반으로 수정하라.
-    -cpu는 hint_products["cpu"]에서만 선택하라  
-    -gpu는 hint_products["gpu"]에서만 선택하라  
-    -mboard는 hint_products["mboard"]에서만 선택하라  
-    -ram는 hint_products["ram"]에서만 선택하라  
-    -ssd는 hint_products["ssd"]에서만 선택하라  
-    -cooler는 hint_products["cooler"]에서만 선택하라  
-    -power는 hint_products["power"]에서만 선택하라  
-    -case는 hint_products["case"]에서만 선택하라
-
-
-    출력 형식(JSON):
-    {{
-      "cpu": {{ "name": "", "price": 0, "link": "" }},
-      "gpu": {{ "name": "", "price": 0, "link": "" }},
-      "mboard": {{ "name": "", "price": 0, "link": "" }},
-      "ram": {{ "name": "", "price": 0, "link": "" }},
-      "ssd": {{ "name": "", "price": 0, "link": "" }},
-      "cooler": {{ "name": "", "price": 0, "link": "" }},
-      "power": {{ "name": "", "price": 0, "link": "" }},
-      "case": {{ "name": "", "price": 0, "link": "" }},
-      "total_price": 0
-    }}
-    """
-    return prompt
+    if hint_products is None:
+        hint_products = get_hint_products(budget, purpose)
+
+    # 이전 견적 / 초안 부품은 표에 고정으로 넣어서 id로 가리킬 수 있게 함
+    table, (previous_refs, draft_refs) = build_candidate_table(hint_products, [previous_estimate, draft])
+
+    # solver_llm: 조합기가 만든 초안 (예산/호환성 규칙을 이미 만족)
+    draft_section = ""
+    if draft:
+        draft_section = f"""
+초안(규칙/예산 만족): {json.dumps(draft_refs, ensure_ascii=False, separators=(",", ":"))}
+초안을 기본으로 하되 요청에 더 맞게 필요한 부품만 교체하라."""
+
+    prompt = f"""사용자 요청: "{query}"
+예산: {budget if budget else "명시 안됨"} / 용도: {purpose or "명시 안됨"} / 쿨러: {cooler_type or "자동"} / 메인보드: {board_type or "자동"}
+
+후보 표:
+{table.render()}
+
+규칙:
+1. 슬롯마다 그 슬롯 표의 id 하나만 고른다 (표에 없는 제품 금지).
+2. CPU와 메인보드는 표의 소켓 값이 같아야 하고, 램 메모리 규격은 메인보드와 같아야 한다.
+3. 총액은 예산 이내, GPU에 가장 많이 투자하고 나머지는 균형 있게.
+4. 이전 견적이 있으면 그것을 기반으로 수정한다.{draft_section}
+
+출력(JSON만): {{"cpu":{{"id":""}},"gpu":{{"id":""}},"mboard":{{"id":""}},"ram":{{"id":""}},"ssd":{{"id":""}},"cooler":{{"id":""}},"power":{{"id":""}},"case":{{"id":""}}}}"""
+    return prompt, table, previous_refs
 
 
 # -------------------------------------
 # 🧩 DB 가격/링크 보정
 # -------------------------------------
 def enrich_with_db_info(result_json):
-    conn = get_connection()
-    cursor = conn.cursor(dictionary=True)
     final_result, total_price = {}, 0
 
-    for key, item in result_json.items():
-        if key == "total_price":
-            continue
-
-        name = item.get("name")
-        if not name:
-            continue
+    parts = {
+        key: item.get("name")
+        for key, item in result_json.items()
+        if key != "total_price" and isinstance(item, dict) and item.get("name")
+    }
+    # 부품 전체를 한 번에 조회 (인메모리 이름 맵 또는 WHERE name IN (...) 1회)
+    db_items = lookup_products(parts)
 
-        cursor.execute(
-            "SELECT name, price, link FROM product WHERE name = %s LIMIT 1",
-            (name,)
-        )
-        db_item = cursor.fetchone()
+    for key in parts:
+        db_item = db_items.get(key)
 
         if db_item:
             final_result[key] = db_item
             total_price += db_item["price"] or 0
         else:
-            final_result[key] = item
+            final_result[key] = result_json[key]
 
     final_result["total_price"] = total_price
-    conn.close()
     return final_result
 
 
 # -------------------------------------
-# 🚀 핵심: reply 제거 + JSON 견적만 반환
+# 🧮 조합기 초안 (solver / solver_llm 엔진)
 # -------------------------------------
-async def process_chat_request(session_id: str, user_message: str):
-    # 1️⃣ 이전 대화 문맥 불러오기
-    messages = get_messages(session_id)
-
-    # 2️⃣ 이전 JSON 견적 찾기
-    previous_estimate = None
-    for msg in reversed(messages):
-        if msg["role"] == "assistant":
-            try:
-                js = json.loads(msg["content"])
-                if "cpu" in js and "gpu" in js:
-                    previous_estimate = js
-                    break
-            except:
-                pass
-
-    # 3️⃣ 기본 프롬프트 생성
-    prompt = build_prompt(user_message)
-
-    # 4️⃣ 시스템 프롬프트 (설명 제거)
-    system_prompt = {
-        "role": "system",
-        "content": (
-            "너는 PC 견적 전문가이다. "
-            "항상 JSON만 출력해야 하며, 자연어는 절대 출력하지 않는다. "
-            "이전 견적(JSON)이 있으면 반드시 그 견적을 기반으로 수정해야 한다. "
-            "new JSON만 출력하고 설명 금지."
-        ),
-    }
-
-    # 5️⃣ 전체 메시지 구성
-    chat_messages = [system_prompt]
-
-    # 이전 견적 있으면 문맥으로 제공
-    if previous_estimate:
-        chat_messages.append({
-            "role": "assistant",
-            "content": json.dumps(previous_estimate, ensure_ascii=False)
-        })
+def solve_from_query(query: str, hint_products=None):
+    budget, purpose, cooler_type, board_type = parse_query(query)
+    if hint_products is None:
+        hint_products = get_hint_products(budget, purpose)
+    estimate, _ = solve_build(hint_products, budget or DEFAULT_BUDGET, board_type, cooler_type)
+    return estimate
 
-    # 유저 요청 + Chroma 제품 목록 포함 프롬프트
-    chat_messages.append({"role": "user", "content": prompt})
 
-    # 6️⃣ GPT 호출
-    completion = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=chat_messages
-    )
-    raw_text = completion.choices[0].message.content.strip()
+def solver_only(engine: str, draft, previous_estimate=None) -> bool:
+    """조합기 결과를 GPT 없이 그대로 쓸지. 이전 견적이 있으면 후속 요청("GPU만 바꿔줘" 등)이라
+    조합기는 그 제약을 모르므로 초안으로만 넘기고 GPT가 다듬게 함"""
+    return engine == "solver" and bool(draft) and not previous_estimate
 
-    print("🔥 GPT RAW:", raw_text)
-    sys.stdout.flush()
 
-    # 6️⃣ JSON 파싱 및 복구 (Code B의 리스트 변환 로직 추가)
+# -------------------------------------
+# 🧾 GPT 응답 → 견적 dict
+# -------------------------------------
+def parse_estimate_json(raw_text: str):
     parsed = {}
     try:
         match = re.search(r"\{[\s\S]*\}", raw_text)
@@ -209,16 +169,344 @@ async def process_chat_request(session_id: str, user_message: str):
     except Exception as e:
         print(f"❌ JSON 파싱 에러: {e}")
         parsed = {}
-    
-    # 8️⃣ DB 가격/링크 보정
-    enriched = enrich_with_db_info(parsed)
+    return parsed
 
-    # 9️⃣ Redis 문맥 저장 (오직 JSON만 저장)
-    append_message(session_id, "user", user_message)
-    append_message(session_id, "assistant", json.dumps(enriched, ensure_ascii=False))
 
-    # 10️⃣ "reply" 제거하고 JSON만 반환
+# -------------------------------------
+# 🧾 스트리밍 중인 GPT 출력에서 완성된 부품 객체 꺼내기
+# -------------------------------------
+class EstimateStreamParser:
+    """feed(조각) → 이번 조각으로 닫힌 최상위 "키": {...} 객체 목록 [(키, dict)]"""
+
+    def __init__(self):
+        self.buffer = ""
+        self.pos = 0
+        self.depth = 0
+        self.in_string = False
+        self.escape = False
+        self.string_start = 0
+        self.last_key = None
+        self.object_start = None
+        self.object_key = None
+
+    def feed(self, text: str):
+        self.buffer += text
+        buf, found = self.buffer, []
+
+        for i in range(self.pos, len(buf)):
+            ch = buf[i]
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif ch == "\\":
+                    self.escape = True
+                elif ch == '"':
+                    self.in_string = False
+                    if self.depth == 1:
+                        self.last_key = buf[self.string_start + 1:i]
+                continue
+
+            if ch == '"':
+                self.in_string, self.string_start = True, i
+            elif ch == "{":
+                self.depth += 1
+                if self.depth == 2:
+                    self.object_start, self.object_key = i, self.last_key
+            elif ch == "}":
+                if self.depth == 2 and self.object_start is not None:
+                    try:
+                        found.append((self.object_key, json.loads(buf[self.object_start:i + 1])))
+                    except ValueError:
+                        pass
+                    self.object_start = None
+                self.depth = max(0, self.depth - 1)
+
+        self.pos = len(buf)
+        return found
+
+
+# -------------------------------------
+# 🧱 단계별 처리 (일반 응답 / 스트리밍 응답 공용)
+# -------------------------------------
+async def load_previous_estimate(session_id: str):
+    """이전 대화의 마지막 JSON 견적 (세션별 last_estimate 키 GET 1회)"""
+    return await get_last_estimate(session_id)
+
+
+async def retrieve_candidates(user_message: str):
+    """후보 검색 (Chroma/MySQL 검색은 동기 I/O → 스레드 풀에서 실행)"""
+    budget, purpose, _, _ = parse_query(user_message)
+    return await asyncio.to_thread(get_hint_products, budget, purpose)
+
+
+def build_chat_messages(user_message: str, hint_products, previous_estimate=None, draft=None):
+    """→ (GPT 메시지 목록, 후보 표)"""
+    prompt, table, previous_refs = build_prompt(user_message, hint_products, draft, previous_estimate)
+
+    # 시스템 프롬프트 (설명 제거)
+    system_prompt = {
+        "role": "system",
+        "content": (
+            "너는 PC 견적 전문가이다. "
+            "항상 JSON만 출력해야 하며, 자연어는 절대 출력하지 않는다. "
+            "이전 견적(JSON)이 있으면 반드시 그 견적을 기반으로 수정해야 한다. "
+            "new JSON만 출력하고 설명 금지."
+        ),
+    }
+    chat_messages = [system_prompt]
+
+    # 이전 견적 있으면 문맥으로 제공 (후보 표 id 표기)
+    if previous_estimate:
+        chat_messages.append({
+            "role": "assistant",
+            "content": json.dumps(previous_refs, ensure_ascii=False, separators=(",", ":"))
+        })
+
+    # 유저 요청 + 후보 표 포함 프롬프트
+    chat_messages.append({"role": "user", "content": prompt})
+    return chat_messages, table
+
+
+def log_prompt_usage(chat_messages, table, usage=None):
+    """요청별 프롬프트 크기 (로컬 계산) / API 사용량 기록"""
+    local_tokens = sum(count_tokens(m["content"], PROMPT_MODEL) for m in chat_messages)
+    line = f"🧾 [Prompt] 후보 {table.size()}개 (예산 초과 제외 {table.trimmed}개) / 프롬프트 {local_tokens}토큰(로컬)"
+    if usage is not None:
+        line += f" / API 입력 {usage.prompt_tokens}토큰 / 출력 {usage.completion_tokens}토큰"
+    print(line)
+
+
+def prompt_key(chat_messages) -> str:
+    """정규화한 메시지 목록 해시 (공백 차이는 같은 프롬프트로 봄)"""
+    normalized = [(m["role"], " ".join(m["content"].split())) for m in chat_messages]
+    return hashlib.sha256(json.dumps([PROMPT_MODEL, normalized], ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+async def _create_completion(chat_messages):
+    started = time.perf_counter()
+    completion = await client.chat.completions.create(
+        model=PROMPT_MODEL,
+        messages=chat_messages
+    )
+    observe_llm("complete", "total", time.perf_counter() - started)
+    record_llm_usage(completion.usage)
+    return completion
+
+
+async def request_llm_estimate(user_message: str, hint_products, previous_estimate=None, draft=None):
+    """GPT 견적 (llm / solver_llm 엔진)"""
+    chat_messages, table = build_chat_messages(user_message, hint_products, previous_estimate, draft)
+    # 같은 프롬프트 = 같은 후보 표 id 이므로 응답을 공유해도 각자 표로 풀면 됨
+    completion = await _completion_flight.do(prompt_key(chat_messages), _create_completion, chat_messages)
+    raw_text = completion.choices[0].message.content.strip()
+
+    print("🔥 GPT RAW:", raw_text)
+    log_prompt_usage(chat_messages, table, completion.usage)
+    sys.stdout.flush()
+
+    # JSON 파싱 및 복구 → 후보 id를 제품으로
+    return table.resolve(parse_estimate_json(raw_text))
+
+
+async def stream_llm_tokens(chat_messages, usage_out: dict = None):
+    """GPT 응답을 토큰 조각 단위로 전달 (usage_out 에 마지막 사용량 기록)"""
+    started, first_token = time.perf_counter(), True
+    stream = await client.chat.completions.create(
+        model=PROMPT_MODEL,
+        messages=chat_messages,
+        stream=True,
+        stream_options={"include_usage": True}
+    )
+    async for chunk in stream:
+        if getattr(chunk, "usage", None) is not None:
+            record_llm_usage(chunk.usage)
+            if usage_out is not None:
+                usage_out["usage"] = chunk.usage
+        if chunk.choices and chunk.choices[0].delta.content:
+            if first_token:
+                first_token = False
+                observe_llm("stream", "first_token", time.perf_counter() - started)
+            yield chunk.choices[0].delta.content
+    observe_llm("stream", "total", time.perf_counter() - started)
+
+
+def enrich_part(key: str, item):
+    """부품 하나만 DB 가격/링크 보정 (스트리밍 중 슬롯별 전달용)"""
+    if not isinstance(item, dict) or not item.get("name"):
+        return item
+    return lookup_products({key: item["name"]}).get(key) or item
+
+
+async def save_turn(session_id: str, user_message: str, enriched):
+    # Redis 문맥 저장 (오직 JSON만 저장) - 질문/답변/마지막 견적을 파이프라인 한 번으로
+    estimate = enriched if "cpu" in enriched and "gpu" in enriched else None
+    await append_messages(
+        session_id,
+        [("user", user_message), ("assistant", json.dumps(enriched, ensure_ascii=False))],
+        estimate
+    )
+
+
+async def lookup_cached_estimate(user_message: str, engine: str, previous_estimate=None):
+    """첫 질문이고 GPT를 쓰는 엔진이면 비슷한 질문의 견적 재사용 (가격/링크는 현재 DB 기준으로 다시 보정)"""
+    if previous_estimate or engine == "solver":
+        return None
+    with stage("response_cache"):
+        cached, _ = await asyncio.to_thread(response_cache.lookup, user_message, parse_query(user_message), engine)
+        if cached is None:
+            return None
+        return await asyncio.to_thread(enrich_with_db_info, cached)
+
+
+_background_tasks = set()
+
+
+def store_cached_estimate(user_message: str, engine: str, enriched, previous_estimate=None):
+    """응답 캐시 저장은 질문 임베딩이 필요하므로 응답을 붙잡지 않게 백그라운드로"""
+    if previous_estimate or "cpu" not in enriched or "gpu" not in enriched:
+        return
+    task = asyncio.create_task(asyncio.to_thread(response_cache.store, user_message, parse_query(user_message), engine, enriched))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+def check_engine(engine: str = None):
+    engine = engine or ESTIMATE_ENGINE
+    if engine not in ESTIMATE_ENGINES:
+        raise ValueError(f"알 수 없는 견적 엔진: {engine} ({', '.join(ESTIMATE_ENGINES)})")
+    return engine
+
+
+# -------------------------------------
+# 🚀 핵심: reply 제거 + JSON 견적만 반환
+# -------------------------------------
+async def process_chat_request(session_id: str, user_message: str, engine: str = None):
+    engine = check_engine(engine)
+
+    # 1️⃣ 이전 JSON 견적 찾기
+    with stage("previous_estimate"):
+        previous_estimate = await load_previous_estimate(session_id)
+
+    # 1️⃣-1 첫 질문이면 비슷한 질문의 견적 재사용 (GPT 호출 생략)
+    cached = await lookup_cached_estimate(user_message, engine, previous_estimate)
+    if cached is not None:
+        with stage("save_turn"):
+            await save_turn(session_id, user_message, cached)
+        return {
+            "success": True,
+            "estimate": cached
+        }
+
+    # 2️⃣ 후보 검색
+    with stage("retrieval"):
+        hint_products = await retrieve_candidates(user_message)
+
+    # 3️⃣ solver / solver_llm: 예산·호환성 조합기 (ms 단위, LLM 호출 없음)
+    with stage("solver"):
+        draft = solve_from_query(user_message, hint_products) if engine != "llm" else None
+
+    # 4️⃣ 견적 (solver 엔진은 조합기 결과 그대로, 조합이 없거나 이전 견적을 고치는 요청이면 GPT로)
+    used_llm = not solver_only(engine, draft, previous_estimate)
+    if not used_llm:
+        parsed = draft
+    else:
+        with stage("llm"):
+            parsed = await request_llm_estimate(user_message, hint_products, previous_estimate, draft)
+
+    # 5️⃣ DB 가격/링크 보정
+    with stage("enrich"):
+        enriched = await asyncio.to_thread(enrich_with_db_info, parsed)
+
+    # 6️⃣ Redis 문맥 저장 (+ GPT 견적이면 응답 캐시에 저장)
+    with stage("save_turn"):
+        await save_turn(session_id, user_message, enriched)
+        if used_llm:
+            store_cached_estimate(user_message, engine, enriched, previous_estimate)
+
+    # 7️⃣ "reply" 제거하고 JSON만 반환
     return {
         "success": True,
         "estimate": enriched
     }
+
+
+# -------------------------------------
+# 📡 스트리밍: 단계 이벤트 → 토큰 → 부품별 견적 → 최종 견적
+# -------------------------------------
+# 이벤트 형식 (dict, 라우터에서 NDJSON 한 줄씩 전송)
+#   {"type": "stage", "stage": "retrieval", "candidates": {...}, "elapsed_ms": ...}
+#   {"type": "stage", "stage": "cache", "hit": true}  ← 응답 캐시 적중 시 (바로 part/estimate)
+#   {"type": "token", "text": "..."}
+#   {"type": "part", "slot": "cpu", "item": {name, price, link}}
+#   {"type": "estimate", "estimate": {...}}   ← 일반 응답의 estimate 와 같음
+#   {"type": "error", "error": "..."} / {"type": "done"}
+#   (X-Debug-Timing: 1 요청이면 라우터가 done 직전에 {"type": "timing", ...} 추가)
+async def stream_chat_request(session_id: str, user_message: str, engine: str = None):
+    engine = check_engine(engine)
+    started = time.perf_counter()
+
+    def elapsed_ms():
+        return round((time.perf_counter() - started) * 1000, 1)
+
+    with stage("previous_estimate"):
+        previous_estimate = await load_previous_estimate(session_id)
+
+    cached = await lookup_cached_estimate(user_message, engine, previous_estimate)
+    if cached is not None:
+        yield {"type": "stage", "stage": "cache", "hit": True, "elapsed_ms": elapsed_ms()}
+        for key, item in cached.items():
+            if key != "total_price":
+                yield {"type": "part", "slot": key, "item": item}
+        await save_turn(session_id, user_message, cached)
+        yield {"type": "estimate", "estimate": cached, "elapsed_ms": elapsed_ms()}
+        yield {"type": "done"}
+        return
+
+    with stage("retrieval"):
+        hint_products = await retrieve_candidates(user_message)
+
+    candidates = {key: len(items) for key, items in hint_products.items()}
+    yield {"type": "stage", "stage": "retrieval", "candidates": candidates, "total_candidates": sum(candidates.values()), "elapsed_ms": elapsed_ms()}
+
+    with stage("solver"):
+        draft = solve_from_query(user_message, hint_products) if engine != "llm" else None
+    if engine != "llm":
+        yield {"type": "stage", "stage": "solver", "found": draft is not None, "elapsed_ms": elapsed_ms()}
+
+    used_llm = not solver_only(engine, draft, previous_estimate)
+    if not used_llm:
+        parsed = draft
+        for key, item in draft.items():
+            if key != "total_price":
+                yield {"type": "part", "slot": key, "item": await asyncio.to_thread(enrich_part, key, item)}
+    else:
+        chat_messages, table = build_chat_messages(user_message, hint_products, previous_estimate, draft)
+        parser, pieces, emitted, usage = EstimateStreamParser(), [], set(), {}
+
+        async for text in stream_llm_tokens(chat_messages, usage):
+            pieces.append(text)
+            yield {"type": "token", "text": text}
+
+            # 닫힌 부품 객체는 바로 DB 보정해서 전달
+            for key, item in parser.feed(text):
+                if key in SLOT_ORDER and key not in emitted:
+                    emitted.add(key)
+                    yield {"type": "part", "slot": key, "item": await asyncio.to_thread(enrich_part, key, table.resolve_item(item))}
+
+        raw_text = "".join(pieces).strip()
+        print("🔥 GPT RAW:", raw_text)
+        log_prompt_usage(chat_messages, table, usage.get("usage"))
+        sys.stdout.flush()
+        yield {"type": "stage", "stage": "completion", "elapsed_ms": elapsed_ms()}
+        parsed = table.resolve(parse_estimate_json(raw_text))
+
+    # 최종 견적은 일반 응답과 같은 방식으로 한 번 더 보정 (총액 포함)
+    with stage("enrich"):
+        enriched = await asyncio.to_thread(enrich_with_db_info, parsed)
+    with stage("save_turn"):
+        await save_turn(session_id, user_message, enriched)
+        if used_llm:
+            store_cached_estimate(user_message, engine, enriched, previous_estimate)
+
+    yield {"type": "estimate", "estimate": enriched, "elapsed_ms": elapsed_ms()}
+    yield {"type": "done"}
@@ -0,0 +1,146 @@
+import os
+import time
+
+from app.services.data_service import get_price_window
+from app.services.spec_parser import CHIPSET_SOCKETS, cpu_brand, cpu_socket, find_chipset
+
+# -------------------------------------
+# 🧮 예산/호환성 제약을 지키는 견적 조합기 (LLM 없이 결정적으로 계산)
+# -------------------------------------
+# get_hint_products 후보(슬롯당 최대 8개)에서 슬롯마다 하나씩 골라
+#   - 총액 ≤ 예산, 부품별 가격 상한(get_price_window) 준수
+#   - CPU ↔ 메인보드 브랜드/소켓, 메인보드 ↔ 램 DDR 세대 일치
+# 를 만족하면서 점수(부품별 가중치 × 가격)가 가장 큰 조합을 분기 한정(branch-and-bound)으로 찾는다.
+SOLVER_MAX_NODES = int(os.getenv("SOLVER_MAX_NODES", "200000"))  # 탐색 노드 상한 (넘으면 지금까지 최선 반환)
+
+# 조합 순서 (제약이 많은 슬롯부터 → 가지치기가 빨라짐)
+SLOT_ORDER = ["cpu", "mboard", "ram", "gpu", "ssd", "power", "cooler", "case"]
+
+# 같은 돈이면 어디에 쓰는 게 나은지 (GPU에 가장 많이 투자)
+SLOT_WEIGHTS = {
+    "gpu": 1.0, "cpu": 0.8, "ram": 0.45, "mboard": 0.4,
+    "ssd": 0.4, "power": 0.3, "cooler": 0.2, "case": 0.2,
+}
+
+
+def part_profile(key: str, item):
+    """후보 하나의 호환성 판단용 속성 (brand / socket / mem_gen)"""
+    name_up = (item.get("name") or "").upper()
+    profile = {"mem_gen": item.get("mem_gen") or None}
+
+    # 적재 시점에 스펙에서 파싱한 socket 이 있으면 그대로 사용 (없으면 이름으로 추정)
+    if key == "cpu":
+        profile["brand"] = cpu_brand(name_up)
+        profile["socket"] = item.get("socket") or cpu_socket(name_up, profile["brand"])
+    elif key == "mboard":
+        category = item.get("category") or ""
+        profile["brand"] = "intel" if category.endswith("intel") else "amd" if category.endswith("amd") else None
+        profile["socket"] = item.get("socket") or CHIPSET_SOCKETS.get(find_chipset(name_up))
+    return profile
+
+
+def compatible(key: str, profile, chosen) -> bool:
+    """chosen: {슬롯: profile} 에 key 후보를 더해도 되는지 (모르는 값은 통과)"""
+    def same(a, b):
+        return a is None or b is None or a == b
+
+    if key == "mboard" and "cpu" in chosen:
+        cpu = chosen["cpu"]
+        if not same(cpu["brand"], profile["brand"]) or not same(cpu["socket"], profile["socket"]):
+            return False
+    if key == "ram" and "mboard" in chosen:
+        if not same(chosen["mboard"]["mem_gen"], profile["mem_gen"]):
+            return False
+    return True
+
+
+def build_candidates(hint_products, budget: int, board_type: str = None, cooler_type: str = None):
+    """슬롯별 후보 (가격 상한/사용자 지정 타입 적용, 점수 높은 순)"""
+    candidates = {}
+    for key in SLOT_ORDER:
+        _, max_p = get_price_window(key, budget)
+        items = []
+        for item in hint_products.get(key, []):
+            price = int(item.get("price") or 0)
+            if price <= 0 or price > max_p: continue
+            if key == "mboard" and board_type and item.get("category") != board_type: continue
+            if key == "cooler" and cooler_type and item.get("category") != cooler_type: continue
+            if key == "cpu" and board_type and cpu_brand((item.get("name") or "").upper()) not in (None, board_type.split("_")[-1]): continue
+            items.append((price, item, part_profile(key, item)))
+        if items:
+            candidates[key] = sorted(items, key=lambda x: -x[0])
+    return candidates
+
+
+def _search(slots, candidates, budget, weight):
+    # 남은 슬롯들의 최소 비용 / 최대 점수 (가지치기용)
+    min_rest = [0] * (len(slots) + 1)
+    max_rest = [0.0] * (len(slots) + 1)
+    for i in range(len(slots) - 1, -1, -1):
+        options = candidates[slots[i]]
+        min_rest[i] = min_rest[i + 1] + min(price for price, _, _ in options)
+        max_rest[i] = max_rest[i + 1] + max(weight(slots[i], price) for price, _, _ in options)
+
+    best = {"score": float("-inf"), "cost": 0, "picks": None}
+    picks, profiles = {}, {}
+    nodes = 0
+
+    def dfs(i, cost, score):
+        nonlocal nodes
+        nodes += 1
+        if nodes > SOLVER_MAX_NODES:
+            return
+        # 점수 상한이 최선보다 낮으면 제외. 같으면 더 싸게 끝날 수 있을 때만 계속 (끝에서 같은 점수는 싼 쪽을 고름)
+        bound = score + max_rest[i]
+        if bound < best["score"] or (bound == best["score"] and cost + min_rest[i] >= best["cost"]):
+            return
+        if i == len(slots):
+            if score > best["score"] or (score == best["score"] and cost < best["cost"]):
+                best.update(score=score, cost=cost, picks=dict(picks))
+            return
+
+        key = slots[i]
+        for price, item, profile in candidates[key]:
+            if cost + price + min_rest[i + 1] > budget: continue
+            if not compatible(key, profile, profiles): continue
+            picks[key], profiles[key] = item, profile
+            dfs(i + 1, cost + price, score + weight(key, price))
+            del picks[key], profiles[key]
+
+    dfs(0, 0, 0.0)
+    return best, nodes
+
+
+def solve_build(hint_products, budget: int, board_type: str = None, cooler_type: str = None):
+    """→ (견적 dict 또는 None, 풀이 정보). 견적 형식은 LLM 출력과 같음"""
+    started = time.perf_counter()
+    candidates = build_candidates(hint_products, budget, board_type, cooler_type)
+    slots = [key for key in SLOT_ORDER if key in candidates]
+
+    # 1차: 예산 안에서 점수 최대
+    best, nodes = _search(slots, candidates, budget, lambda key, price: SLOT_WEIGHTS.get(key, 0.1) * price)
+    within_budget = best["picks"] is not None
+
+    # 2차: 예산 안 조합이 없으면 호환되는 가장 싼 조합
+    if not within_budget:
+        best, extra = _search(slots, candidates, float("inf"), lambda key, price: -price)
+        nodes += extra
+
+    info = {
+        "within_budget": within_budget,
+        "nodes": nodes,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 3),
+        "missing_slots": [key for key in SLOT_ORDER if key not in candidates],
+    }
+    if not best["picks"]:   # 후보가 하나도 없으면 빈 조합({}) → 견적 없음
+        print(f"⚠️ [Solver] 호환되는 조합 없음 ({info})")
+        return None, info
+
+    estimate = {
+        key: {"name": item["name"], "price": int(item["price"]), "link": item.get("link", "")}
+        for key, item in sorted(best["picks"].items(), key=lambda kv: SLOT_ORDER.index(kv[0]))
+    }
+    estimate["total_price"] = best["cost"]
+    info["total_price"] = best["cost"]
+    print(f"🧮 [Solver] {best['cost']}원 / 예산 {budget}원 / {nodes}노드 / {info['elapsed_ms']}ms")
+    return estimate, info
@@ -0,0 +1,203 @@
+import os
+import sys
+import time
+import threading
+
+import numpy as np
+
+from app.services.db_pool import get_connection
+from app.services.catalog_version import get_catalog_version
+from app.services.metrics import count_db_query
+from app.services.spec_parser import EMPTY_ATTRIBUTES
+
+# -------------------------------------
+# 📦 인메모리 컬럼형 상품 카탈로그 (읽기 전용 스냅샷)
+# -------------------------------------
+# product 테이블을 (category, price, id) 순으로 한 번 읽어서 컬럼 배열로 보관.
+# 카테고리별 구간이 연속이고 구간 안은 가격 오름차순이라
+# "카테고리 X, 가격 [a, b], 가격순 top k" 를 searchsorted(이분 탐색)로 바로 자른다.
+CATALOG_SNAPSHOT_ENABLED = os.getenv("CATALOG_SNAPSHOT", "1") == "1"
+# 로드 실패 후 다시 시도하기까지 기다리는 시간 (그동안은 기존 스냅샷 또는 SQL)
+SNAPSHOT_RETRY_SECONDS = float(os.getenv("CATALOG_SNAPSHOT_RETRY_SECONDS", "30"))
+
+# 적재 시점 분류값(product_classifier) → 비트 플래그
+FLAG_ACCESSORY = 1 << 0
+FLAG_DDR4 = 1 << 1
+FLAG_DDR5 = 1 << 2
+FLAG_NVME = 1 << 3
+
+MEM_GEN_FLAGS = {"DDR4": FLAG_DDR4, "DDR5": FLAG_DDR5}
+
+# 스펙 속성(spec_parser) → 행마다 튜플 하나 (같은 조합은 같은 튜플 객체 공유)
+# spec 본문은 적재 때 이미 이 컬럼들로 파싱돼 있으므로 스냅샷에는 올리지 않음
+SPEC_COLUMNS = tuple(EMPTY_ATTRIBUTES)
+
+
+def row_flags(row) -> int:
+    flags = MEM_GEN_FLAGS.get(row.get("mem_gen") or "", 0)
+    if row.get("is_accessory"):
+        flags |= FLAG_ACCESSORY
+    if row.get("is_nvme"):
+        flags |= FLAG_NVME
+    return flags
+
+
+class CatalogSnapshot:
+    def __init__(self, rows, version: int = 0):
+        self.version = version
+        self.loaded_at = time.time()
+
+        # DB 정렬은 collation(utf8mb4_0900_ai_ci 는 대소문자 무시)에 따라 "CPU" / "Case" 순서가 달라지므로
+        # searchsorted 가 기대하는 순서(코드 오름차순 → 가격 오름차순)로 여기서 다시 정렬
+        rows = sorted(rows, key=lambda row: (row["category"], row["price"], row["id"]))
+        n = len(rows)
+        self.category_names = sorted({row["category"] for row in rows})
+        self.category_codes = {cat: code for code, cat in enumerate(self.category_names)}
+
+        self.ids = np.empty(n, dtype=np.int64)
+        self.price = np.empty(n, dtype=np.int32)
+        self.category = np.empty(n, dtype=np.uint16)
+        self.flags = np.zeros(n, dtype=np.uint8)
+        self.names, self.links = [], []
+        self.spec_attrs = []
+        shared = {}
+
+        for i, row in enumerate(rows):
+            self.ids[i] = row["id"]
+            self.price[i] = row["price"]
+            self.category[i] = self.category_codes[row["category"]]
+            self.flags[i] = row_flags(row)
+            self.names.append(sys.intern(row["name"]))
+            self.links.append(row["link"] or "")
+            attrs = tuple(row.get(col) or EMPTY_ATTRIBUTES[col] for col in SPEC_COLUMNS)
+            self.spec_attrs.append(shared.setdefault(attrs, attrs))
+
+        # 카테고리별 [시작, 끝) 구간
+        self.offsets = {}
+        codes = self.category
+        for code, cat in enumerate(self.category_names):
+            start = int(np.searchsorted(codes, code, side="left"))
+            end = int(np.searchsorted(codes, code, side="right"))
+            self.offsets[cat] = (start, end)
+
+    def __len__(self):
+        return len(self.names)
+
+    def _row(self, i):
+        flags = int(self.flags[i])
+        return {
+            "name": self.names[i],
+            "category": self.category_names[self.category[i]],
+            "price": int(self.price[i]),
+            "link": self.links[i],
+            "is_accessory": int(bool(flags & FLAG_ACCESSORY)),
+            "mem_gen": "DDR5" if flags & FLAG_DDR5 else "DDR4" if flags & FLAG_DDR4 else "",
+            "is_nvme": int(bool(flags & FLAG_NVME)),
+            **dict(zip(SPEC_COLUMNS, self.spec_attrs[i])),
+        }
+
+    def query(self, category: str, min_price: int = None, max_price: int = None, k: int = 10,
+              descending: bool = False, require_flags: int = 0, exclude_flags: int = 0):
+        """카테고리 X, 가격 [min_price, max_price], 가격순 상위 k개"""
+        if category not in self.offsets:
+            return []
+        start, end = self.offsets[category]
+        prices = self.price[start:end]
+
+        lo = start + (int(np.searchsorted(prices, min_price, side="left")) if min_price is not None else 0)
+        hi = start + (int(np.searchsorted(prices, max_price, side="right")) if max_price is not None else end - start)
+        if lo >= hi:
+            return []
+
+        if require_flags or exclude_flags:
+            window = self.flags[lo:hi]
+            mask = np.ones(hi - lo, dtype=bool)
+            if require_flags:
+                mask &= (window & require_flags) == require_flags
+            if exclude_flags:
+                mask &= (window & exclude_flags) == 0
+            idx = lo + np.flatnonzero(mask)
+        else:
+            idx = np.arange(lo, hi)
+
+        idx = idx[::-1][:k] if descending else idx[:k]
+        return [self._row(int(i)) for i in idx]
+
+    def memory_bytes(self):
+        arrays = self.ids.nbytes + self.price.nbytes + self.category.nbytes + self.flags.nbytes
+        # 이름은 intern 되어 있어 중복 이름은 한 번만 계산
+        names = sum(sys.getsizeof(s) for s in {id(s): s for s in self.names}.values())
+        strings = names + sum(sys.getsizeof(s) for s in self.links)
+        strings += sum(sys.getsizeof(t) for t in {id(t): t for t in self.spec_attrs}.values())
+        lists = sys.getsizeof(self.names) + sys.getsizeof(self.links) + sys.getsizeof(self.spec_attrs)
+        return {"arrays": arrays, "strings": strings, "lists": lists, "total": arrays + strings + lists}
+
+    def stats(self):
+        return {
+            "version": self.version,
+            "rows": len(self),
+            "categories": {cat: end - start for cat, (start, end) in self.offsets.items()},
+            "loaded_at": self.loaded_at,
+            "memory_bytes": self.memory_bytes(),
+        }
+
+
+def load_snapshot(version: int = 0) -> CatalogSnapshot:
+    started = time.perf_counter()
+    with get_connection() as conn:
+        cursor = conn.cursor(dictionary=True)
+        # idx_category_price 순서로 읽음 (collation 차이는 CatalogSnapshot 에서 다시 정렬)
+        count_db_query("catalog_snapshot_load")
+        cursor.execute(
+            f"SELECT id, name, category, price, link, is_accessory, mem_gen, is_nvme, {', '.join(SPEC_COLUMNS)} FROM product "
+            "WHERE price > 0 ORDER BY category, price, id"
+        )
+        rows = cursor.fetchall()
+        cursor.close()
+
+    snapshot = CatalogSnapshot(rows, version)
+    print(
+        f"📦 [CatalogSnapshot] v{version} 로드: {len(snapshot)}개 / "
+        f"{snapshot.memory_bytes()['total'] / 1024 / 1024:.1f}MB / {time.perf_counter() - started:.2f}s"
+    )
+    return snapshot
+
+
+# -------------------------------------
+# ♻️ 카탈로그 버전이 바뀌면 교체 (다시 읽는 동안 다른 요청은 기존 스냅샷 사용)
+# -------------------------------------
+_snapshot = None
+_reload_lock = threading.Lock()
+_retry_after = 0.0   # 로드 실패 시 이 시각(monotonic)까지는 다시 읽지 않음
+
+
+def get_catalog_snapshot():
+    global _snapshot, _retry_after
+    if not CATALOG_SNAPSHOT_ENABLED:
+        return None
+
+    version = get_catalog_version()
+    if _snapshot is not None and _snapshot.version == version:
+        return _snapshot
+    if time.monotonic() < _retry_after:
+        return _snapshot
+
+    # 처음 로드가 아니면 다른 스레드가 갱신 중일 때 기다리지 않고 기존 스냅샷 반환
+    if not _reload_lock.acquire(blocking=_snapshot is None):
+        return _snapshot
+    try:
+        if _snapshot is None or _snapshot.version != version:
+            _snapshot = load_snapshot(version)
+    except Exception as e:
+        # 매 요청마다 전체 테이블을 다시 읽으려 하지 않도록 잠시 쉼 (그동안 기존 스냅샷, 없으면 SQL)
+        print(f"⚠️ [CatalogSnapshot] 로드 실패, {SNAPSHOT_RETRY_SECONDS:.0f}s 뒤 재시도: {e}")
+        _retry_after = time.monotonic() + SNAPSHOT_RETRY_SECONDS
+    finally:
+        _reload_lock.release()
+    return _snapshot
+
+
+def snapshot_stats():
+    if _snapshot is None:
+        return {"enabled": CATALOG_SNAPSHOT_ENABLED, "loaded": False}
+    return dict(_snapshot.stats(), enabled=CATALOG_SNAPSHOT_ENABLED, loaded=True)
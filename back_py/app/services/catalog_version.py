@@ -0,0 +1,48 @@
+import os
+import time
+import threading
+
+import redis
+
+# -------------------------------------
+# 🏷️ 카탈로그 버전 (크롤러가 MySQL/Chroma 저장 후 올림)
+# -------------------------------------
+# 캐시들은 이 값을 키에 넣어서, 버전이 바뀌면 예전 결과를 쓰지 않는다.
+CATALOG_VERSION_KEY = "catalog:version"
+CATALOG_VERSION_TTL = float(os.getenv("CATALOG_VERSION_TTL", "2"))  # 로컬에 기억하는 시간(초) → Redis 조회 횟수 절감
+
+_redis = redis.Redis(
+    host=os.getenv("REDIS_HOST", "redis"),
+    port=int(os.getenv("REDIS_PORT", "6379")),
+    decode_responses=True,
+    socket_timeout=1,
+)
+
+_cached = {"version": 0, "checked_at": 0.0}
+_lock = threading.Lock()
+
+
+def get_catalog_version() -> int:
+    now = time.monotonic()
+    if now - _cached["checked_at"] < CATALOG_VERSION_TTL:
+        return _cached["version"]
+
+    with _lock:
+        if now - _cached["checked_at"] < CATALOG_VERSION_TTL:
+            return _cached["version"]
+        try:
+            _cached["version"] = int(_redis.get(CATALOG_VERSION_KEY) or 0)
+        except redis.RedisError as e:
+            # Redis 장애 시 마지막으로 알던 버전 유지
+            print(f"⚠️ [CatalogVersion] 조회 실패: {e}")
+        _cached["checked_at"] = now
+        return _cached["version"]
+
+
+def bump_catalog_version() -> int:
+    version = int(_redis.incr(CATALOG_VERSION_KEY))
+    with _lock:
+        _cached["version"] = version
+        _cached["checked_at"] = time.monotonic()
+    print(f"🏷️ [CatalogVersion] 카탈로그 버전 → {version}")
+    return version
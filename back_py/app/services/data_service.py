@@ -1,9 +1,23 @@
 import os
 import chromadb
-import mysql.connector
+import time
+import contextvars
 import pandas as pd
+from concurrent.futures import Future, ThreadPoolExecutor, FIRST_COMPLETED, wait
 from datetime import datetime
 from openai import OpenAI
+from app.services.db_pool import get_connection
+from app.services.embedding_cache import get_cached_embedding, get_cached_embeddings
+from app.services.cache_utils import LRUCache
+from app.services.single_flight import SingleFlight
+from app.services.metrics import stage, observe_category, count_db_query, count_cache
+from app.services.catalog_version import get_catalog_version
+from app.services.catalog_snapshot import get_catalog_snapshot
+from app.services.product_classifier import (
+    HINT_CATEGORIES, CLASSIFIED_COLUMNS, backfill_chroma, classification_where, classify_product, matches_classification,
+)
+
+EMBEDDING_MODEL = "text-embedding-3-small"
 
 openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
@@ -15,13 +29,37 @@ def get_collection():
     global _chroma_client, _chroma_collection
     if _chroma_collection is None:
         try:
-            _chroma_client = chromadb.PersistentClient(path="/app/chroma")
+            _chroma_client = chromadb.PersistentClient(path=os.getenv("CHROMA_PATH", "/app/chroma"))
             _chroma_collection = _chroma_client.get_or_create_collection(name="products")
         except Exception as e:
             print(f"❌ ChromaDB 연결 실패: {e}")
             return None
     return _chroma_collection
 
+# ✅ hint 검색 동시 실행 설정 (HINT_CONCURRENCY=1 이면 카테고리 순서대로 하나씩, 타임아웃/실패 처리는 같음)
+HINT_CONCURRENCY = int(os.getenv("HINT_CONCURRENCY", "8"))
+HINT_CATEGORY_TIMEOUT = float(os.getenv("HINT_CATEGORY_TIMEOUT", "5"))
+# 메인보드는 CPU 검색과 같은 패스에서 소켓 조건 없이 이 배수만큼 가져와 CPU 후보 소켓으로 거름
+BOARD_OVERFETCH = int(os.getenv("HINT_BOARD_OVERFETCH", "3"))
+# 공용 풀이 꽉 차 있을 때 작업이 시작을 기다리는 최대 시간
+HINT_QUEUE_TIMEOUT = float(os.getenv("HINT_QUEUE_TIMEOUT", "10"))
+
+# ✅ hint 결과 캐시 (같은 예산/용도면 카탈로그가 바뀌기 전까지 같은 결과)
+HINT_CACHE_ENABLED = os.getenv("HINT_CACHE", "1") == "1"
+HINT_CACHE_SIZE = int(os.getenv("HINT_CACHE_SIZE", "256"))
+HINT_CACHE_TTL = float(os.getenv("HINT_CACHE_TTL", str(60 * 30)))  # 30분
+_hint_cache = LRUCache(maxsize=HINT_CACHE_SIZE, ttl=HINT_CACHE_TTL)
+# 예산은 이 단위로 내림해서 검색 (가격 구간/전략도 같은 값 기준 → 같은 구간 예산은 같은 캐시 결과)
+HINT_BUDGET_BUCKET = int(os.getenv("HINT_BUDGET_BUCKET", "50000"))
+_hint_cache_version = {"version": None}
+
+# 동시에 들어온 같은 검색은 한 번만 실행 (캐시 미스가 몰릴 때 중복 실행 방지)
+_hint_flight = SingleFlight("hint_products")
+_chroma_flight = SingleFlight("chroma_query")
+
+# ✅ 예산을 말하지 않은 요청의 기본 예산
+DEFAULT_BUDGET = 1500000
+
 # ✅ 부품별 예산 비중 (GPU에 집중)
 BUDGET_RATIOS = {
     "cpu": (0.15, 0.25),
@@ -34,192 +72,534 @@ BUDGET_RATIOS = {
     "case": (0.03, 0.05),
 }
 
-# 🚨 [필수] 가짜 데이터 거르기 (이 단어 있으면 무조건 탈락)
-NEGATIVE_KEYWORDS = {
-    "gpu": ["FAN", "팬", "COOLER", "쿨러", "케이스", "CASE", "지지대", "CABLE"],
-    "cpu": ["COOLER", "쿨러", "FAN", "팬"],
-    "ssd": ["CASE", "케이스", "ENCLOSURE", "방열판"],
-    "ram": ["방열판", "HEATSINK"],
-}
+# 🚨 가짜 부품(NEGATIVE_KEYWORDS) / 메모리 세대 / NVMe 분류, 소켓 등 스펙 속성은 적재 시점에 product_classifier 에서 계산
+#    → 검색 시에는 where 절 조건으로만 사용
 
-def get_connection():
-    return mysql.connector.connect(
-        host="db", user="root", password="1234", database="project", charset="utf8mb4", collation="utf8mb4_unicode_ci"
-    )
+# ✅ 사용자 요청에서 뽑아내는 용도 키워드 (parse_query와 공유)
+PURPOSE_KEYWORDS = ["사무", "게임", "롤", "영상", "편집", "디자인", "작업"]
 
-def get_openai_embedding(text: str):
-    res = openai_client.embeddings.create(model="text-embedding-3-small", input=text)
+def _fetch_openai_embedding(text: str):
+    res = openai_client.embeddings.create(model=EMBEDDING_MODEL, input=text)
     return res.data[0].embedding
 
-# ✅ Chroma 검색
-def get_chroma_products(query_text: str, category_filter: str = None, min_price: int = 0, max_price: int = 99999999, keyword_filter: str = None, n_results: int = 10):
-    try:
+def get_openai_embedding(text: str):
+    # 임베딩 캐시 (LRU → Redis) 미스일 때만 API 호출
+    return get_cached_embedding(text, EMBEDDING_MODEL, _fetch_openai_embedding)
+
+def get_query_embedding(text: str):
+    # 사용자 질문 원문의 임베딩은 Redis(30일 보관)에 남기지 않고 프로세스 LRU 에만
+    return get_cached_embedding(text, EMBEDDING_MODEL, _fetch_openai_embedding, persist=False)
+
+def _fetch_openai_embeddings(texts: list[str]):
+    res = openai_client.embeddings.create(model=EMBEDDING_MODEL, input=texts)
+    return [item.embedding for item in res.data]
+
+def get_openai_embeddings(texts: list[str]):
+    """여러 문장을 한 번에 임베딩 (캐시 미스분만 1회 요청)"""
+    return get_cached_embeddings(texts, EMBEDDING_MODEL, _fetch_openai_embeddings)
+
+def build_hint_query(cat: str, purpose: str = None):
+    return f"{cat} {purpose or ''} 고성능".strip()
+
+def prewarm_query_embeddings(purposes=None):
+    """카테고리 × 용도(없음 포함) 조합의 쿼리 임베딩을 미리 캐시에 채움"""
+    purposes = purposes if purposes is not None else [None] + PURPOSE_KEYWORDS
+    count = 0
+    for cat_list in HINT_CATEGORIES.values():
+        for cat in cat_list:
+            for purpose in purposes:
+                get_openai_embedding(build_hint_query(cat, purpose))
+                count += 1
+    return count
+
+# ✅ Chroma where 절 (가짜 부품 / 메모리 세대 / NVMe / 메인보드 소켓 조건까지 포함)
+def build_chroma_where(category_filter: str = None, min_price: int = 0, max_price: int = 99999999, keyword_filter: str = None, sockets=None, classified: bool = True):
+    where_clauses = []
+    if category_filter: where_clauses.append({"category": {"$eq": category_filter}})
+    where_clauses.append({"price": {"$gte": min_price}})
+    where_clauses.append({"price": {"$lte": max_price}})
+    if classified:
+        where_clauses.extend(classification_where(category_filter, keyword_filter, sockets))
+    return {"$and": where_clauses} if len(where_clauses) > 1 else where_clauses[0]
+
+def flatten_metadatas(metadatas):
+    flattened = []
+    for entry in metadatas:
+        if isinstance(entry, list): flattened.extend(entry)
+        elif isinstance(entry, dict): flattened.append(entry)
+    return flattened
+
+# ✅ 분류 메타데이터가 없는 예전 문서 (backfill 전 배포)
+# where 절의 분류 조건은 키가 없는 문서를 모두 걸러내므로, 이런 문서가 남아 있는 동안은
+# 분류 조건 없이 한 번 더 검색해서 그 자리에서 분류 → 같은 조건으로 거름 (3배수 조회)
+LEGACY_OVERFETCH = 3
+_unclassified = {"count": None}   # None: 아직 안 셈
+
+def count_unclassified(collection) -> int:
+    classified = collection.get(where={"is_accessory": {"$in": [0, 1]}}, include=[])
+    return collection.count() - len(classified["ids"])
+
+def unclassified_docs() -> int:
+    if _unclassified["count"] is None:
         collection = get_collection()
-        if collection is None: return []
+        if collection is None: return 0
+        try:
+            _unclassified["count"] = count_unclassified(collection)
+        except Exception as e:
+            print(f"⚠️ [Chroma] 미분류 문서 확인 실패: {e}")
+            return 0
+    return _unclassified["count"]
+
+def backfill_unclassified():
+    """미분류 문서가 있으면 Chroma 메타데이터를 채움 (서버 시작 시 백그라운드). → 갱신한 문서 수"""
+    collection = get_collection()
+    if collection is None or not unclassified_docs():
+        return 0
+    print(f"🏷️ [Backfill] 분류 메타데이터 없는 Chroma 문서 {_unclassified['count']}개 → 채우는 중")
+    changed = backfill_chroma(collection)
+    _unclassified["count"] = count_unclassified(collection)
+    return changed
+
+def _legacy_chroma_items(collection, query_embedding, category_filter, min_price, max_price, keyword_filter, n_results, sockets=None):
+    """분류 키가 없는 문서만 골라 그 자리에서 분류 후 classification_where 와 같은 조건으로 거름"""
+    results = collection.query(
+        query_embeddings=[query_embedding],
+        n_results=n_results * LEGACY_OVERFETCH,
+        include=["metadatas", "documents"],
+        where=build_chroma_where(category_filter, min_price, max_price, classified=False),
+    )
+    items = []
+    for meta, doc in zip(flatten_metadatas(results.get("metadatas", [])), (results.get("documents") or [[]])[0]):
+        if "is_accessory" in meta: continue   # 분류된 문서는 본 검색에서 이미 처리
+        item = dict(meta, **classify_product(dict(meta, spec=doc or "")))
+        if matches_classification(item, category_filter, keyword_filter, sockets):
+            items.append(item)
+    return items
+
+def _with_legacy(collection, items, query_embedding, category_filter, min_price, max_price, keyword_filter, n_results, sockets=None):
+    if len(items) >= n_results or not unclassified_docs():
+        return items
+    legacy = _legacy_chroma_items(collection, query_embedding, category_filter, min_price, max_price, keyword_filter, n_results, sockets)
+    return (items + legacy)[:n_results]
 
+# ✅ Chroma 검색
+def _query_chroma(query_text, category_filter, min_price, max_price, keyword_filter, n_results, query_embedding, sockets=None):
+    collection = get_collection()
+    if collection is None: return []
+
+    if query_embedding is None:
         query_embedding = get_openai_embedding(query_text)
-        
-        where_clauses = []
-        if category_filter: where_clauses.append({"category": {"$eq": category_filter}})
-        where_clauses.append({"price": {"$gte": min_price}})
-        where_clauses.append({"price": {"$lte": max_price}})
-        final_where = {"$and": where_clauses} if len(where_clauses) > 1 else where_clauses[0]
-
-        # 넉넉하게 3배수 가져와서 필터링
-        results = collection.query(
-            query_embeddings=[query_embedding],
-            n_results=n_results * 3,
-            include=["metadatas"],
-            where=final_where
-        )
 
-        flattened = []
-        for entry in results.get("metadatas", []):
-            if isinstance(entry, list): flattened.extend(entry)
-            elif isinstance(entry, dict): flattened.append(entry)
-
-        filtered = []
-        
-        # 🕵️ 네거티브 & 포지티브 필터링 적용
-        negatives = NEGATIVE_KEYWORDS.get(category_filter, [])
-        target_kw = keyword_filter.upper() if keyword_filter else None
-
-        for item in flattened:
-            name_upper = item["name"].upper()
-            
-            # 1. 네거티브 체크 (가짜 부품 제거)
-            if any(neg in name_upper for neg in negatives): continue
-
-            # 2. 키워드 체크
-            if category_filter == "mboard":
-                if target_kw == "DDR5":
-                    if "DDR4" in name_upper or " D4" in name_upper: continue
-                    if "B660" in name_upper and "DDR5" not in name_upper: continue
-                elif target_kw == "DDR4":
-                    if "DDR4" not in name_upper and " D4" not in name_upper: continue
-            
-            elif category_filter == "ram" and target_kw and target_kw not in name_upper: continue
-            
-            # SSD NVMe 강제
-            elif category_filter == "ssd" and target_kw == "NVME":
-                if "NVME" not in name_upper: continue
-
-            filtered.append(item)
-        
-        # 로그 출력
-        log_msg = f"🧠 [Chroma] '{category_filter}' 검색: {len(filtered)}개 (가격: {min_price}~{max_price})"
-        print(log_msg)
-        
-        return filtered[:n_results]
+    # 필터가 모두 where 절에 들어가 있으므로 필요한 만큼만 가져옴
+    started = time.perf_counter()
+    results = collection.query(
+        query_embeddings=[query_embedding],
+        n_results=n_results,
+        include=["metadatas"],
+        where=build_chroma_where(category_filter, min_price, max_price, keyword_filter, sockets)
+    )
+
+    filtered = flatten_metadatas(results.get("metadatas", []))
+    filtered = _with_legacy(collection, filtered, query_embedding, category_filter, min_price, max_price, keyword_filter, n_results, sockets)
+    observe_category(category_filter, "chroma", time.perf_counter() - started)
+
+    # 로그 출력
+    log_msg = f"🧠 [Chroma] '{category_filter}' 검색: {len(filtered)}개 (가격: {min_price}~{max_price})"
+    print(log_msg)
+
+    return filtered[:n_results]
+
+def get_chroma_products(query_text: str, category_filter: str = None, min_price: int = 0, max_price: int = 99999999, keyword_filter: str = None, n_results: int = 10, query_embedding=None, errors: list = None, sockets=None):
+    try:
+        # 같은 문장 + 같은 필터 검색이 진행 중이면 그 결과를 같이 받음 (실패도 같이 받아서 errors 에 기록)
+        key = (query_text, category_filter, min_price, max_price, keyword_filter, n_results, tuple(sorted(sockets or ())))
+        return list(_chroma_flight.do(key, _query_chroma, query_text, category_filter, min_price, max_price, keyword_filter, n_results, query_embedding, sockets))
 
     except Exception as e:
         print(f"❌ [Chroma] 검색 실패: {e}")
+        if errors is not None: errors.append(f"{category_filter} 검색")
         return []
 
+# ✅ 여러 카테고리 Chroma 검색을 동시에 (카테고리마다 where 가 달라 요청당 query 1회)
+def get_chroma_products_batch(requests, concurrency: int = 1, timeout: float = None, errors: list = None):
+    """requests: [{query_embedding, category_filter, min_price, max_price, keyword_filter, n_results, (sockets)}]
+    → 입력 순서대로 결과 리스트 (타임아웃/실패한 요청은 빈 결과)"""
+    tasks = [
+        (f"{req['category_filter']} 검색", _query_chroma, (
+            None, req["category_filter"], req["min_price"], req["max_price"], req["keyword_filter"],
+            req["n_results"], req["query_embedding"], req.get("sockets"),
+        ))
+        for req in requests
+    ]
+    results = run_bounded(tasks, concurrency, timeout if timeout is not None else HINT_CATEGORY_TIMEOUT, errors=errors)
+    return [items or [] for items in results]
+
 # ✅ MySQL 백업 검색
 def get_mysql_products(cat: str, limit: int = 10):
-    conn = get_connection()
-    df = pd.read_sql(f"SELECT name, category, price, link, spec FROM product WHERE category = '{cat}' AND price > 0 ORDER BY price ASC LIMIT {limit}", conn)
-    conn.close()
+    started = time.perf_counter()
+    # 인메모리 카탈로그 스냅샷이 있으면 DB 왕복 없이 바로 자름 (price > 0, 가격 오름차순)
+    try:
+        snapshot = get_catalog_snapshot()
+    except Exception as e:
+        print(f"⚠️ [CatalogSnapshot] 로드 실패, SQL로 조회: {e}")
+        snapshot = None
+    if snapshot is not None:
+        items = snapshot.query(cat, min_price=1, k=limit)
+        observe_category(cat, "snapshot", time.perf_counter() - started)
+        return items
+
+    count_db_query("mysql_fallback")
+    with get_connection() as conn:
+        df = pd.read_sql(
+            f"SELECT name, category, price, link, {', '.join(CLASSIFIED_COLUMNS)} FROM product WHERE category = %s AND price > 0 ORDER BY price ASC LIMIT %s",
+            conn, params=(cat, int(limit))
+        )
+    observe_category(cat, "mysql", time.perf_counter() - started)
     return df.to_dict(orient="records")
 
 
-# ✅ 최종 함수 (개선된 배율 조절 방식)
-def get_hint_products(budget=None, purpose=None):
-    total_budget = budget if budget else 1500000
-    
+# ✅ 부품별 가격 범위 계산 (개선된 배율 조절 방식)
+def get_price_window(key: str, total_budget: int):
+    ratio_min, ratio_max = BUDGET_RATIOS.get(key, (0, 1.0))
+
+    # 🚨 [수정 1] 배율 조정: 상한선을 타이트하게 (1.5배 -> 1.1배)
+    # 이렇게 하면 아무리 비싼걸 골라도 예산 범위를 크게 벗어나지 않음
+    if total_budget >= 1500000:
+         min_p = int(total_budget * ratio_min)
+         max_p = int(total_budget * ratio_max * 1.1) # 1.1배로 축소
+    else:
+         min_p = int(total_budget * ratio_min * 0.8)
+         max_p = int(total_budget * ratio_max * 1.2)
+
+    # 🚨 [핵심 수정] RAM/SSD 상한선 현실화
+    if key == "ram":
+        min_p = int(total_budget * 0.10)  # 최소 10% (20만원)
+        max_p = int(total_budget * 0.30)  # 최대 30% (60만원)까지 허용
+        # 이렇게 해야 40만원짜리 시금치 램이 검색 범위에 들어옴
+
+    elif key == "ssd":
+        min_p = int(total_budget * 0.02)
+        max_p = int(total_budget * 0.15)
+
+    if key == "gpu" and total_budget > 3500000:
+        max_p = 10000000
+
+    return min_p, max_p
+
+
+# ✅ 카테고리 하나 검색 (Chroma + 하한선 해제 재시도)
+def search_hint_category(cat: str, query_text: str, min_p: int, max_p: int, keyword_filter: str = None, query_embedding=None, errors: list = None, sockets=None, n_results: int = 8):
+    chroma_items = get_chroma_products(query_text, cat, min_p, max_p, keyword_filter, n_results, query_embedding, errors, sockets)
+
+    # 구명조끼 (결과 없으면 하한선 낮춤 - 상한선은 유지!)
+    if not chroma_items and keyword_filter:
+        print(f"⚠️ [Retry] {cat} 하한선 해제")
+        chroma_items = get_chroma_products(query_text, cat, 0, max_p, keyword_filter, n_results * 5 // 8, query_embedding, errors, sockets)
+
+    return chroma_items
+
+
+# ✅ MySQL 백업 결과 필터 (Chroma where 절과 같은 분류 조건)
+def filter_mysql_fallback(key: str, mysql_items, keyword_filter: str, total_budget: int, sockets=None):
+    filtered = []
+
+    for m in mysql_items:
+        if not matches_classification(m, m["category"], keyword_filter, sockets): continue # 가짜/세대/NVMe/소켓 거르기
+
+        # 너무 싼 거 제외 (가짜 방지 2차)
+        if key == "gpu" and m["price"] < total_budget * 0.1: continue
+
+        filtered.append(m)
+
+    return filtered
+
+
+# ✅ 중복 제거 + 정렬 후 상위 8개
+def finalize_hint_items(key: str, items):
+    seen = set()
+    unique = []
+    for p in items:
+        key2 = (p.get("name"), p.get("category"))
+        if key2 not in seen and p.get("price", 0) > 0:
+            seen.add(key2)
+            unique.append(p)
+
+    # 🚨 [수정 3] 정렬 전략 차별화
+    # - 성능 핵심(CPU/GPU) : 비싼 순 (그래야 좋은게 들어감)
+    # - 나머지(RAM/SSD/Case) : 싼 순 (그래야 예산 세이브)
+    if key in ["cpu", "gpu"]:
+        unique.sort(key=lambda x: x["price"], reverse=True) # 내림차순
+    else:
+        unique.sort(key=lambda x: x["price"], reverse=False) # 오름차순 (가성비 우선)
+
+    return unique[:8]
+
+
+# ✅ 여러 작업을 스레드 풀에서 동시에 실행 (작업별 타임아웃, 실패/초과 시 default)
+# 풀은 프로세스 전체가 같이 씀 → 여러 요청이 겹쳐도, 타임아웃으로 버린 작업이 뒤에서 돌고 있어도
+# 동시에 도는 검색은 최대 HINT_CONCURRENCY 개
+_hint_executor = ThreadPoolExecutor(max_workers=max(1, HINT_CONCURRENCY), thread_name_prefix="hint")
+
+def _run_started(started: Future, fn, *args):
+    started.set_result(time.monotonic())   # 기다리는 쪽이 깨어나서 이 시각부터 타임아웃을 잼
+    return fn(*args)
+
+def run_bounded(tasks, concurrency: int, timeout: float, default=None, errors: list = None):
+    """tasks: [(label, fn, args)] → 입력 순서 그대로 결과 리스트 반환 (실패/초과한 작업 label은 errors에 기록)
+    timeout 은 작업이 풀에서 실제로 시작된 시점부터 잰다 (앞선 요청이 버린 작업이 풀을 잡고 있던 시간은 안 셈).
+    풀 대기는 HINT_QUEUE_TIMEOUT 까지만 하고, 그때까지 시작 못 한 작업은 취소."""
+    results = [default] * len(tasks)
+    failed = []
+    queued = list(range(len(tasks)))[::-1]
+    running = {}   # future → (작업 번호, 시작 시각 Future, 제출 시각)
+
+    def deadline_of(started, submitted):
+        return started.result() + timeout if started.done() else submitted + HINT_QUEUE_TIMEOUT
+
+    while queued or running:
+        while queued and len(running) < max(1, concurrency):
+            i = queued.pop()
+            _, fn, args = tasks[i]
+            started = Future()
+            # 요청별 시간 기록(contextvars)이 작업 스레드에서도 보이도록 컨텍스트 복사본에서 실행
+            future = _hint_executor.submit(contextvars.copy_context().run, _run_started, started, fn, *args)
+            running[future] = (i, started, time.monotonic())
+
+        # 작업 완료 또는 아직 대기 중인 작업의 시작 중 먼저 오는 것까지 기다림
+        next_deadline = min(deadline_of(started, submitted) for _, started, submitted in running.values())
+        waiting_starts = [started for _, started, _ in running.values() if not started.done()]
+        wait(list(running) + waiting_starts, timeout=max(0, next_deadline - time.monotonic()), return_when=FIRST_COMPLETED)
+
+        for future in [f for f in running if f.done()]:
+            i, _, _ = running.pop(future)
+            try:
+                results[i] = future.result()
+            except Exception as e:
+                print(f"❌ [Hint] {tasks[i][0]} 실패: {e}")
+                failed.append(i)
+
+        now = time.monotonic()
+        for future, (i, started, submitted) in list(running.items()):
+            if deadline_of(started, submitted) > now:
+                continue
+            if started.done():
+                # 돌고 있는 스레드는 멈출 수 없으니 버림 (풀 자리는 끝날 때까지 차지)
+                print(f"⏱️ [Hint] {tasks[i][0]} 타임아웃 ({timeout}s) → 건너뜀")
+            elif future.cancel():
+                print(f"⏱️ [Hint] {tasks[i][0]} 풀 대기 초과 ({HINT_QUEUE_TIMEOUT}s) → 취소")
+            else:
+                continue   # 방금 시작됨 → 시작 시각 기준으로 다시 잼
+            del running[future]
+            failed.append(i)
+
+    if errors is not None:
+        errors.extend(tasks[i][0] for i in sorted(failed))
+    return results
+
+
+def run_one_bounded(label: str, fn, args, timeout: float, default=None, errors: list = None):
+    """작업 하나를 run_bounded 와 같은 타임아웃/실패 규칙으로 실행 (순차 경로용)"""
+    return run_bounded([(label, fn, args)], 1, timeout, default=default, errors=errors)[0]
+
+
+# ✅ hint 결과 캐시 키 (정규화된 입력 + 카탈로그 버전)
+def bucket_budget(total_budget: int) -> int:
+    if HINT_BUDGET_BUCKET <= 0:
+        return total_budget
+    return max(HINT_BUDGET_BUCKET, total_budget // HINT_BUDGET_BUCKET * HINT_BUDGET_BUCKET)
+
+def hint_cache_key(total_budget: int, purpose: str, target_memory_type: str, ssd_type: str, version: int):
+    return (version, total_budget, (purpose or "").strip(), target_memory_type, ssd_type or "SATA")
+
+def hint_cache_stats():
+    return dict(_hint_cache.stats(), catalog_version=_hint_cache_version["version"], enabled=HINT_CACHE_ENABLED)
+
+def flush_hint_cache():
+    _hint_cache.clear()
+
+
+# ✅ 최종 함수
+def get_hint_products(budget=None, purpose=None, concurrency: int = None, timeout: float = None):
+    total_budget = bucket_budget(budget if budget else DEFAULT_BUDGET)
+    concurrency = HINT_CONCURRENCY if concurrency is None else concurrency
+    timeout = HINT_CATEGORY_TIMEOUT if timeout is None else timeout
+
     target_memory_type = "DDR5" if total_budget >= 1300000 else "DDR4"
     ssd_type = "NVME" if total_budget >= 900000 else None
 
     print(f"🎯 [Strategy] 예산 {total_budget}원 -> {target_memory_type} / {ssd_type or 'SATA'}")
 
-    categories = {
-        "cpu": ["CPU"], "gpu": ["VGA"], "ram": ["RAM"], "ssd": ["SSD"],
-        "mboard": ["MBoard_intel", "MBoard_amd"], "cooler": ["Cooler_Air", "Cooler_Liquid"],
-        "power": ["Power"], "case": ["Case"],
-    }
+    # 카탈로그 버전이 바뀌면 예전 결과는 통째로 버림
+    version = get_catalog_version()
+    if version != _hint_cache_version["version"]:
+        _hint_cache.clear()
+        _hint_cache_version["version"] = version
+        _unclassified["count"] = None   # 크롤링/backfill 로 분류됐을 수 있으므로 다시 셈
 
-    result = {key: [] for key in categories.keys()}
+    key = hint_cache_key(total_budget, purpose, target_memory_type, ssd_type, version)
+    if HINT_CACHE_ENABLED:
+        cached = _hint_cache.get(key)
+        count_cache("hint", "hit" if cached is not None else "miss")
+        if cached is not None:
+            print(f"♻️ [HintCache] 캐시 적중 (catalog v{version})")
+            return {k: list(v) for k, v in cached.items()}
 
-    for key, cat_list in categories.items():
-        items = []
+    # 같은 조건으로 진행 중인 검색이 있으면 합류 (결과는 호출자별 복사본)
+    result = _hint_flight.do(key, _retrieve_and_cache_hint_products, key, total_budget, purpose, target_memory_type, ssd_type, concurrency, timeout)
+    return {k: list(v) for k, v in result.items()}
+
+
+def _retrieve_and_cache_hint_products(key, total_budget, purpose, target_memory_type, ssd_type, concurrency, timeout):
+    errors = []
+    result = _retrieve_hint_products(total_budget, purpose, target_memory_type, ssd_type, concurrency, timeout, errors)
 
-        ratio_min, ratio_max = BUDGET_RATIOS.get(key, (0, 1.0))
-        
-        # 🚨 [수정 1] 배율 조정: 상한선을 타이트하게 (1.5배 -> 1.1배)
-        # 이렇게 하면 아무리 비싼걸 골라도 예산 범위를 크게 벗어나지 않음
-        if total_budget >= 1500000:
-             min_p = int(total_budget * ratio_min)
-             max_p = int(total_budget * ratio_max * 1.1) # 1.1배로 축소
-        else:
-             min_p = int(total_budget * ratio_min * 0.8)
-             max_p = int(total_budget * ratio_max * 1.2)
-
-        # 🚨 [핵심 수정] RAM/SSD 상한선 현실화
-        if key == "ram":
-            min_p = int(total_budget * 0.10)  # 최소 10% (20만원)
-            max_p = int(total_budget * 0.30)  # 최대 30% (60만원)까지 허용
-            # 이렇게 해야 40만원짜리 시금치 램이 검색 범위에 들어옴
-        
-        elif key == "ssd":
-            min_p = int(total_budget * 0.02)
-            max_p = int(total_budget * 0.15)
-
-        if key == "gpu" and total_budget > 3500000:
-            max_p = 10000000
+    # 타임아웃/실패로 빠진 카테고리가 있으면 불완전한 결과이므로 캐시하지 않음
+    if HINT_CACHE_ENABLED and not errors:
+        _hint_cache.set(key, {k: list(v) for k, v in result.items()})
+    return result
+
+
+def _retrieve_hint_products(total_budget, purpose, target_memory_type, ssd_type, concurrency, timeout, errors):
+    categories = HINT_CATEGORIES
+
+    # 부품별 검색 조건
+    plans = {}
+    for key in categories.keys():
+        min_p, max_p = get_price_window(key, total_budget)
 
         keyword_filter = None
         if key in ["ram", "mboard"]: keyword_filter = target_memory_type
         if key == "ssd": keyword_filter = ssd_type
 
+        plans[key] = (min_p, max_p, keyword_filter)
+
+    # 0단계: 이번 패스에 필요한 쿼리 문장을 모두 모아 한 번에 임베딩 (재시도도 같은 문장 사용)
+    query_texts = {cat: build_hint_query(cat, purpose) for cat_list in categories.values() for cat in cat_list}
+    unique_texts = list(dict.fromkeys(query_texts.values()))
+    try:
+        with stage("hint_embedding"):
+            text_embeddings = dict(zip(unique_texts, get_openai_embeddings(unique_texts)))
+    except Exception as e:
+        print(f"❌ [Embedding] 일괄 임베딩 실패: {e}")
+        text_embeddings = {}
+        errors.append("일괄 임베딩")
+    query_embeddings = {cat: text_embeddings.get(text) for cat, text in query_texts.items()}
+
+    # 메인보드도 같은 패스에서 소켓 조건 없이 넉넉히 가져온 뒤, 병합 단계에서 CPU 후보 소켓으로 거름
+    # (어느 CPU 와도 안 맞는 보드로 후보를 채우지 않으면서 검색은 한 번에)
+    result = _search_parts(categories, plans, query_texts, query_embeddings, total_budget, concurrency, timeout, errors)
+
+    print("📌 [DataService] 최종 hint_products 생성 완료")
+    for k, v in result.items():
+        print(f"   - {k}: {len(v)}개")
+
+    return result
+
+
+def board_sockets(cat: str, sockets):
+    """메인보드 카테고리(intel/amd)에 해당하는 CPU 후보 소켓. 없으면 None (소켓 조건 없이 검색)"""
+    if not sockets:
+        return None
+    prefix = "LGA" if cat.endswith("intel") else "AM"
+    return sorted(s for s in sockets if s.startswith(prefix)) or None
+
+
+def cpu_sockets(items):
+    return {item.get("socket") for item in items if item.get("socket")}
+
+
+def filter_board_sockets(cat: str, items, sockets):
+    """CPU 후보 소켓과 맞는 메인보드만 (해당 플랫폼 CPU 후보가 없으면 그대로)"""
+    allowed = board_sockets(cat, sockets)
+    if allowed is None:
+        return items
+    return [item for item in items if item.get("socket") in allowed]
+
+
+def _search_parts(categories, plans, query_texts, query_embeddings, total_budget, concurrency, timeout, errors, label="hint"):
+    """부품별 Chroma 검색 (+ 재시도 / MySQL 백업) → {부품: 최종 후보}.
+    메인보드는 소켓 조건 없이 BOARD_OVERFETCH 배수로 가져와서, 병합 때 CPU 후보 소켓으로 거름"""
+    part_of = {cat: key for key, cat_list in categories.items() for cat in cat_list}
+    n_results = {cat: 8 * BOARD_OVERFETCH if key == "mboard" else 8 for cat, key in part_of.items()}
+
+    if concurrency > 1:
+        # 1단계: 모든 카테고리 Chroma 검색을 동시에 실행
+        requests = []
+        for key, cat_list in categories.items():
+            min_p, max_p, keyword_filter = plans[key]
+            for cat in cat_list:
+                requests.append({
+                    "query_embedding": query_embeddings[cat], "category_filter": cat,
+                    "min_price": min_p, "max_price": max_p, "keyword_filter": keyword_filter, "n_results": n_results[cat],
+                })
+        requests = [req for req in requests if req["query_embedding"] is not None]  # 임베딩 실패분은 MySQL 백업으로
+        chroma_results = {cat: [] for cat in part_of}
+        with stage(f"{label}_chroma"):
+            batch_results = get_chroma_products_batch(requests, concurrency, timeout, errors)
+        for req, items in zip(requests, batch_results):
+            chroma_results[req["category_filter"]] = items
+
+        # 구명조끼 (결과 없으면 하한선 낮춤 - 상한선은 유지!) → 재시도도 한 번에
+        retries = [dict(req, min_price=0, n_results=5 * BOARD_OVERFETCH if part_of[req["category_filter"]] == "mboard" else 5)
+                   for req in requests if not chroma_results[req["category_filter"]] and req["keyword_filter"]]
+        for req in retries:
+            print(f"⚠️ [Retry] {req['category_filter']} 하한선 해제")
+        if retries:
+            with stage(f"{label}_chroma_retry"):
+                retry_results = get_chroma_products_batch(retries, concurrency, timeout, errors)
+            for req, items in zip(retries, retry_results):
+                chroma_results[req["category_filter"]] = items
+
+        # 2단계: MySQL 백업이 필요할 수 있는 카테고리만 미리 동시 조회
+        # (누적 결과는 늘어나기만 하므로 자기 결과가 3개 미만인 카테고리가 후보 전체.
+        #  메인보드는 CPU 소켓으로 거른 뒤의 개수로 판단 - CPU 도 백업을 타면 소켓이 늘 수 있으니 같이 조회)
+        cpu_chroma = [item for cat in categories.get("cpu", []) for item in chroma_results[cat]]
+        thin = []
+        for cat, key in part_of.items():
+            items = chroma_results[cat]
+            if key == "mboard":
+                if len(cpu_chroma) < 3:
+                    thin.append(cat)
+                    continue
+                items = filter_board_sockets(cat, items, cpu_sockets(cpu_chroma))
+            if len(items) < 3:
+                thin.append(cat)
+        fallback_tasks = [(f"{cat} MySQL 백업", get_mysql_products, (cat, 20)) for cat in thin]
+        with stage(f"{label}_mysql_fallback"):
+            fallback_results = dict(zip(thin, run_bounded(fallback_tasks, concurrency, timeout, default=[], errors=errors)))
+    else:
+        chroma_results, fallback_results = None, None
+
+    result = {key: [] for key in categories.keys()}
+
+    # 3단계: 순차 실행과 동일한 순서/규칙으로 병합 (결과가 결정적. cpu 가 mboard 보다 먼저 정해짐)
+    for key, cat_list in categories.items():
+        min_p, max_p, keyword_filter = plans[key]
+        sockets = cpu_sockets(result.get("cpu", [])) if key == "mboard" else None
+        items = []
+
         for cat in cat_list:
-            query_text = f"{cat} {purpose or ''} 고성능".strip()
-            
-            chroma_items = get_chroma_products(query_text, cat, min_p, max_p, keyword_filter, 8)
-            
-            # 구명조끼 (결과 없으면 하한선 낮춤 - 상한선은 유지!)
-            if not chroma_items and keyword_filter:
-                print(f"⚠️ [Retry] {cat} 하한선 해제")
-                chroma_items = get_chroma_products(query_text, cat, 0, max_p, keyword_filter, 5)
-            
+            if chroma_results is not None:
+                chroma_items = chroma_results[cat]
+            else:
+                chroma_items = run_one_bounded(
+                    f"{cat} 검색", search_hint_category,
+                    (cat, query_texts[cat], min_p, max_p, keyword_filter, query_embeddings[cat], errors, None, n_results[cat]),
+                    timeout, default=[], errors=errors,
+                )
+
+            if sockets:
+                chroma_items = filter_board_sockets(cat, chroma_items, sockets)
             items.extend(chroma_items)
 
             # MySQL 백업 (네거티브 필터 적용)
             if len(items) < 3:
-                mysql_items = get_mysql_products(cat, limit=20)
-                negatives = NEGATIVE_KEYWORDS.get(key, [])
-                
-                for m in mysql_items:
-                    name_up = m["name"].upper()
-                    if any(neg in name_up for neg in negatives): continue # 가짜 거르기
-                    if keyword_filter and keyword_filter not in m.get("spec", ""): continue
-                    
-                    # 너무 싼 거 제외 (가짜 방지 2차)
-                    if key == "gpu" and m["price"] < total_budget * 0.1: continue 
-
-                    items.append(m)
-
-        # 중복 제거
-        seen = set()
-        unique = []
-        for p in items:
-            key2 = (p.get("name"), p.get("category"))
-            if key2 not in seen and p.get("price", 0) > 0:
-                seen.add(key2)
-                unique.append(p)
-
-        # 🚨 [수정 3] 정렬 전략 차별화
-        # - 성능 핵심(CPU/GPU) : 비싼 순 (그래야 좋은게 들어감)
-        # - 나머지(RAM/SSD/Case) : 싼 순 (그래야 예산 세이브)
-        if key in ["cpu", "gpu"]:
-            unique.sort(key=lambda x: x["price"], reverse=True) # 내림차순
-        else:
-            unique.sort(key=lambda x: x["price"], reverse=False) # 오름차순 (가성비 우선)
-
-        result[key] = unique[:8]
+                if fallback_results is not None:
+                    mysql_items = fallback_results.get(cat, [])
+                else:
+                    mysql_items = run_one_bounded(f"{cat} MySQL 백업", get_mysql_products, (cat, 20), timeout, default=[], errors=errors)
+                items.extend(filter_mysql_fallback(key, mysql_items, keyword_filter, total_budget, board_sockets(cat, sockets)))
 
-    print("📌 [DataService] 최종 hint_products 생성 완료")
-    for k, v in result.items():
-        print(f"   - {k}: {len(v)}개")
+        result[key] = finalize_hint_items(key, items)
 
-    return result
\ No newline at end of file
+    return result
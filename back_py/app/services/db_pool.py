@@ -0,0 +1,202 @@
+import os
+import time
+import threading
+import mysql.connector
+from mysql.connector import errors
+
+# -------------------------------------
+# ⚙️ 접속 정보 / 풀 설정 (환경변수로 조절)
+# -------------------------------------
+DB_CONFIG = {
+    "host": os.getenv("MYSQL_HOST", "db"),
+    "user": os.getenv("MYSQL_USER", "root"),
+    "password": os.getenv("MYSQL_PASSWORD", "1234"),
+    "database": os.getenv("MYSQL_DATABASE", "project"),
+    "charset": "utf8mb4",
+    "collation": "utf8mb4_unicode_ci",
+}
+
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "8"))              # 최대 동시 커넥션 수
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))     # 빈 커넥션 대기 최대 시간(초)
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))     # 이 시간(초)보다 오래된 커넥션은 새로 연결
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "1") == "1"    # 빌려주기 전 ping으로 살아있는지 확인
+
+
+class PooledConnection:
+    """풀에서 빌린 커넥션. close() 하면 끊지 않고 풀에 반납한다.
+    with 블록 안에서 예외가 나면 커넥션을 버리고(recycle) 다음에 새로 연결한다."""
+
+    def __init__(self, pool, raw):
+        self._pool = pool
+        self._raw = raw
+        self._broken = False
+        self._returned = False
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+    def invalidate(self):
+        self._broken = True
+
+    def close(self):
+        if self._returned:
+            return
+        self._returned = True
+        self._pool.release(self._raw, broken=self._broken)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.invalidate()
+        self.close()
+        return False
+
+
+class ConnectionPool:
+    def __init__(self, size=DB_POOL_SIZE, timeout=DB_POOL_TIMEOUT, recycle=DB_POOL_RECYCLE, pre_ping=DB_POOL_PRE_PING, **config):
+        self.size = size
+        self.timeout = timeout
+        self.recycle = recycle
+        self.pre_ping = pre_ping
+        self.config = config or DB_CONFIG
+
+        self._idle = []                  # 스택: 최근에 쓴 커넥션부터 재사용
+        self._born = {}                  # id(raw) → 생성 시각
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)   # 반납 / 버림(자리 생김) 시 대기자 깨움
+        self._open = 0
+
+        self.created = 0
+        self.discarded = 0
+        self.in_use = 0
+        self.acquired = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+        self.timeouts = 0
+
+    def _connect(self):
+        raw = mysql.connector.connect(**self.config)
+        with self._lock:
+            self.created += 1
+            self._born[id(raw)] = time.monotonic()
+        return raw
+
+    def _discard(self, raw):
+        try:
+            raw.close()
+        except Exception:
+            pass
+        with self._available:
+            self._open -= 1
+            self.discarded += 1
+            self._born.pop(id(raw), None)
+            self._available.notify()   # 새로 연결할 자리가 생김
+
+    def _healthy(self, raw):
+        if self.recycle and time.monotonic() - self._born.get(id(raw), 0) > self.recycle:
+            return False
+        if not self.pre_ping:
+            return True
+        try:
+            raw.ping(reconnect=False)
+            return True
+        except Exception:
+            return False
+
+    def _take_or_reserve(self, deadline):
+        """유휴 커넥션 → raw / 새로 열 자리 예약 → None. 둘 다 없으면 반납·버림 알림까지 대기"""
+        with self._available:
+            while True:
+                if self._idle:
+                    return self._idle.pop()
+                if self._open < self.size:
+                    self._open += 1
+                    return None
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.timeouts += 1
+                    raise errors.PoolError(f"MySQL 커넥션 풀 대기 시간 초과 ({self.timeout}s, size={self.size})")
+                self._available.wait(remaining)
+
+    def acquire(self):
+        start = time.monotonic()
+        deadline = start + self.timeout
+
+        while True:
+            raw = self._take_or_reserve(deadline)
+            if raw is None:
+                try:
+                    raw = self._connect()
+                except Exception:
+                    with self._available:
+                        self._open -= 1
+                        self._available.notify()
+                    raise
+
+            if self._healthy(raw):
+                break
+            self._discard(raw)
+
+        waited = time.monotonic() - start
+        with self._lock:
+            self.in_use += 1
+            self.acquired += 1
+            self.wait_time_total += waited
+            self.wait_time_max = max(self.wait_time_max, waited)
+        return PooledConnection(self, raw)
+
+    def release(self, raw, broken=False):
+        with self._lock:
+            self.in_use -= 1
+
+        if not broken:
+            try:
+                # 커밋 안 된 트랜잭션이 다음 사용자에게 넘어가지 않도록 정리
+                if raw.in_transaction:
+                    raw.rollback()
+            except Exception:
+                broken = True
+
+        if broken:
+            self._discard(raw)
+        else:
+            with self._available:
+                self._idle.append(raw)
+                self._available.notify()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": self.size,
+                "open": self._open,
+                "idle": len(self._idle),
+                "in_use": self.in_use,
+                "created": self.created,
+                "discarded": self.discarded,
+                "acquired": self.acquired,
+                "timeouts": self.timeouts,
+                "wait_time_avg_ms": round(self.wait_time_total / self.acquired * 1000, 3) if self.acquired else 0.0,
+                "wait_time_max_ms": round(self.wait_time_max * 1000, 3),
+            }
+
+
+# ✅ 프로세스당 풀 하나 (Lazy Loading)
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool()
+    return _pool
+
+def get_connection():
+    """공용 풀에서 커넥션 대여. 사용 후 close() 또는 with 블록 종료 시 반납"""
+    return get_pool().acquire()
+
+def pool_stats():
+    return get_pool().stats()
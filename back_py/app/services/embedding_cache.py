@@ -0,0 +1,207 @@
+import os
+import sys
+import hashlib
+import unicodedata
+from array import array
+
+import redis
+
+from app.services.cache_utils import LRUCache
+from app.services.metrics import count_cache
+
+# -------------------------------------
+# ⚙️ 설정 (환경변수로 조절)
+# -------------------------------------
+EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "2048"))       # 인메모리 LRU 최대 개수
+EMBEDDING_CACHE_TTL = int(os.getenv("EMBEDDING_CACHE_TTL", str(60 * 60 * 24 * 30)))  # Redis 보관 기간 (30일)
+
+# 1차: 프로세스 내 LRU
+_memory = LRUCache(maxsize=EMBEDDING_CACHE_SIZE)
+
+# 2차: Redis (임베딩은 float32 바이너리로 저장 → decode_responses=False)
+_redis = redis.Redis(
+    host=os.getenv("REDIS_HOST", "redis"),
+    port=int(os.getenv("REDIS_PORT", "6379")),
+    socket_timeout=1,
+)
+
+_stats = {"redis_hits": 0, "misses": 0, "api_calls": 0, "redis_errors": 0}   # misses: 문장 단위, api_calls: 요청 단위
+
+
+def normalize_text(text: str) -> str:
+    """유니코드 정규화 + 공백 정리 (같은 문장이면 같은 키가 나오도록)"""
+    text = unicodedata.normalize("NFC", text or "")
+    return " ".join(text.split())
+
+
+def cache_key(model: str, text: str) -> str:
+    """모델 + 정규화된 텍스트 기반 콘텐츠 주소 키"""
+    digest = hashlib.sha256(f"{model}\n{normalize_text(text)}".encode("utf-8")).hexdigest()
+    return f"emb:{model}:{digest}"
+
+
+def _decode(raw):
+    if raw is None:
+        return None
+    vec = array("f")
+    vec.frombytes(raw)
+    return vec.tolist()
+
+
+def _redis_get(key):
+    try:
+        raw = _redis.get(key)
+    except redis.RedisError as e:
+        _stats["redis_errors"] += 1
+        print(f"⚠️ [EmbeddingCache] Redis 조회 실패: {e}")
+        return None
+    return _decode(raw)
+
+
+def _redis_get_many(keys):
+    """MGET 1회 → 키 순서대로 임베딩 또는 None"""
+    if not keys:
+        return []
+    try:
+        raws = _redis.mget(keys)
+    except redis.RedisError as e:
+        _stats["redis_errors"] += 1
+        print(f"⚠️ [EmbeddingCache] Redis 일괄 조회 실패: {e}")
+        return [None] * len(keys)
+    return [_decode(raw) for raw in raws]
+
+
+def _redis_set(key, embedding):
+    try:
+        _redis.set(key, array("f", embedding).tobytes(), ex=EMBEDDING_CACHE_TTL)
+    except redis.RedisError as e:
+        _stats["redis_errors"] += 1
+        print(f"⚠️ [EmbeddingCache] Redis 저장 실패: {e}")
+
+
+def _redis_set_many(items):
+    """[(키, 임베딩)] → 파이프라인 1회로 저장"""
+    if not items:
+        return
+    try:
+        pipe = _redis.pipeline(transaction=False)
+        for key, embedding in items:
+            pipe.set(key, array("f", embedding).tobytes(), ex=EMBEDDING_CACHE_TTL)
+        pipe.execute()
+    except redis.RedisError as e:
+        _stats["redis_errors"] += 1
+        print(f"⚠️ [EmbeddingCache] Redis 일괄 저장 실패: {e}")
+
+
+def get_cached_embedding(text: str, model: str, fetch, persist: bool = True):
+    """LRU → Redis → API 순으로 조회. fetch(text)는 캐시 미스 시에만 호출
+    persist=False 면 Redis 를 거치지 않음 (사용자 질문처럼 오래 남기면 안 되는 문장)"""
+    key = cache_key(model, text)
+
+    embedding = _memory.get(key)
+    if embedding is not None:
+        count_cache("embedding", "memory")
+        return embedding
+
+    embedding = _redis_get(key) if persist else None
+    if embedding is not None:
+        _stats["redis_hits"] += 1
+        count_cache("embedding", "redis")
+        _memory.set(key, embedding)
+        return embedding
+
+    _stats["misses"] += 1
+    _stats["api_calls"] += 1
+    count_cache("embedding", "miss")
+    embedding = fetch(normalize_text(text))
+    _memory.set(key, embedding)
+    if persist:
+        _redis_set(key, embedding)
+    return embedding
+
+
+def get_cached_embeddings(texts, model: str, fetch_many):
+    """여러 문장을 한 번에 조회. LRU 미스는 Redis MGET 1회, 그래도 없는 문장만 모아 fetch_many(texts) 1회 호출"""
+    embeddings = [None] * len(texts)
+    keys = [cache_key(model, text) for text in texts]
+
+    redis_indexes = []
+    for i, key in enumerate(keys):
+        embedding = _memory.get(key)
+        if embedding is not None:
+            count_cache("embedding", "memory")
+            embeddings[i] = embedding
+        else:
+            redis_indexes.append(i)
+
+    missing = {}  # 정규화 텍스트 → (캐시 키, 원래 인덱스들)
+    for i, embedding in zip(redis_indexes, _redis_get_many([keys[i] for i in redis_indexes])):
+        if embedding is not None:
+            _stats["redis_hits"] += 1
+            count_cache("embedding", "redis")
+            _memory.set(keys[i], embedding)
+            embeddings[i] = embedding
+        else:
+            _stats["misses"] += 1
+            count_cache("embedding", "miss")
+            missing.setdefault(normalize_text(texts[i]), (keys[i], []))[1].append(i)
+
+    if missing:
+        _stats["api_calls"] += 1
+        batch = list(missing.keys())
+        fetched = list(fetch_many(batch))
+        # 개수가 다르면 어느 문장의 벡터인지 알 수 없음 → 아무것도 캐시하지 않고 실패 처리
+        if len(fetched) != len(batch):
+            raise ValueError(f"임베딩 개수 불일치: 요청 {len(batch)}개, 응답 {len(fetched)}개")
+        for text, embedding in zip(batch, fetched):
+            key, indexes = missing[text]
+            _memory.set(key, embedding)
+            for i in indexes:
+                embeddings[i] = embedding
+        _redis_set_many([(missing[text][0], embedding) for text, embedding in zip(batch, fetched)])
+
+    return embeddings
+
+
+def evict(text: str, model: str):
+    """특정 문장의 임베딩을 두 계층에서 모두 제거"""
+    key = cache_key(model, text)
+    _memory.delete(key)
+    try:
+        _redis.delete(key)
+    except redis.RedisError as e:
+        print(f"⚠️ [EmbeddingCache] Redis 삭제 실패: {e}")
+
+
+def clear_memory():
+    _memory.clear()
+
+
+def cache_stats():
+    memory = _memory.stats()
+    return {
+        "memory": memory,
+        "memory_hits": memory["hits"],
+        "redis_hits": _stats["redis_hits"],
+        "misses": _stats["misses"],
+        "api_calls": _stats["api_calls"],
+        "redis_errors": _stats["redis_errors"],
+    }
+
+
+# -------------------------------------
+# 🔥 사전 임베딩 (카테고리 × 용도 조합)
+# -------------------------------------
+# 실행: python -m app.services.embedding_cache prewarm
+if __name__ == "__main__":
+    # __main__ 으로 실행되므로 통계는 data_service가 쓰는 모듈 인스턴스에서 읽는다
+    from app.services.data_service import prewarm_query_embeddings
+    from app.services.embedding_cache import cache_stats as shared_cache_stats
+
+    if len(sys.argv) < 2 or sys.argv[1] != "prewarm":
+        print("사용법: python -m app.services.embedding_cache prewarm")
+        sys.exit(1)
+
+    count = prewarm_query_embeddings()
+    print(f"✅ {count}개 쿼리 임베딩 사전 생성 완료")
+    print(shared_cache_stats())
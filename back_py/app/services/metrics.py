@@ -0,0 +1,146 @@
+import time
+import contextvars
+from contextlib import contextmanager
+
+from prometheus_client import Counter, Histogram, CONTENT_TYPE_LATEST, generate_latest
+
+# -------------------------------------
+# 📈 단계별 지연 / 토큰 / DB 쿼리 / 캐시 적중 지표 (Prometheus)
+# -------------------------------------
+# - 모든 값은 프로세스 전역 지표로 /metrics 에 노출
+# - 요청 헤더 X-Debug-Timing: 1 이면 그 요청의 단계별 시간을 따로 모아서 응답 헤더(Server-Timing)로 돌려줌
+#   (contextvars 로 요청마다 분리, asyncio.to_thread / run_bounded 스레드에도 전달됨)
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+STAGE_SECONDS = Histogram(
+    "estimate_stage_seconds", "견적 파이프라인 단계별 소요 시간", ["stage"], buckets=LATENCY_BUCKETS
+)
+CATEGORY_SECONDS = Histogram(
+    "hint_category_seconds", "카테고리별 후보 검색 시간", ["category", "source"], buckets=LATENCY_BUCKETS
+)
+LLM_SECONDS = Histogram(
+    "llm_request_seconds", "GPT 호출 시간 (stream 은 첫 토큰까지 / 전체)", ["mode", "phase"], buckets=LATENCY_BUCKETS
+)
+LLM_TOKENS = Counter("llm_tokens_total", "GPT 입력/출력 토큰 수", ["kind"])
+DB_QUERIES = Counter("db_queries_total", "DB 쿼리 수", ["query"])
+CACHE_REQUESTS = Counter("cache_requests_total", "캐시 조회 결과", ["cache", "result"])
+HTTP_SECONDS = Histogram(
+    "http_request_seconds", "HTTP 요청 처리 시간 (응답 시작까지)", ["method", "route", "status"], buckets=LATENCY_BUCKETS
+)
+
+
+# -------------------------------------
+# ⏱️ 요청별 시간 기록 (디버그 헤더가 있을 때만)
+# -------------------------------------
+class RequestTiming:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.durations = {}   # 이름 → 누적 ms (같은 단계가 여러 번이면 합산)
+        self.counts = {}      # 이름 → 횟수 (DB 쿼리 / 캐시 적중 등)
+
+    def add(self, name: str, seconds: float):
+        self.durations[name] = self.durations.get(name, 0.0) + seconds * 1000
+
+    def incr(self, name: str, n: int = 1):
+        self.counts[name] = self.counts.get(name, 0) + n
+
+    def total_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def as_dict(self):
+        return {
+            "total_ms": round(self.total_ms(), 1),
+            "stages_ms": {name: round(ms, 1) for name, ms in self.durations.items()},
+            "counts": dict(self.counts),
+        }
+
+    def server_timing(self) -> str:
+        """Server-Timing 헤더 값 (브라우저 개발자 도구 Timing 탭에 그대로 표시됨)"""
+        parts = [f"{_token(name)};dur={ms:.1f}" for name, ms in self.durations.items()]
+        parts += [f'{_token(name)};desc="{count}"' for name, count in self.counts.items()]
+        parts.append(f"total;dur={self.total_ms():.1f}")
+        return ", ".join(parts)
+
+
+def _token(name: str) -> str:
+    return "".join(ch if ch.isalnum() or ch in "-_." else "_" for ch in name)
+
+
+_request_timing = contextvars.ContextVar("request_timing", default=None)
+
+
+def start_request_timing():
+    timing = RequestTiming()
+    _request_timing.set(timing)
+    return timing
+
+
+def current_timing():
+    return _request_timing.get()
+
+
+# -------------------------------------
+# 📝 기록 함수
+# -------------------------------------
+@contextmanager
+def stage(name: str):
+    """with stage("retrieval"): ... → 단계 히스토그램 + (디버그 시) 요청별 기록"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        STAGE_SECONDS.labels(name).observe(elapsed)
+        timing = _request_timing.get()
+        if timing is not None:
+            timing.add(name, elapsed)
+
+
+def observe_category(category: str, source: str, seconds: float):
+    CATEGORY_SECONDS.labels(category, source).observe(seconds)
+    timing = _request_timing.get()
+    if timing is not None:
+        timing.add(f"{source}.{category}", seconds)
+
+
+def observe_llm(mode: str, phase: str, seconds: float):
+    LLM_SECONDS.labels(mode, phase).observe(seconds)
+    timing = _request_timing.get()
+    if timing is not None:
+        timing.add(f"llm.{mode}.{phase}", seconds)
+
+
+def record_llm_usage(usage):
+    if usage is None:
+        return
+    LLM_TOKENS.labels("prompt").inc(usage.prompt_tokens or 0)
+    LLM_TOKENS.labels("completion").inc(usage.completion_tokens or 0)
+    timing = _request_timing.get()
+    if timing is not None:
+        timing.incr("llm_prompt_tokens", usage.prompt_tokens or 0)
+        timing.incr("llm_completion_tokens", usage.completion_tokens or 0)
+
+
+def count_db_query(query: str):
+    DB_QUERIES.labels(query).inc()
+    timing = _request_timing.get()
+    if timing is not None:
+        timing.incr("db_queries")
+
+
+def count_cache(cache: str, result: str):
+    """result: hit / miss (임베딩 캐시는 memory / redis / miss)"""
+    CACHE_REQUESTS.labels(cache, result).inc()
+    timing = _request_timing.get()
+    if timing is not None:
+        timing.incr(f"cache.{cache}.{result}")
+
+
+def observe_http(method: str, route: str, status: int, seconds: float):
+    HTTP_SECONDS.labels(method, route, str(status)).observe(seconds)
+
+
+def render_metrics():
+    """→ (본문, content-type)"""
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -0,0 +1,200 @@
+import re
+import sys
+
+from app.services.spec_parser import parse_spec_attributes
+
+# -------------------------------------
+# 🏷️ 적재 시점 상품 분류 (가짜 부품 / 메모리 세대 / NVMe / 스펙 속성)
+# -------------------------------------
+# 크롤링 → MySQL/Chroma 저장할 때 한 번만 계산해서 컬럼/메타데이터로 저장.
+# 검색할 때는 이름 문자열을 훑지 않고 Chroma where 절(또는 같은 조건의 dict 비교)로 거른다.
+
+# ✅ hint 검색 대상 카테고리 (부품 키 → 크롤링 카테고리)
+HINT_CATEGORIES = {
+    "cpu": ["CPU"], "gpu": ["VGA"], "ram": ["RAM"], "ssd": ["SSD"],
+    "mboard": ["MBoard_intel", "MBoard_amd"], "cooler": ["Cooler_Air", "Cooler_Liquid"],
+    "power": ["Power"], "case": ["Case"],
+}
+
+# 크롤링 카테고리 → 부품 키
+PART_BY_CATEGORY = {cat: key for key, cats in HINT_CATEGORIES.items() for cat in cats}
+
+# 🚨 [필수] 가짜 데이터 거르기 (이 단어 있으면 무조건 탈락)
+NEGATIVE_KEYWORDS = {
+    "gpu": ["FAN", "팬", "COOLER", "쿨러", "케이스", "CASE", "지지대", "CABLE"],
+    "cpu": ["COOLER", "쿨러", "FAN", "팬"],
+    "ssd": ["CASE", "케이스", "ENCLOSURE", "방열판"],
+    "ram": ["방열판", "HEATSINK"],
+}
+
+# 부품별 네거티브 키워드를 정규식 하나로 (이름 1회 스캔)
+NEGATIVE_PATTERNS = {
+    key: re.compile("|".join(re.escape(word.upper()) for word in words))
+    for key, words in NEGATIVE_KEYWORDS.items()
+}
+
+MEMORY_PARTS = ("ram", "mboard")
+D4_TOKEN = re.compile(r"(?<![0-9A-Z])D4(?![0-9A-Z])")   # "B760M D4", "B760M-D4" 같은 보드 이름 접미사
+D5_TOKEN = re.compile(r"(?<![0-9A-Z])D5(?![0-9A-Z])")
+
+# classify_product 결과 = product 테이블 분류 컬럼 = Chroma 메타데이터 키 (순서는 UPSERT 컬럼 순서)
+CLASSIFIED_COLUMNS = ("is_accessory", "mem_gen", "is_nvme", "socket", "chipset", "storage_if", "wattage", "form_factor")
+
+
+def detect_mem_gen(part: str, name_up: str, spec_up: str) -> str:
+    if part not in MEMORY_PARTS:
+        return ""  # VGA 스펙의 GDDR5 같은 값이 섞이지 않도록 메모리 관련 부품만
+    if "DDR4" in name_up or D4_TOKEN.search(name_up):
+        return "DDR4"
+    if "DDR5" in name_up or D5_TOKEN.search(name_up):
+        return "DDR5"
+    # B660 보드는 이름에 DDR5가 없으면 DDR4 모델
+    if part == "mboard" and "B660" in name_up:
+        return "DDR4"
+    # 이름에 없으면 스펙 문자열로 판단
+    if "DDR5" in spec_up:
+        return "DDR5"
+    if "DDR4" in spec_up:
+        return "DDR4"
+    return ""
+
+
+def classify_product(product) -> dict:
+    """product(name, category, spec) → {CLASSIFIED_COLUMNS}"""
+    category = product.get("category")
+    part = PART_BY_CATEGORY.get(category)
+    name_up = (product.get("name") or "").upper()
+    spec_up = (product.get("spec") or "").upper()
+
+    pattern = NEGATIVE_PATTERNS.get(part)
+    return {
+        "is_accessory": int(bool(pattern and pattern.search(name_up))),
+        "mem_gen": detect_mem_gen(part, name_up, spec_up),
+        "is_nvme": int(part == "ssd" and ("NVME" in name_up or "NVME" in spec_up)),
+        **parse_spec_attributes(part, category, name_up, spec_up),   # 소켓 / 칩셋 / 인터페이스 / 용량(W) / 규격
+    }
+
+
+# -------------------------------------
+# 🔍 검색 조건 (Chroma where 절 / MySQL 결과 공통)
+# -------------------------------------
+def classification_where(category: str, keyword_filter: str = None, sockets=None):
+    """카테고리 + 키워드 (+ 메인보드는 CPU 후보 소켓) 조건 → Chroma where 절 목록"""
+    part = PART_BY_CATEGORY.get(category)
+    target_kw = keyword_filter.upper() if keyword_filter else None
+    clauses = []
+
+    if part in NEGATIVE_KEYWORDS:
+        clauses.append({"is_accessory": {"$eq": 0}})
+
+    if part == "mboard" and target_kw == "DDR5":
+        clauses.append({"mem_gen": {"$ne": "DDR4"}})   # 표기 없는 보드는 허용
+    elif part == "mboard" and target_kw == "DDR4":
+        clauses.append({"mem_gen": {"$eq": "DDR4"}})
+    elif part == "ram" and target_kw:
+        clauses.append({"mem_gen": {"$eq": target_kw}})
+    elif part == "ssd" and target_kw == "NVME":
+        clauses.append({"is_nvme": {"$eq": 1}})
+
+    if part == "mboard" and sockets:
+        clauses.append({"socket": {"$in": sorted(set(sockets) | {""})}})   # 소켓 모르는 보드는 허용
+
+    return clauses
+
+
+def matches_classification(item, category: str, keyword_filter: str = None, sockets=None) -> bool:
+    """classification_where 와 같은 조건을 dict(MySQL 행 등)에 적용"""
+    for clause in classification_where(category, keyword_filter, sockets):
+        (field, cond), = clause.items()
+        (op, value), = cond.items()
+        current = item.get(field)
+        if op == "$in":
+            current = current or ""
+        if op == "$eq" and current != value:
+            return False
+        if op == "$ne" and current == value:
+            return False
+        if op == "$in" and current not in value:
+            return False
+    return True
+
+
+# -------------------------------------
+# 🔁 기존 데이터 분류값 채우기
+# -------------------------------------
+# 실행: python -m app.services.product_classifier backfill [--mysql-only | --chroma-only]
+BACKFILL_BATCH_SIZE = 1000
+
+
+def backfill_mysql(batch_size: int = BACKFILL_BATCH_SIZE):
+    from app.services.db_pool import get_connection
+
+    changed = 0
+    with get_connection() as conn:
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute(f"SELECT id, name, category, spec, {', '.join(CLASSIFIED_COLUMNS)} FROM product")
+        rows = cursor.fetchall()
+
+        updates = []
+        for row in rows:
+            c = classify_product(row)
+            if any(row[col] != c[col] for col in CLASSIFIED_COLUMNS):
+                updates.append((*(c[col] for col in CLASSIFIED_COLUMNS), row["id"]))
+
+        for start in range(0, len(updates), batch_size):
+            cursor.executemany(
+                f"UPDATE product SET {', '.join(f'{col} = %s' for col in CLASSIFIED_COLUMNS)} WHERE id = %s",
+                updates[start:start + batch_size]
+            )
+            conn.commit()
+            changed += len(updates[start:start + batch_size])
+        cursor.close()
+
+    print(f"🏷️ [Backfill] MySQL {len(rows)}개 중 {changed}개 갱신")
+    return changed
+
+
+def backfill_chroma(collection, batch_size: int = BACKFILL_BATCH_SIZE):
+    total, changed, offset = 0, 0, 0
+    while True:
+        page = collection.get(include=["metadatas", "documents"], limit=batch_size, offset=offset)
+        if not page["ids"]:
+            break
+        offset += len(page["ids"])
+        total += len(page["ids"])
+
+        ids, metadatas = [], []
+        for id_, meta, doc in zip(page["ids"], page["metadatas"], page["documents"]):
+            meta = meta or {}
+            # 메타데이터에는 스펙이 없으므로 스펙이 들어 있는 임베딩 문장으로 판단
+            c = classify_product(dict(meta, spec=doc or ""))
+            if any(meta.get(k) != v for k, v in c.items()):
+                ids.append(id_)
+                metadatas.append(dict(meta, **c))
+        if ids:
+            collection.update(ids=ids, metadatas=metadatas)
+            changed += len(ids)
+
+    print(f"🏷️ [Backfill] Chroma {total}개 중 {changed}개 갱신")
+    return changed
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] != "backfill":
+        print("사용법: python -m app.services.product_classifier backfill [--mysql-only | --chroma-only]")
+        sys.exit(1)
+
+    from app.services.schema import ensure_schema
+    from app.services.data_service import get_collection
+    from app.services.catalog_version import bump_catalog_version
+
+    if "--chroma-only" not in sys.argv:
+        ensure_schema()
+        backfill_mysql()
+    if "--mysql-only" not in sys.argv:
+        collection = get_collection()
+        if collection is not None:
+            backfill_chroma(collection)
+
+    # 검색 결과가 달라지므로 hint 캐시 / 카탈로그 스냅샷 갱신
+    bump_catalog_version()
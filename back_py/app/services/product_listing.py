@@ -0,0 +1,138 @@
+import base64
+import json
+import os
+
+from app.services.db_pool import get_connection
+from app.services.metrics import count_db_query
+
+# -------------------------------------
+# 📚 카탈로그 조회 (키셋 페이지네이션 / 필드 선택 / 필터 / 스트리밍 내보내기)
+# -------------------------------------
+# 정렬은 항상 (category, price, id) → idx_category_price(category, price) 를 그대로 따라감
+# (InnoDB 보조 인덱스 끝에는 PK(id) 가 붙어 있어서 인덱스 순서 = 정렬 순서, filesort 없음)
+# OFFSET 대신 "마지막으로 본 (category, price, id) 다음부터" 조건이라 몇 번째 페이지든 비용이 같다.
+# MySQL 은 ASC 정렬에서 NULL 이 먼저 오므로 가격 없는 상품은 카테고리마다 맨 앞에 나온다.
+PAGE_MAX_LIMIT = int(os.getenv("PRODUCT_PAGE_MAX_LIMIT", "1000"))
+EXPORT_BATCH_SIZE = int(os.getenv("PRODUCT_EXPORT_BATCH", "500"))   # 서버측 커서에서 한 번에 읽는 행 수
+
+PRODUCT_COLUMNS = (
+    "id", "fingerprint", "name", "category", "spec", "price", "capacity", "link",
+    "source", "updated_at", "is_accessory", "mem_gen", "is_nvme",
+    "socket", "chipset", "storage_if", "wattage", "form_factor",
+)
+DEFAULT_FIELDS = tuple(c for c in PRODUCT_COLUMNS if c != "spec")   # spec(긴 본문)은 요청할 때만
+KEY_FIELDS = ("category", "price", "id")                             # 커서에 필요해서 항상 조회
+
+
+class ListingError(ValueError):
+    """잘못된 필드 / 커서 (라우터에서 400 으로 응답)"""
+
+
+def parse_fields(fields: str = None):
+    """'name,price,link' → 조회할 컬럼 목록 (커서용 키 컬럼 포함). '*' 이면 전체"""
+    if not fields:
+        return list(DEFAULT_FIELDS)
+    if fields.strip() == "*":
+        return list(PRODUCT_COLUMNS)
+
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in requested if f not in PRODUCT_COLUMNS]
+    if unknown:
+        raise ListingError(f"알 수 없는 필드: {', '.join(unknown)} (가능: {', '.join(PRODUCT_COLUMNS)})")
+    return list(dict.fromkeys([*KEY_FIELDS, *requested]))
+
+
+def encode_cursor(row) -> str:
+    key = [row["category"], row["price"], row["id"]]
+    return base64.urlsafe_b64encode(json.dumps(key, ensure_ascii=False).encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        category, price, last_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(category, str) or not isinstance(last_id, int) or not (price is None or isinstance(price, int)):
+            raise ValueError
+        return category, price, last_id
+    except (ValueError, TypeError, UnicodeError):
+        raise ListingError("잘못된 커서입니다.")
+
+
+def build_query(columns, category=None, min_price=None, max_price=None, cursor=None, limit=None):
+    """→ (sql, params). 조건은 모두 인덱스 앞부분(category, price)에 걸리도록 구성"""
+    where, params = [], []
+    if category:
+        where.append("category = %s")
+        params.append(category)
+    if min_price is not None:
+        where.append("price >= %s")
+        params.append(min_price)
+    if max_price is not None:
+        where.append("price <= %s")
+        params.append(max_price)
+
+    if cursor:
+        last_category, last_price, last_id = decode_cursor(cursor)
+        if last_price is None:
+            # 같은 카테고리 안에서 NULL 가격 구간(id 순) 다음 → 가격 있는 상품 전부
+            where.append("(category > %s OR (category = %s AND (price IS NOT NULL OR id > %s)))")
+            params += [last_category, last_category, last_id]
+        else:
+            where.append("(category > %s OR (category = %s AND (price > %s OR (price = %s AND id > %s))))")
+            params += [last_category, last_category, last_price, last_price, last_id]
+
+    sql = f"SELECT {', '.join(columns)} FROM product"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY category, price, id"
+    if limit:
+        sql += " LIMIT %s"
+        params.append(limit)
+    return sql, params
+
+
+def fetch_page(fields=None, category=None, min_price=None, max_price=None, cursor=None, limit: int = 100):
+    """→ {"items": [...], "next_cursor": str | None}. 한 행 더 읽어서 다음 페이지 유무 판단"""
+    limit = max(1, min(limit, PAGE_MAX_LIMIT))
+    columns = parse_fields(fields)
+    sql, params = build_query(columns, category, min_price, max_price, cursor, limit + 1)
+
+    with get_connection() as conn:
+        db_cursor = conn.cursor(dictionary=True)
+        db_cursor.execute(sql, params)
+        rows = db_cursor.fetchall()
+        db_cursor.close()
+    count_db_query("product_page")
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    return {
+        "items": rows,
+        "count": len(rows),
+        "next_cursor": encode_cursor(rows[-1]) if has_more else None,
+    }
+
+
+def iter_products(columns, category=None, min_price=None, max_price=None, cursor=None, limit: int = 0):
+    """서버측(unbuffered) 커서로 EXPORT_BATCH_SIZE 행씩 읽어서 내보냄 → 테이블 전체를 메모리에 올리지 않음.
+    스트림이 끝날 때까지 풀 커넥션 하나를 점유한다. 중간에 끊기면 남은 결과를 읽지 않고 커넥션을 버린다."""
+    sql, params = build_query(columns, category, min_price, max_price, cursor, limit or None)
+
+    conn = get_connection()
+    finished = False
+    try:
+        db_cursor = conn.cursor(dictionary=True, buffered=False)
+        db_cursor.execute(sql, params)
+        count_db_query("product_export")
+        while True:
+            rows = db_cursor.fetchmany(EXPORT_BATCH_SIZE)
+            if not rows:
+                break
+            yield rows
+        db_cursor.close()
+        finished = True
+    finally:
+        if not finished:
+            # 읽다 만 결과가 남은 커넥션은 재사용하면 "Unread result found" → 풀에서 제거
+            conn.invalidate()
+        conn.close()
@@ -0,0 +1,188 @@
+import os
+import re
+import time
+import difflib
+import threading
+import unicodedata
+
+from app.services.db_pool import get_connection
+from app.services.data_service import HINT_CATEGORIES
+from app.services.catalog_version import get_catalog_version
+from app.services.metrics import count_db_query
+
+# -------------------------------------
+# ⚙️ 설정 (환경변수로 조절)
+# -------------------------------------
+NAME_CACHE_ENABLED = os.getenv("ENRICH_NAME_CACHE", "1") == "1"                  # 이름 → (가격, 링크) 인메모리 맵 사용
+NAME_CACHE_CHECK_INTERVAL = float(os.getenv("ENRICH_NAME_CACHE_CHECK", "30"))    # 카탈로그 변경 확인 주기(초)
+FUZZY_CUTOFF = float(os.getenv("ENRICH_FUZZY_CUTOFF", "0"))                      # 유사 이름 매칭 (기본 끔, 켤 때는 0.9 이상 권장)
+
+
+def normalize_name(name: str) -> str:
+    """대소문자/공백/기호 차이를 무시한 비교용 이름"""
+    name = unicodedata.normalize("NFKC", name or "").upper()
+    return re.sub(r"[^0-9A-Z가-힣]", "", name)
+
+
+class NameIndex:
+    """product 테이블 이름 인덱스 (정확 일치 / 카테고리별 정규화 일치 / 카테고리별 유사 매칭)"""
+
+    def __init__(self, rows):
+        self.exact = {}
+        self.by_category = {}
+
+        # id 오름차순으로 들어오므로 같은 이름이면 먼저 등록된 상품 유지 (기존 LIMIT 1 동작)
+        for row in rows:
+            item = {"name": row["name"], "price": row["price"], "link": row["link"]}
+            self.exact.setdefault(row["name"], item)
+            self.by_category.setdefault(row["category"], {}).setdefault(normalize_name(row["name"]), item)
+
+    def find(self, name: str, categories=None):
+        item = self.exact.get(name)
+        if item:
+            return item
+
+        # 정규화/유사 매칭은 요청한 부품의 카테고리 안에서만 (다른 부품으로 잘못 붙지 않도록)
+        candidate_maps = [self.by_category.get(c, {}) for c in categories or []]
+        norm = normalize_name(name)
+        for candidates in candidate_maps:
+            if norm in candidates:
+                return candidates[norm]
+
+        if not FUZZY_CUTOFF:
+            return None
+        return fuzzy_match(norm, candidate_maps)
+
+
+def digits(norm: str) -> str:
+    return re.sub(r"[^0-9]", "", norm)
+
+
+def is_near_exact(norm: str, match: str) -> bool:
+    """오타 수준 차이만 허용: 모델 번호(숫자)가 같고 길이 차이 1자 이하
+    ("RTX4060" → "RTX4060TI" 처럼 접미사가 붙은 다른 모델은 거름)"""
+    return digits(norm) == digits(match) and abs(len(norm) - len(match)) <= 1
+
+
+def fuzzy_match(norm: str, candidate_maps, cutoff: float = None):
+    """LLM이 이름을 살짝 틀리게 적은 경우 같은 카테고리에서 가장 비슷한 이름으로 보정"""
+    cutoff = FUZZY_CUTOFF if cutoff is None else cutoff
+    best, best_item = 0.0, None
+    for candidates in candidate_maps:
+        for match in difflib.get_close_matches(norm, candidates.keys(), n=3, cutoff=cutoff):
+            if not is_near_exact(norm, match):
+                continue
+            ratio = difflib.SequenceMatcher(None, norm, match).ratio()
+            if ratio > best:
+                best, best_item = ratio, candidates[match]
+    return best_item
+
+
+# -------------------------------------
+# 🧠 인메모리 이름 맵 (카탈로그 버전/행 수/최종 수정 시각이 바뀌면 다시 로드)
+# -------------------------------------
+_index = None
+_signature = None
+_checked_at = 0.0
+_lock = threading.Lock()
+
+
+def _catalog_signature(cursor):
+    cursor.execute("SELECT COUNT(*) AS cnt, MAX(updated_at) AS updated FROM product")
+    row = cursor.fetchone()
+    return (row["cnt"], row["updated"])
+
+
+def get_name_index():
+    global _index, _signature, _checked_at
+
+    # 크롤러가 카탈로그 버전을 올렸으면 주기와 상관없이 바로 다시 확인
+    version = get_catalog_version()
+    fresh = _signature is not None and _signature[0] == version
+    if _index is not None and fresh and time.monotonic() - _checked_at < NAME_CACHE_CHECK_INTERVAL:
+        return _index
+
+    with _lock:
+        fresh = _signature is not None and _signature[0] == version
+        if _index is not None and fresh and time.monotonic() - _checked_at < NAME_CACHE_CHECK_INTERVAL:
+            return _index
+
+        with get_connection() as conn:
+            cursor = conn.cursor(dictionary=True)
+            count_db_query("name_index_signature")
+            signature = (version,) + _catalog_signature(cursor)
+            if _index is None or signature != _signature:
+                count_db_query("name_index_load")
+                cursor.execute("SELECT name, category, price, link FROM product ORDER BY id")
+                _index = NameIndex(cursor.fetchall())
+                _signature = signature
+                print(f"📇 [NameIndex] 상품 이름 맵 로드: {len(_index.exact)}개")
+            cursor.close()
+
+        _checked_at = time.monotonic()
+        return _index
+
+
+# -------------------------------------
+# 🔍 부품 이름 일괄 조회
+# -------------------------------------
+def lookup_products(parts):
+    """parts: {부품 키: 이름} → {부품 키: {name, price, link}} (못 찾은 부품은 빠짐)"""
+    if not parts:
+        return {}
+
+    if NAME_CACHE_ENABLED:
+        index = get_name_index()
+        found = {}
+        for key, name in parts.items():
+            item = index.find(name, HINT_CATEGORIES.get(key))
+            if item:
+                found[key] = dict(item)
+        return found
+
+    return _lookup_products_sql(parts)
+
+
+def _lookup_products_sql(parts):
+    names = list(dict.fromkeys(parts.values()))
+    found = {}
+
+    with get_connection() as conn:
+        cursor = conn.cursor(dictionary=True)
+
+        # 한 번의 쿼리로 모든 부품 조회 (idx_name 사용)
+        placeholders = ", ".join(["%s"] * len(names))
+        count_db_query("lookup_products")
+        cursor.execute(
+            f"SELECT name, price, link FROM product WHERE name IN ({placeholders}) ORDER BY id",
+            tuple(names)
+        )
+        by_name = {}
+        for row in cursor.fetchall():
+            by_name.setdefault(row["name"], row)
+
+        missing = {}
+        for key, name in parts.items():
+            if name in by_name:
+                found[key] = dict(by_name[name])
+            else:
+                missing[key] = name
+
+        # 정확히 일치하지 않은 부품은 해당 카테고리 안에서 정규화/유사 매칭
+        categories = sorted({c for key in missing for c in HINT_CATEGORIES.get(key, [])})
+        if categories:
+            placeholders = ", ".join(["%s"] * len(categories))
+            count_db_query("lookup_products_fuzzy")
+            cursor.execute(
+                f"SELECT name, category, price, link FROM product WHERE category IN ({placeholders}) ORDER BY id",
+                tuple(categories)
+            )
+            index = NameIndex(cursor.fetchall())
+            for key, name in missing.items():
+                item = index.find(name, HINT_CATEGORIES.get(key))
+                if item:
+                    found[key] = dict(item)
+
+        cursor.close()
+
+    return found
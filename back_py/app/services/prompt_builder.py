@@ -0,0 +1,140 @@
+import os
+
+from app.services.token_utils import count_tokens
+
+# -------------------------------------
+# 🧾 토큰 예산 안에서 만드는 압축 프롬프트
+# -------------------------------------
+# 후보를 JSON 전체(스펙/링크 포함)로 넣지 않고 모델이 고르는 데 필요한 값만
+# "id|이름|가격[|소켓|메모리]" 표로 넣는다. 모델은 id만 답하고, id → 제품 매핑은 서버에서 한다.
+PROMPT_MODEL = "gpt-4o-mini"
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", "2000"))  # 후보 표에 쓸 최대 토큰
+
+# 슬롯별 짧은 id 접두사
+SLOT_PREFIX = {"cpu": "C", "gpu": "G", "mboard": "M", "ram": "R", "ssd": "S", "cooler": "K", "power": "P", "case": "X"}
+
+
+def _clean(text) -> str:
+    return " ".join(str(text or "").replace("|", "/").split())
+
+
+def board_platform(item) -> str:
+    """소켓(적재 시 스펙에서 파싱)이 있으면 소켓, 없으면 intel/amd"""
+    if item.get("socket"):
+        return item["socket"]
+    category = item.get("category") or ""
+    return "intel" if category.endswith("intel") else "amd" if category.endswith("amd") else "-"
+
+
+class CandidateTable:
+    """슬롯별 후보 표 (짧은 id ↔ 제품)"""
+
+    def __init__(self):
+        self.rows = {slot: [] for slot in SLOT_PREFIX}     # slot → [[id, item, pinned, tokens]]
+        self.by_id = {}
+        self.counters = {slot: 0 for slot in SLOT_PREFIX}
+        self.trimmed = 0
+
+    def add(self, slot: str, item, pinned: bool = False):
+        """후보 추가 → id. 같은 이름이 이미 있으면 그 id (pinned 는 예산 초과여도 빼지 않음)"""
+        if slot not in self.rows or not isinstance(item, dict) or not item.get("name"):
+            return None
+        for row in self.rows[slot]:
+            if row[1]["name"] == item["name"]:
+                row[2] = row[2] or pinned
+                return row[0]
+
+        self.counters[slot] += 1
+        id_ = f"{SLOT_PREFIX[slot]}{self.counters[slot]}"
+        line = self.row_text(slot, id_, item)
+        self.rows[slot].append([id_, item, pinned, count_tokens(line + "\n", PROMPT_MODEL)])
+        self.by_id[id_] = item
+        return id_
+
+    @staticmethod
+    def header(slot: str) -> str:
+        if slot == "cpu":
+            return f"[{slot}] id|이름|가격|소켓"
+        if slot == "mboard":
+            return f"[{slot}] id|이름|가격|소켓|메모리"
+        if slot == "ram":
+            return f"[{slot}] id|이름|가격|메모리"
+        return f"[{slot}] id|이름|가격"
+
+    @staticmethod
+    def row_text(slot: str, id_: str, item) -> str:
+        cols = [id_, _clean(item.get("name")), str(int(item.get("price") or 0))]
+        if slot == "cpu":
+            cols.append(item.get("socket") or "-")
+        elif slot == "mboard":
+            cols += [board_platform(item), item.get("mem_gen") or "-"]
+        elif slot == "ram":
+            cols.append(item.get("mem_gen") or "-")
+        return "|".join(cols)
+
+    def tokens(self) -> int:
+        total = 0
+        for slot, rows in self.rows.items():
+            if rows:
+                total += count_tokens(self.header(slot) + "\n", PROMPT_MODEL) + sum(row[3] for row in rows)
+        return total
+
+    def trim(self, budget: int = PROMPT_TOKEN_BUDGET):
+        """표가 budget 토큰을 넘으면 후보가 가장 많은 슬롯의 마지막(우선순위 낮은) 후보부터 제외"""
+        total = self.tokens()
+        while total > budget:
+            slot = max(self.rows, key=lambda s: sum(1 for row in self.rows[s] if not row[2]) if len(self.rows[s]) > 1 else -1)
+            removable = [row for row in self.rows[slot] if not row[2]]
+            if len(self.rows[slot]) <= 1 or not removable:
+                break  # 슬롯마다 최소 1개는 남김
+            row = removable[-1]
+            self.rows[slot].remove(row)
+            del self.by_id[row[0]]
+            total -= row[3]
+            self.trimmed += 1
+        return total
+
+    def render(self) -> str:
+        lines = []
+        for slot, rows in self.rows.items():
+            if not rows: continue
+            lines.append(self.header(slot))
+            lines.extend(self.row_text(slot, row[0], row[1]) for row in rows)
+        return "\n".join(lines)
+
+    def size(self) -> int:
+        return sum(len(rows) for rows in self.rows.values())
+
+    def refs(self, estimate):
+        """견적(이름 기준) → {"cpu": {"id": "C1"}, ...} (표에 없으면 고정 후보로 추가)"""
+        refs = {}
+        for slot, item in (estimate or {}).items():
+            id_ = self.add(slot, item, pinned=True)
+            if id_:
+                refs[slot] = {"id": id_}
+        return refs
+
+    def resolve_item(self, item):
+        """모델이 고른 {"id": ...} 또는 "id" → {name, price, link}"""
+        id_ = item.get("id") if isinstance(item, dict) else item if isinstance(item, str) else None
+        product = self.by_id.get(id_)
+        if product is None:
+            return item
+        return {"name": product["name"], "price": int(product.get("price") or 0), "link": product.get("link", "")}
+
+    def resolve(self, parsed):
+        return {
+            slot: self.resolve_item(value) if slot in SLOT_PREFIX else value
+            for slot, value in (parsed or {}).items()
+        }
+
+
+def build_candidate_table(hint_products, pinned_estimates=(), budget: int = PROMPT_TOKEN_BUDGET):
+    """이전 견적/초안 부품은 고정으로 먼저 넣고, 검색 후보는 우선순위 순서대로 넣은 뒤 토큰 예산에 맞게 자름"""
+    table = CandidateTable()
+    refs = [table.refs(estimate) for estimate in pinned_estimates]
+    for slot in SLOT_PREFIX:
+        for item in hint_products.get(slot, []):
+            table.add(slot, item)
+    table.trim(budget)
+    return table, refs
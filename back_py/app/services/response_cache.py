@@ -0,0 +1,116 @@
+import os
+import threading
+
+import numpy as np
+
+from app.services.cache_utils import LRUCache
+from app.services.catalog_version import get_catalog_version
+from app.services.data_service import get_query_embedding
+from app.services.metrics import count_cache
+
+# -------------------------------------
+# 💬 첫 질문 견적 응답 캐시 (의미 유사도 확인)
+# -------------------------------------
+# "150만원 게임용" / "게임용 150만원 컴퓨터" 처럼 parse_query 결과(예산/용도/쿨러/보드)가 같은 첫 질문은
+# 문장 임베딩이 충분히 비슷하면 GPT를 다시 부르지 않고 저장된 견적을 재사용한다.
+# 이전 견적이 있는 후속 질문은 대상이 아님. 카탈로그 버전이 바뀌면 통째로 비움.
+# 질문 원문/임베딩은 이 프로세스 메모리에만 두고 (TTL 1시간) Redis 에는 쓰지 않음.
+RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE", "1") == "1"
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "256"))                # (조건 조합) 개수
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", str(60 * 60)))         # 1시간
+RESPONSE_CACHE_THRESHOLD = float(os.getenv("RESPONSE_CACHE_THRESHOLD", "0.9"))    # 코사인 유사도 하한
+RESPONSE_CACHE_PER_KEY = int(os.getenv("RESPONSE_CACHE_PER_KEY", "4"))            # 조건 조합당 보관할 문장 수
+
+_cache = LRUCache(maxsize=RESPONSE_CACHE_SIZE, ttl=RESPONSE_CACHE_TTL)
+_cache_version = {"version": None}
+_lock = threading.Lock()
+_stats = {"lookups": 0, "hits": 0, "misses": 0, "below_threshold": 0, "stores": 0, "saved_llm_calls": 0}
+
+
+def _normalize(vec):
+    vec = np.asarray(vec, dtype=np.float32)
+    norm = np.linalg.norm(vec)
+    return vec / norm if norm else vec
+
+
+def _current_key(parsed_query, engine: str):
+    # 카탈로그 버전이 바뀌면 예전 견적은 통째로 버림
+    version = get_catalog_version()
+    with _lock:
+        if version != _cache_version["version"]:
+            _cache.clear()
+            _cache_version["version"] = version
+    budget, purpose, cooler_type, board_type = parsed_query
+    return (version, engine, budget, purpose, cooler_type, board_type)
+
+
+def lookup(query: str, parsed_query, engine: str):
+    """→ (저장된 견적 또는 None, 유사도)"""
+    if not RESPONSE_CACHE_ENABLED:
+        return None, 0.0
+
+    key = _current_key(parsed_query, engine)
+    with _lock:
+        _stats["lookups"] += 1
+    entries = _cache.get(key)
+    if not entries:
+        with _lock:
+            _stats["misses"] += 1
+        count_cache("response", "miss")
+        return None, 0.0
+
+    # 조건이 같은 후보가 있을 때만 임베딩 (임베딩 캐시를 거치므로 같은 문장은 API 호출 없음)
+    try:
+        vec = _normalize(get_query_embedding(query))
+    except Exception as e:
+        print(f"⚠️ [ResponseCache] 임베딩 실패 → 캐시 건너뜀: {e}")
+        with _lock:
+            _stats["misses"] += 1
+        count_cache("response", "miss")
+        return None, 0.0
+    with _lock:
+        best_score, best = max(((float(vec @ e_vec), estimate) for e_vec, estimate in entries), key=lambda x: x[0])
+        if best_score < RESPONSE_CACHE_THRESHOLD:
+            _stats["below_threshold"] += 1
+            _stats["misses"] += 1
+            count_cache("response", "miss")
+            return None, best_score
+        _stats["hits"] += 1
+        _stats["saved_llm_calls"] += 1
+    count_cache("response", "hit")
+    print(f"♻️ [ResponseCache] 적중 (유사도 {best_score:.3f})")
+    return best, best_score
+
+
+def store(query: str, parsed_query, engine: str, estimate):
+    if not RESPONSE_CACHE_ENABLED:
+        return
+    try:
+        vec = _normalize(get_query_embedding(query))
+    except Exception as e:
+        print(f"⚠️ [ResponseCache] 임베딩 실패 → 저장 안 함: {e}")
+        return
+    key = _current_key(parsed_query, engine)
+    with _lock:
+        entries = list(_cache.get(key) or [])
+        entries.append((vec, estimate))
+        _cache.set(key, entries[-RESPONSE_CACHE_PER_KEY:])
+        _stats["stores"] += 1
+
+
+def response_cache_stats():
+    with _lock:
+        stats = dict(_stats)
+    stats["hit_rate"] = round(stats["hits"] / stats["lookups"], 4) if stats["lookups"] else 0.0
+    return dict(
+        stats,
+        enabled=RESPONSE_CACHE_ENABLED,
+        threshold=RESPONSE_CACHE_THRESHOLD,
+        keys=len(_cache),
+        ttl=RESPONSE_CACHE_TTL,
+        catalog_version=_cache_version["version"],
+    )
+
+
+def flush_response_cache():
+    _cache.clear()
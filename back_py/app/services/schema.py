@@ -0,0 +1,59 @@
+from app.services.db_pool import get_connection
+
+# -------------------------------------
+# 🗂️ product 테이블 인덱스 보장 (여러 번 실행해도 안전)
+# -------------------------------------
+# project_schema.sql 과 같은 내용을 이미 떠 있는 DB에도 반영하기 위한 용도
+# 적재 시점 분류 컬럼 (product_classifier) - 컬럼을 새로 추가했으면 기존 행은 기본값이므로 바로 backfill
+PRODUCT_COLUMNS = {
+    "is_accessory": "ALTER TABLE product ADD COLUMN is_accessory TINYINT(1) NOT NULL DEFAULT 0",
+    "mem_gen": "ALTER TABLE product ADD COLUMN mem_gen VARCHAR(8) NOT NULL DEFAULT ''",
+    "is_nvme": "ALTER TABLE product ADD COLUMN is_nvme TINYINT(1) NOT NULL DEFAULT 0",
+    # 스펙 속성 (spec_parser)
+    "socket": "ALTER TABLE product ADD COLUMN socket VARCHAR(16) NOT NULL DEFAULT ''",
+    "chipset": "ALTER TABLE product ADD COLUMN chipset VARCHAR(16) NOT NULL DEFAULT ''",
+    "storage_if": "ALTER TABLE product ADD COLUMN storage_if VARCHAR(8) NOT NULL DEFAULT ''",
+    "wattage": "ALTER TABLE product ADD COLUMN wattage SMALLINT UNSIGNED NOT NULL DEFAULT 0",
+    "form_factor": "ALTER TABLE product ADD COLUMN form_factor VARCHAR(8) NOT NULL DEFAULT ''",
+}
+
+PRODUCT_INDEXES = {
+    "idx_name": "ALTER TABLE product ADD INDEX idx_name (name)",  # enrich_with_db_info 이름 조회용
+}
+
+
+def ensure_schema():
+    added = []
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT COLUMN_NAME FROM information_schema.COLUMNS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'product'"
+        )
+        columns = {row[0] for row in cursor.fetchall()}
+
+        for name, ddl in PRODUCT_COLUMNS.items():
+            if name not in columns:
+                print(f"🛠️ [Schema] product.{name} 컬럼 추가")
+                cursor.execute(ddl)
+                added.append(name)
+
+        cursor.execute(
+            "SELECT DISTINCT INDEX_NAME FROM information_schema.STATISTICS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'product'"
+        )
+        existing = {row[0] for row in cursor.fetchall()}
+
+        for name, ddl in PRODUCT_INDEXES.items():
+            if name not in existing:
+                print(f"🛠️ [Schema] product.{name} 생성")
+                cursor.execute(ddl)
+
+        cursor.close()
+        conn.commit()
+
+    if added:
+        # 기본값(0 / '')으로 채워진 기존 행은 액세서리/세대/소켓 조건을 통과해 버리므로 바로 분류
+        from app.services.product_classifier import backfill_mysql
+        backfill_mysql()
+    return added
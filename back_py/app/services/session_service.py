@@ -1,23 +1,95 @@
-import redis
+import redis.asyncio as redis
 import json
 import os
 
+# 비동기 Redis 클라이언트 (이벤트 루프를 막지 않음)
 r = redis.Redis(
     host=os.getenv("REDIS_HOST", "redis"),
     port=int(os.getenv("REDIS_PORT", "6379")),
     decode_responses=True
 )
 
-def get_messages(session_id):
-    key = f"chat:{session_id}"
-    data = r.get(key)
+SESSION_MAX_MESSAGES = 20          # 최근 20개까지만 유지
+SESSION_TTL = 60 * 60 * 6          # TTL 6시간 (대화할 때마다 연장)
+
+# 대화 기록은 Redis 리스트 (메시지 하나 = JSON 한 줄) → 추가는 RPUSH 로 O(1)
+# 마지막 견적은 별도 해시에 저장 → 이전 견적 조회가 HMGET 한 번
+#   estimate : 견적 JSON
+#   after    : 견적 메시지 뒤에 추가된 메시지 수 → SESSION_MAX_MESSAGES 이상이면 기록에서 잘려 나간 견적이므로 무시
+#              (예전처럼 "최근 20개 안의 견적"만 이전 견적으로 씀)
+#   migrated : 예전 형식 기록을 확인(이전)했으면 1 → 그 뒤로는 예전 키를 조회하지 않음
+def history_key(session_id):
+    return f"chat:v2:{session_id}"
+
+def last_estimate_key(session_id):
+    return f"chat:v2:{session_id}:last_estimate"
+
+def legacy_key(session_id):
+    # 예전 형식 (전체 기록을 JSON 문자열 하나로 저장) - 첫 쓰기 때 v2 리스트로 옮기고 지움
+    return f"chat:{session_id}"
+
+
+def find_last_estimate(messages):
+    """기록(오래된 → 최신)에서 마지막 견적 → (뒤에 있는 메시지 수, 견적) 또는 (None, None)"""
+    for offset, msg in enumerate(reversed(messages)):
+        if msg["role"] == "assistant":
+            try:
+                js = json.loads(msg["content"])
+                if "cpu" in js and "gpu" in js:
+                    return offset, js
+            except:
+                pass
+    return None, None
+
+
+async def get_messages(session_id):
+    items = await r.lrange(history_key(session_id), 0, -1)
+    if items:
+        return [json.loads(item) for item in items]
+    data = await r.get(legacy_key(session_id))
     return json.loads(data) if data else []
 
-def append_message(session_id, role, content):
-    key = f"chat:{session_id}"
-    history = get_messages(session_id)
-    history.append({"role": role, "content": content})
-    # 최근 20개까지만 유지
-    if len(history) > 20:
-        history = history[-20:]
-    r.set(key, json.dumps(history), ex=60 * 60 * 6)  # TTL 6시간
+
+async def get_last_estimate(session_id):
+    data, after, migrated = await r.hmget(last_estimate_key(session_id), ["estimate", "after", "migrated"])
+    if data:
+        return json.loads(data) if int(after or 0) < SESSION_MAX_MESSAGES else None
+    if migrated:
+        return None
+
+    # 아직 옮기지 않은 예전 형식 세션은 기록을 뒤에서부터 훑어서 찾음
+    data = await r.get(legacy_key(session_id))
+    legacy = json.loads(data)[-SESSION_MAX_MESSAGES:] if data else []
+    return find_last_estimate(legacy)[1]
+
+
+async def append_messages(session_id, messages, estimate=None):
+    """messages: [(role, content)] 를 한 번의 파이프라인(MULTI)으로 추가 + 보관 개수/TTL 유지.
+    estimate 가 있으면(messages 의 마지막 메시지에 해당) 마지막 견적도 같이 갱신.
+    예전 형식 기록이 남아 있으면 GETDEL 로 가져와서 새 메시지 앞에 옮겨 담음 (migrated 표시 전, 세션당 한 번)"""
+    key, est_key = history_key(session_id), last_estimate_key(session_id)
+    entries = [{"role": role, "content": content} for role, content in messages]
+
+    legacy = []
+    if not await r.hget(est_key, "migrated"):
+        legacy_data = await r.getdel(legacy_key(session_id))
+        legacy = json.loads(legacy_data) if legacy_data else []
+    legacy_after, legacy_estimate = find_last_estimate(legacy)
+
+    async with r.pipeline(transaction=True) as pipe:
+        pipe.rpush(key, *[json.dumps(entry) for entry in legacy + entries])
+        pipe.ltrim(key, -SESSION_MAX_MESSAGES, -1)
+        pipe.expire(key, SESSION_TTL)
+        if estimate is not None:
+            pipe.hset(est_key, mapping={"estimate": json.dumps(estimate, ensure_ascii=False), "after": 0})
+        elif legacy_estimate is not None:
+            pipe.hset(est_key, mapping={"estimate": json.dumps(legacy_estimate, ensure_ascii=False), "after": legacy_after + len(entries)})
+        else:
+            pipe.hincrby(est_key, "after", len(entries))
+        pipe.hset(est_key, "migrated", 1)
+        pipe.expire(est_key, SESSION_TTL)
+        await pipe.execute()
+
+
+async def append_message(session_id, role, content):
+    await append_messages(session_id, [(role, content)])
@@ -0,0 +1,134 @@
+import asyncio
+import os
+import threading
+
+# -------------------------------------
+# 🛫 single-flight: 같은 키로 동시에 들어온 작업은 한 번만 실행
+# -------------------------------------
+# 먼저 온 호출(리더)이 실행하고, 실행 중에 같은 키로 온 호출(팔로워)은 그 결과를 같이 받는다.
+# - 리더가 실패하면 기다리던 호출 모두 같은 예외를 받음 (실패 결과는 남기지 않으므로 다음 호출은 새로 실행)
+# - 끝난 작업은 바로 잊음 → 캐시가 아니라 "동시에 진행 중인" 중복만 합침
+# - 결과 객체는 호출자끼리 공유되므로 수정이 필요하면 호출자가 복사해서 씀
+SINGLE_FLIGHT_ENABLED = os.getenv("SINGLE_FLIGHT", "1") == "1"
+
+_groups = {}
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class _FlightStats:
+    def _init_stats(self, name: str):
+        self.name = name
+        self.executed = 0     # 실제로 실행한 횟수 (리더)
+        self.coalesced = 0    # 진행 중인 실행에 합쳐진 횟수 (팔로워)
+        self.failures = 0     # 리더 실행이 예외로 끝난 횟수
+        self.shared_failures = 0  # 리더 예외를 같이 받은 팔로워 수
+        _groups[name] = self
+
+    def stats(self):
+        total = self.executed + self.coalesced
+        return {
+            "executed": self.executed,
+            "coalesced": self.coalesced,
+            "failures": self.failures,
+            "shared_failures": self.shared_failures,
+            "in_flight": self.in_flight(),
+            "coalesce_rate": round(self.coalesced / total, 4) if total else 0.0,
+        }
+
+
+class SingleFlight(_FlightStats):
+    """스레드용 (동기 함수 - 스레드 풀에서 도는 Chroma/MySQL 검색 등)"""
+
+    def __init__(self, name: str):
+        self._init_stats(name)
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    def do(self, key, fn, *args, **kwargs):
+        if not SINGLE_FLIGHT_ENABLED:
+            return fn(*args, **kwargs)
+
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.coalesced += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self.executed += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            with self._lock:
+                self.failures += 1
+                self.shared_failures += call.waiters
+            raise
+        finally:
+            # 결과/예외를 정한 뒤 키를 지우고 깨움 → 이후 호출은 새로 실행
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+        return call.result
+
+
+class AsyncSingleFlight(_FlightStats):
+    """asyncio 용 (GPT 호출 등). 작업은 별도 Task 로 돌려서
+    먼저 온 요청이 취소(연결 끊김)돼도 기다리는 다른 요청의 작업은 계속 진행된다"""
+
+    def __init__(self, name: str):
+        self._init_stats(name)
+        self._tasks = {}
+
+    def in_flight(self) -> int:
+        return len(self._tasks)
+
+    async def do(self, key, coro_fn, *args, **kwargs):
+        if not SINGLE_FLIGHT_ENABLED:
+            return await coro_fn(*args, **kwargs)
+
+        task = self._tasks.get(key)
+        if task is not None:
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(task)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.shared_failures += 1
+                raise
+
+        task = asyncio.ensure_future(coro_fn(*args, **kwargs))
+        self._tasks[key] = task
+        self.executed += 1
+        task.add_done_callback(lambda t: self._finish(key, t))
+        return await asyncio.shield(task)
+
+    def _finish(self, key, task):
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        if not task.cancelled() and task.exception() is not None:
+            self.failures += 1
+
+
+def single_flight_stats():
+    return {"enabled": SINGLE_FLIGHT_ENABLED, "groups": {name: group.stats() for name, group in _groups.items()}}
@@ -0,0 +1,109 @@
+import re
+
+# -------------------------------------
+# 🔩 스펙 문자열 → 호환성 속성 (적재 시점 1회)
+# -------------------------------------
+# 다나와 spec 예) "인텔(소켓1700) / B760 / M-ATX (24.4x24.4cm) / DDR5 / ..."
+#                "ATX 파워 / 정격출력 700W / 80 PLUS 브론즈 / ..."
+# 스펙에 없으면 이름(칩셋/모델 번호)으로 보완. 모르는 값은 "" / 0 (Chroma 메타데이터는 None 불가)
+#   socket      : CPU / 메인보드   (LGA1700, AM5 ...)
+#   chipset     : 메인보드        (B760, X670 ...)
+#   storage_if  : SSD / HDD       (NVME, SATA)
+#   wattage     : 파워            (정격 W)
+#   form_factor : 메인보드 / 케이스(장착 가능한 가장 큰 보드) / 파워
+
+# 칩셋 → 소켓
+CHIPSET_SOCKETS = {
+    **dict.fromkeys(["H510", "B560", "H570", "Z590"], "LGA1200"),
+    **dict.fromkeys(["H610", "B660", "H670", "Z690", "B760", "H770", "Z790"], "LGA1700"),
+    **dict.fromkeys(["H810", "B860", "Z890"], "LGA1851"),
+    **dict.fromkeys(["A320", "B350", "X370", "B450", "X470", "A520", "B550", "X570"], "AM4"),
+    **dict.fromkeys(["A620", "B650", "X670", "B850", "X870"], "AM5"),
+}
+CHIPSET_PATTERN = re.compile(r"(?<![0-9A-Z])([ABHXZ]\d{3})(?!\d)")
+INTEL_GEN_PATTERN = re.compile(r"(?<!\d)(1[0-4])\d{3}(?!\d)")        # 12400, 14700K ...
+INTEL_ULTRA_PATTERN = re.compile(r"(?:ULTRA|울트라)\s?[3579].{0,12}?(?<!\d)2\d{2}(?!\d)")  # 코어 울트라5 시리즈2 245K ...
+RYZEN_PATTERN = re.compile(r"(?<!\d)([1-9])\d{3}(?!\d)")              # 5600, 7800X3D ...
+
+SPEC_SOCKET_PATTERN = re.compile(r"(?:소켓|SOCKET|LGA)\s?(AM[45]|\d{4})(?!\d)")
+WATTAGE_PATTERN = re.compile(r"(?<!\d)(\d{3,4})\s?W(?![A-Z])")
+FORM_FACTOR_PATTERN = re.compile(r"(?<![A-Z])(E-ATX|EATX|M-ATX|MATX|MICRO-ATX|M-ITX|MINI-ITX|ITX|SFX-L|SFX|TFX|ATX)(?![A-Z])")
+FORM_FACTOR_ALIASES = {"EATX": "E-ATX", "MATX": "M-ATX", "MICRO-ATX": "M-ATX", "MINI-ITX": "M-ITX", "ITX": "M-ITX"}
+BOARD_SIZES = ["M-ITX", "M-ATX", "ATX", "E-ATX"]   # 작은 것부터
+
+SOCKET_PARTS = ("cpu", "mboard")
+STORAGE_CATEGORIES = ("SSD", "HDD")
+EMPTY_ATTRIBUTES = {"socket": "", "chipset": "", "storage_if": "", "wattage": 0, "form_factor": ""}
+
+
+def cpu_brand(name_up: str):
+    if "AMD" in name_up or "라이젠" in name_up or "RYZEN" in name_up:
+        return "amd"
+    if "인텔" in name_up or "INTEL" in name_up or "코어" in name_up or "CORE" in name_up:
+        return "intel"
+    return None
+
+
+def cpu_socket(name_up: str, brand: str):
+    """CPU 이름(모델 번호)으로 소켓 추정"""
+    if brand == "intel":
+        if INTEL_ULTRA_PATTERN.search(name_up):
+            return "LGA1851"
+        match = INTEL_GEN_PATTERN.search(name_up)
+        if match:
+            return "LGA1200" if int(match.group(1)) < 12 else "LGA1700"
+    elif brand == "amd":
+        match = RYZEN_PATTERN.search(name_up)
+        if match:
+            return "AM4" if int(match.group(1)) <= 5 else "AM5"
+    return None
+
+
+def find_chipset(text_up: str) -> str:
+    for match in CHIPSET_PATTERN.finditer(text_up):
+        if match.group(1) in CHIPSET_SOCKETS:
+            return match.group(1)
+    return ""
+
+
+def spec_socket(spec_up: str) -> str:
+    match = SPEC_SOCKET_PATTERN.search(spec_up)
+    if not match:
+        return ""
+    value = match.group(1)
+    return value if value.startswith("AM") else f"LGA{value}"
+
+
+def form_factors(text_up: str):
+    return [FORM_FACTOR_ALIASES.get(f, f) for f in FORM_FACTOR_PATTERN.findall(text_up)]
+
+
+def parse_spec_attributes(part: str, category: str, name_up: str, spec_up: str) -> dict:
+    """부품 키 / 크롤링 카테고리 / 대문자 이름 / 대문자 스펙 → 호환성 속성"""
+    attrs = dict(EMPTY_ATTRIBUTES)
+
+    if part == "cpu":
+        attrs["socket"] = spec_socket(spec_up) or cpu_socket(name_up, cpu_brand(name_up)) or ""
+
+    elif part == "mboard":
+        attrs["chipset"] = find_chipset(name_up) or find_chipset(spec_up)
+        attrs["socket"] = spec_socket(spec_up) or CHIPSET_SOCKETS.get(attrs["chipset"], "")
+        boards = [f for f in form_factors(spec_up) if f in BOARD_SIZES]
+        attrs["form_factor"] = boards[0] if boards else ""
+
+    elif category in STORAGE_CATEGORIES:
+        text = f"{name_up} {spec_up}"
+        attrs["storage_if"] = "NVME" if "NVME" in text else "SATA" if "SATA" in text or category == "HDD" else ""
+
+    elif part == "power":
+        match = WATTAGE_PATTERN.search(name_up) or WATTAGE_PATTERN.search(spec_up)
+        attrs["wattage"] = int(match.group(1)) if match else 0
+        found = form_factors(f"{name_up} {spec_up}")
+        attrs["form_factor"] = next((f for f in found if f in ("SFX", "SFX-L", "TFX")), "ATX" if "ATX" in found else "")
+
+    elif part == "case":
+        # 케이스 스펙은 장착 가능한 보드 규격을 나열 → 가장 큰 규격
+        boards = [f for f in form_factors(spec_up) if f in BOARD_SIZES]
+        attrs["form_factor"] = max(boards, key=BOARD_SIZES.index) if boards else ""
+
+    return attrs
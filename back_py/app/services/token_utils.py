@@ -0,0 +1,54 @@
+import math
+
+# -------------------------------------
+# 🔢 로컬 토큰 수 계산 (API 호출 없이)
+# -------------------------------------
+# tiktoken 이 설치되어 있고 인코딩 파일을 받을 수 있으면 정확히 계산,
+# 아니면 보수적으로 근사 (영문/숫자 4글자당 1토큰, 한글 등은 글자당 1토큰)
+# 인코딩 파일은 처음 쓸 때 내려받을 수 있으므로 서버는 시작할 때 warm_encodings() 로 미리 읽고,
+# 그 뒤로는 요청 중에 새로 읽지 않음 (미리 안 읽은 모델은 근사값)
+_encodings = {}
+_lazy_load = {"enabled": True}   # 크롤러/스크립트처럼 warm 없이 쓰는 곳은 처음 쓸 때 읽음
+
+
+def _load_encoding(model: str):
+    try:
+        import tiktoken
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        print(f"⚠️ [Tokens] {model} 인코딩 로드 실패, 근사값 사용: {e}")
+        return None
+
+
+def _get_encoding(model: str):
+    if model not in _encodings:
+        if not _lazy_load["enabled"]:
+            return None
+        _encodings[model] = _load_encoding(model)
+    return _encodings[model]
+
+
+def warm_encodings(*models):
+    """서버 시작 시 1회: 쓸 모델의 인코딩을 미리 읽고 요청 경로에서의 로드(다운로드)를 끔"""
+    for model in models:
+        if model not in _encodings:
+            _encodings[model] = _load_encoding(model)
+    _lazy_load["enabled"] = False
+    return {model: _encodings[model] is not None for model in models}
+
+
+def estimate_tokens(text: str) -> int:
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return math.ceil(ascii_chars / 4) + (len(text) - ascii_chars)
+
+
+def count_tokens(text: str, model: str = "text-embedding-3-small") -> int:
+    if not text:
+        return 0
+    encoding = _get_encoding(model)
+    if encoding is None:
+        return estimate_tokens(text)
+    return len(encoding.encode(text))
@@ -0,0 +1,93 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+
+from app.services.cache_utils import LRUCache
+
+# -------------------------------------
+# 🎙️ /ai/query 트래픽 기록 (익명화, 기본 꺼짐)
+# -------------------------------------
+# TRAFFIC_RECORD_PATH 를 지정하면 견적 요청을 JSON 한 줄씩 기록 → bench.replay 로 재생.
+#   {"ts": 1760000000.123, "session": "ab12..", "turn": 2, "path": "/ai/query",
+#    "message": "150만원 게임용 <phone>", "status": 200, "latency_ms": 812.3}
+# - ts 는 요청 도착 시각(epoch 초). 워커 여러 개가 같은 파일에 써도 섞이지 않도록 절대 시각만 기록하고
+#   재생 간격은 bench.replay 에서 첫 요청 기준으로 계산
+# - 세션 ID 는 솔트를 섞은 해시로만 저장 (같은 세션의 순서/턴은 유지)
+#   워커가 여러 개면 TRAFFIC_RECORD_SALT 를 지정해야 같은 세션이 워커마다 같은 해시로 남음
+# - 메시지의 이메일 / 전화번호 / URL 은 마스킹
+# - 샘플링은 세션 단위 (세션의 일부 턴만 남지 않도록)
+TRAFFIC_RECORD_PATH = os.getenv("TRAFFIC_RECORD_PATH", "")
+TRAFFIC_RECORD_SAMPLE = float(os.getenv("TRAFFIC_RECORD_SAMPLE", "1.0"))
+TRAFFIC_RECORD_SALT = os.getenv("TRAFFIC_RECORD_SALT", "") or os.urandom(16).hex()  # 지정 안 하면 프로세스마다 새 솔트
+RECORD_PATHS = ("/ai/query", "/ai/query/stream")
+MAX_MESSAGE_CHARS = 500
+
+EMAIL_PATTERN = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+PHONE_PATTERN = re.compile(r"(?<!\d)01[016789][-\s.]?\d{3,4}[-\s.]?\d{4}(?!\d)")
+URL_PATTERN = re.compile(r"https?://\S+")
+
+_turns = LRUCache(maxsize=100000, ttl=60 * 60 * 6)   # 세션 해시 → 지금까지 기록한 턴 수 (세션 TTL 과 같게)
+_lock = threading.Lock()
+_file = None
+_stats = {"recorded": 0, "skipped": 0, "errors": 0}
+
+
+def recording_enabled() -> bool:
+    return bool(TRAFFIC_RECORD_PATH)
+
+
+def anonymize_session(session_id: str) -> str:
+    return hashlib.sha256(f"{TRAFFIC_RECORD_SALT}:{session_id}".encode("utf-8")).hexdigest()[:16]
+
+
+def anonymize_message(message: str) -> str:
+    message = EMAIL_PATTERN.sub("<email>", message or "")
+    message = PHONE_PATTERN.sub("<phone>", message)
+    message = URL_PATTERN.sub("<url>", message)
+    return message[:MAX_MESSAGE_CHARS]
+
+
+def sampled(session_hash: str) -> bool:
+    if TRAFFIC_RECORD_SAMPLE >= 1:
+        return True
+    return int(session_hash[:8], 16) / 0xFFFFFFFF < TRAFFIC_RECORD_SAMPLE
+
+
+def record_request(path: str, session_id: str, message: str, status: int, started: float, latency_ms: float):
+    """started: 요청 시작 시각 (time.monotonic)"""
+    if not session_id or message is None:
+        return
+    session = anonymize_session(session_id)
+    if not sampled(session):
+        _stats["skipped"] += 1
+        return
+
+    global _file
+    try:
+        with _lock:
+            turn = (_turns.get(session) or 0) + 1
+            _turns.set(session, turn)
+            line = json.dumps({
+                "ts": round(time.time() - (time.monotonic() - started), 3),
+                "session": session,
+                "turn": turn,
+                "path": path,
+                "message": anonymize_message(message),
+                "status": status,
+                "latency_ms": round(latency_ms, 1),
+            }, ensure_ascii=False)
+            if _file is None:
+                _file = open(TRAFFIC_RECORD_PATH, "a", encoding="utf-8")
+            _file.write(line + "\n")
+            _file.flush()
+            _stats["recorded"] += 1
+    except Exception as e:
+        _stats["errors"] += 1
+        print(f"⚠️ [TrafficRecorder] 기록 실패: {e}")
+
+
+def recorder_stats():
+    return dict(_stats, enabled=recording_enabled(), path=TRAFFIC_RECORD_PATH, sample=TRAFFIC_RECORD_SAMPLE)
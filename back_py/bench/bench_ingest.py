@@ -0,0 +1,59 @@
+import argparse
+import os
+import random
+import sys
+import tempfile
+
+# -------------------------------------
+# 🏁 임베딩 적재 파이프라인 벤치마크
+# -------------------------------------
+# 1) python -m bench.fake_openai --port 9100 --fail-rate 0.05
+# 2) OPENAI_BASE_URL=http://localhost:9100/v1 OPENAI_API_KEY=fake python -m bench.bench_ingest --docs 5000
+# 임시 Chroma 폴더에 적재하고 끝나면 지운다 (CHROMA_PATH를 지정하면 그 경로 사용).
+
+
+def make_products(n: int, seed: int = 7):
+    rnd = random.Random(seed)
+    categories = ["CPU", "VGA", "RAM", "SSD", "MBoard_intel", "Power", "Case"]
+    return [
+        {
+            "id": f"ingest{i:010d}",
+            "name": f"벤치 상품 {i}",
+            "category": rnd.choice(categories),
+            "spec": " / ".join(f"항목{j} 값{rnd.randint(1, 999)}" for j in range(rnd.randint(5, 40))),
+            "price": rnd.randint(10000, 2000000),
+            "link": f"https://prod.danawa.com/info/?pcode={i}",
+        }
+        for i in range(n)
+    ]
+
+
+def main(docs: int, concurrency: int):
+    # vector_utils는 import 시점에 CHROMA_PATH로 컬렉션을 열기 때문에 먼저 지정
+    tmpdir = None
+    if not os.getenv("CHROMA_PATH"):
+        tmpdir = tempfile.TemporaryDirectory()
+        os.environ["CHROMA_PATH"] = tmpdir.name
+
+    sys.path.append(os.path.join(os.path.dirname(__file__), "..", "app", "crawler"))
+    import vector_utils
+
+    products = make_products(docs)
+    texts = [vector_utils.document_text(p) for p in products]
+    metadatas = [vector_utils.build_metadata(p, vector_utils.text_hash(t)) for p, t in zip(products, texts)]
+
+    print(f"\n📊 {docs}개 문서 적재 (동시 {concurrency}, 청크 {vector_utils.EMBED_CHUNK_TOKENS}토큰)")
+    stats = vector_utils.ingest_documents([p["id"] for p in products], texts, metadatas, concurrency)
+    print(f"   {stats}")
+
+    if tmpdir:
+        tmpdir.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="임베딩 적재 파이프라인 벤치마크")
+    parser.add_argument("--docs", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    main(args.docs, args.concurrency)
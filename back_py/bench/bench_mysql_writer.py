@@ -0,0 +1,104 @@
+import argparse
+import random
+import time
+from datetime import datetime
+
+import mysql.connector
+
+from app.services.db_pool import DB_CONFIG, get_connection
+from app.crawler.db_utils import UPSERT_SQL, _to_row, save_to_mysql, save_many_to_mysql
+
+# -------------------------------------
+# 🏁 크롤러 MySQL 저장 벤치마크 (행 단위 vs 일괄 upsert)
+# -------------------------------------
+# 실행: python -m bench.bench_mysql_writer --rows 2000
+# product 와 같은 구조의 임시 테이블(product_bench)에 쓰고 끝나면 지운다.
+
+BENCH_TABLE = "product_bench"
+
+
+def make_products(n: int, seed: int = 42):
+    rnd = random.Random(seed)
+    return [
+        {
+            "id": f"bench{i:011d}",
+            "name": f"벤치 상품 {i}",
+            "category": rnd.choice(["CPU", "VGA", "RAM", "SSD", "Power", "Case"]),
+            "spec": "스펙 " * rnd.randint(10, 60),
+            "price": rnd.randint(10000, 2000000),
+            "capacity": "N/A",
+            "link": f"https://prod.danawa.com/info/?pcode={i}",
+        }
+        for i in range(n)
+    ]
+
+
+def reset_table():
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"DROP TABLE IF EXISTS {BENCH_TABLE}")
+        cursor.execute(f"CREATE TABLE {BENCH_TABLE} LIKE product")
+        cursor.close()
+        conn.commit()
+
+
+def drop_table():
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"DROP TABLE IF EXISTS {BENCH_TABLE}")
+        cursor.close()
+        conn.commit()
+
+
+def save_legacy(product):
+    """기존 방식: 행마다 새 커넥션 + 커밋"""
+    conn = mysql.connector.connect(**DB_CONFIG)
+    cursor = conn.cursor()
+    cursor.execute(UPSERT_SQL.format(table=BENCH_TABLE), _to_row(product, datetime.now()))
+    conn.commit()
+    conn.close()
+
+
+def each(fn, products):
+    for p in products:
+        fn(p)
+
+
+def timed(label, fn, rows):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    print(f"   {label:<28} {elapsed:8.3f}s  ({rows / elapsed:9.1f} rows/s)  {result or ''}")
+    return elapsed
+
+
+def main(rows: int, chunk_size: int, skip_legacy: bool):
+    products = make_products(rows)
+    print(f"\n📊 {rows}행 upsert 비교 (chunk={chunk_size})")
+
+    try:
+        if not skip_legacy:
+            reset_table()
+            timed("행 단위 (새 커넥션)", lambda: each(save_legacy, products), rows)
+
+        reset_table()
+        timed("행 단위 (커넥션 풀)", lambda: each(lambda p: save_to_mysql(p, table=BENCH_TABLE), products), rows)
+
+        reset_table()
+        timed("일괄 (신규 삽입)", lambda: save_many_to_mysql(products, chunk_size, BENCH_TABLE), rows)
+
+        # 재크롤 시나리오: 10%만 가격 변동
+        changed = [dict(p, price=p["price"] + 1000) if i % 10 == 0 else p for i, p in enumerate(products)]
+        timed("일괄 (재크롤, 10% 변경)", lambda: save_many_to_mysql(changed, chunk_size, BENCH_TABLE), rows)
+    finally:
+        drop_table()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="크롤러 MySQL 저장 벤치마크")
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--skip-legacy", action="store_true", help="행마다 새 커넥션을 여는 기존 방식 측정 생략")
+    args = parser.parse_args()
+
+    main(args.rows, args.chunk_size, args.skip_legacy)
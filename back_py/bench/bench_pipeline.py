@@ -0,0 +1,310 @@
+import argparse
+import asyncio
+import contextlib
+import json
+import math
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import uuid
+
+import numpy as np
+
+# -------------------------------------
+# 🏁 견적 파이프라인 오프라인 벤치마크 (키/MySQL/Redis/Chroma 없이)
+# -------------------------------------
+# 실행: python -m bench.bench_pipeline --products 20000 --requests 200 --concurrency 8
+#       python -m bench.bench_pipeline --products 100000 --engine solver_llm --cold --json out.json
+#
+# 대역:
+#   - OpenAI   : bench.fake_openai 를 같은 프로세스의 스레드에서 띄움 (임베딩/채팅 지연 조절)
+#   - Redis    : bench.fake_redis 인메모리 대역 (세션 / 카탈로그 버전 / 임베딩 캐시)
+#   - MySQL    : bench.sqlite_catalog 로 만든 SQLite 카탈로그 (db_pool 의 공용 풀을 교체)
+#   - Chroma   : 임시 폴더의 PersistentClient, 같은 카탈로그를 적재 (벡터는 로컬에서 생성)
+# 측정:
+#   - process_chat_request 단계별 / 전체 p50·p95·p99, 처리량 (X-Debug-Timing 과 같은 요청별 기록 사용)
+#   - get_hint_products 단독 (매번 hint 캐시를 비운 콜드 경로)
+
+BUDGETS = [70, 80, 100, 120, 150, 180, 200, 250, 300]
+PURPOSES = ["게임", "사무", "영상 편집", "디자인", "롤", "작업"]
+EXTRAS = ["", "", "인텔", "AMD", "수랭", "공랭", "조용한"]
+
+
+def make_queries(n: int, seed: int):
+    rnd = random.Random(seed)
+    return [
+        " ".join(filter(None, [f"{rnd.choice(BUDGETS)}만원", f"{rnd.choice(PURPOSES)}용 컴퓨터", rnd.choice(EXTRAS)]))
+        for _ in range(n)
+    ]
+
+
+def percentile(values, p: float):
+    """nearest-rank 백분위"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+def summarize(samples):
+    """samples: {이름: [ms]} → {이름: {n, p50, p95, p99, mean}}"""
+    return {
+        name: {
+            "n": len(values),
+            "p50": round(percentile(values, 50), 2),
+            "p95": round(percentile(values, 95), 2),
+            "p99": round(percentile(values, 99), 2),
+            "mean": round(sum(values) / len(values), 2),
+        }
+        for name, values in samples.items() if values
+    }
+
+
+def print_table(title: str, summary):
+    print(f"\n📊 {title}")
+    print(f"   {'단계':<28}{'n':>6}{'p50':>10}{'p95':>10}{'p99':>10}{'mean':>10}  (ms)")
+    for name, row in summary.items():
+        print(f"   {name:<28}{row['n']:>6}{row['p50']:>10.1f}{row['p95']:>10.1f}{row['p99']:>10.1f}{row['mean']:>10.1f}")
+
+
+# -------------------------------------
+# 🧪 대역 준비
+# -------------------------------------
+def start_fake_openai(args):
+    """가짜 OpenAI 서버를 백그라운드 스레드에서 실행 → base_url"""
+    import uvicorn
+    from bench import fake_openai
+
+    fake_openai.FAKE_LATENCY = args.embed_latency
+    fake_openai.FAKE_CHAT_LATENCY = args.chat_latency
+    fake_openai.FAKE_TOKEN_LATENCY = args.token_latency
+    fake_openai.FAKE_DIMS = args.dims
+
+    server = uvicorn.Server(uvicorn.Config(fake_openai.app, host="127.0.0.1", port=args.openai_port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, thread
+
+
+def build_chroma(products, dims: int, seed: int, batch: int = 5000):
+    """임시 Chroma 컬렉션에 카탈로그 적재 (벡터는 로컬 난수, 메타데이터/문서는 크롤러와 같은 형식)"""
+    sys.path.append(os.path.join(os.path.dirname(__file__), "..", "app", "crawler"))
+    import vector_utils
+    from app.services.data_service import get_collection
+
+    collection = get_collection()
+    rng = np.random.default_rng(seed)
+    for start in range(0, len(products), batch):
+        chunk = products[start:start + batch]
+        vectors = rng.standard_normal((len(chunk), dims)).astype(np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        texts = [vector_utils.document_text(p) for p in chunk]
+        collection.add(
+            ids=[str(p["id"]) for p in chunk],
+            embeddings=vectors.tolist(),
+            documents=texts,
+            metadatas=[vector_utils.build_metadata(p, vector_utils.text_hash(t)) for p, t in zip(chunk, texts)],
+        )
+    return collection
+
+
+def check_vector_path():
+    """Chroma 검색이 실제로 결과를 돌려주는지 확인 (차원 불일치 등은 서비스 코드가 삼키고 MySQL 백업으로 넘어가므로)"""
+    from app.services.data_service import _query_chroma, build_hint_query, HINT_CATEGORIES
+
+    for cat_list in HINT_CATEGORIES.values():
+        for cat in cat_list:
+            items = _query_chroma(build_hint_query(cat), cat, 0, 99999999, None, 3, None)
+            if not items:
+                raise RuntimeError(f"Chroma '{cat}' 검색 결과 없음 → 벡터 경로가 측정되지 않음")
+
+
+def require_chroma_stages(samples):
+    """측정 결과에 Chroma 검색 시간이 하나도 없으면 MySQL/스냅샷 백업만 잰 것"""
+    if not any(name.startswith("chroma.") for name in samples):
+        raise RuntimeError("Chroma 검색이 한 번도 성공하지 않음 (--verbose 로 서비스 로그 확인)")
+
+
+# -------------------------------------
+# ⏱️ 측정
+# -------------------------------------
+async def run_requests(queries, concurrency: int, engine: str):
+    from app.services.ai_service import process_chat_request
+    from app.services.metrics import start_request_timing
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(message):
+        async with semaphore:
+            timing = start_request_timing()   # 태스크마다 컨텍스트가 따로라서 요청별로 분리됨
+            started = time.perf_counter()
+            ok = False
+            try:
+                result = await process_chat_request(f"bench-{uuid.uuid4().hex[:12]}", message, engine)
+                ok = bool(result.get("success")) and "cpu" in result["estimate"]
+            except Exception as e:
+                print(f"❌ [Bench] '{message}' 실패: {e}", file=sys.stderr)
+            return ok, (time.perf_counter() - started) * 1000, timing.as_dict()
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*[one(q) for q in queries])
+    return results, time.perf_counter() - started
+
+
+def run_hint_calls(queries, flush: bool = True):
+    from app.services.ai_service import parse_query
+    from app.services.data_service import get_hint_products, flush_hint_cache
+    from app.services.metrics import start_request_timing
+
+    results = []
+    for message in queries:
+        budget, purpose, _, _ = parse_query(message)
+        if flush:
+            flush_hint_cache()
+        timing = start_request_timing()
+        started = time.perf_counter()
+        get_hint_products(budget, purpose)
+        results.append(((time.perf_counter() - started) * 1000, timing.as_dict()))
+    return results
+
+
+def collect(rows):
+    """[(전체 ms, timing dict)] → 단계별 ms 목록 + 요청당 평균 횟수"""
+    samples, counts = {"end_to_end": []}, {}
+    for total_ms, timing in rows:
+        samples["end_to_end"].append(total_ms)
+        for name, ms in timing["stages_ms"].items():
+            samples.setdefault(name, []).append(ms)
+        for name, count in timing["counts"].items():
+            counts[name] = counts.get(name, 0) + count
+    return samples, {name: round(total / len(rows), 2) for name, total in counts.items()} if rows else {}
+
+
+def quiet(verbose: bool):
+    """서비스 로그(print)는 요청마다 수십 줄이라 기본으로 숨김"""
+    if verbose:
+        return contextlib.nullcontext()
+    return contextlib.redirect_stdout(open(os.devnull, "w"))
+
+
+@contextlib.contextmanager
+def stand_ins(args, prefix: str = "bench_pipeline_"):
+    """가짜 OpenAI / 인메모리 Redis / SQLite 카탈로그 / 임시 Chroma 준비 → 준비 시간(dict). 끝나면 정리"""
+    workdir = tempfile.mkdtemp(prefix=prefix)
+
+    # 서비스 모듈은 import 시점에 환경변수를 읽으므로 먼저 지정
+    os.environ["CHROMA_PATH"] = os.path.join(workdir, "chroma")
+    os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{args.openai_port}/v1"
+    os.environ["OPENAI_API_KEY"] = "fake"
+    if args.cold:
+        for name in ("HINT_CACHE", "RESPONSE_CACHE", "SINGLE_FLIGHT"):
+            os.environ[name] = "0"
+
+    server, _ = start_fake_openai(args)
+    try:
+        from bench.fake_redis import install_fake_redis
+        from bench.sqlite_catalog import make_catalog, create_catalog_db, install_sqlite_pool
+        from app.services.catalog_snapshot import get_catalog_snapshot
+        from app.services.product_lookup import get_name_index
+
+        setup = {}
+        started = time.perf_counter()
+        products = make_catalog(args.products, args.seed)
+        db_path = os.path.join(workdir, "catalog.db")
+        create_catalog_db(db_path, products)
+        setup["catalog_s"] = round(time.perf_counter() - started, 2)
+
+        install_fake_redis()
+        install_sqlite_pool(db_path)
+
+        with quiet(args.verbose):
+            started = time.perf_counter()
+            build_chroma(products, args.dims, args.seed)
+            setup["chroma_s"] = round(time.perf_counter() - started, 2)
+
+            # 첫 요청에 섞이지 않도록 인메모리 스냅샷 / 이름 맵은 미리 로드
+            started = time.perf_counter()
+            get_catalog_snapshot()
+            get_name_index()
+            check_vector_path()
+            setup["warmup_s"] = round(time.perf_counter() - started, 2)
+        print(f"\n🧪 상품 {args.products}개 / 차원 {args.dims} / 준비 {setup}")
+        yield setup
+    finally:
+        server.should_exit = True
+        if args.keep:
+            print(f"   작업 폴더 유지: {workdir}")
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+
+def add_stand_in_args(parser):
+    parser.add_argument("--products", type=int, default=20000, help="카탈로그 상품 수 (10k~100k 권장)")
+    parser.add_argument("--cold", action="store_true", help="hint/응답 캐시와 single-flight 끄기")
+    parser.add_argument("--dims", type=int, default=256, help="임베딩 차원 (실제 모델은 1536)")
+    parser.add_argument("--embed-latency", type=float, default=0.05)
+    parser.add_argument("--chat-latency", type=float, default=0.3)
+    parser.add_argument("--token-latency", type=float, default=0.0)
+    parser.add_argument("--openai-port", type=int, default=9199)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--keep", action="store_true", help="임시 카탈로그/Chroma 폴더 남기기")
+    parser.add_argument("--verbose", action="store_true", help="서비스 로그 출력")
+
+
+def main(args):
+    with stand_ins(args) as setup:
+        from bench.fake_openai import stats as openai_stats
+
+        queries = make_queries(args.requests, args.seed)
+        report = {"args": vars(args), "setup": setup}
+
+        if args.hint_calls:
+            with quiet(args.verbose):
+                hint_rows = run_hint_calls(make_queries(args.hint_calls, args.seed + 1))
+            samples, counts = collect(hint_rows)
+            require_chroma_stages(samples)
+            report["hint_products"] = {"stages": summarize(samples), "counts_per_call": counts}
+            print_table(f"get_hint_products 콜드 {args.hint_calls}회", report["hint_products"]["stages"])
+
+        with quiet(args.verbose):
+            results, wall = asyncio.run(run_requests(queries, args.concurrency, args.engine))
+        samples, counts = collect([(ms, timing) for _, ms, timing in results])
+        require_chroma_stages(samples)
+        ok = sum(1 for r in results if r[0])
+        report["pipeline"] = {
+            "engine": args.engine,
+            "requests": len(results),
+            "ok": ok,
+            "wall_s": round(wall, 3),
+            "throughput_rps": round(len(results) / wall, 2) if wall else 0.0,
+            "stages": summarize(samples),
+            "counts_per_request": counts,
+            "fake_openai": dict(openai_stats),
+        }
+
+        print_table(f"process_chat_request ({args.engine}, 동시 {args.concurrency})", report["pipeline"]["stages"])
+        print(f"\n   성공 {ok}/{len(results)} / 전체 {wall:.2f}s / 처리량 {report['pipeline']['throughput_rps']} req/s")
+        print(f"   요청당 평균: {counts}")
+        print(f"   가짜 OpenAI: {dict(openai_stats)}")
+
+        if args.json:
+            with open(args.json, "w", encoding="utf-8") as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+            print(f"   결과 저장: {args.json}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="견적 파이프라인 오프라인 벤치마크")
+    add_stand_in_args(parser)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--engine", default="llm", choices=["llm", "solver", "solver_llm"])
+    parser.add_argument("--hint-calls", type=int, default=20, help="get_hint_products 단독 측정 횟수 (0이면 생략)")
+    parser.add_argument("--json", default="", help="결과를 JSON 으로 저장 (회귀 비교용)")
+    main(parser.parse_args())
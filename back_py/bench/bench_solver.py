@@ -0,0 +1,117 @@
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from app.services.build_solver import SLOT_ORDER, solve_build, part_profile, compatible
+
+# -------------------------------------
+# 🏁 견적 엔진 벤치마크 (조합기 vs GPT)
+# -------------------------------------
+# 실행: python -m bench.bench_solver --scenarios 200
+#       python -m bench.bench_solver --scenarios 20 --llm   (OPENAI_API_KEY 또는 OPENAI_BASE_URL 필요)
+# 가짜 후보 목록(슬롯당 8개)을 만들어 같은 입력으로 두 엔진의 지연시간 / 예산 준수율 / 호환성 위반을 비교한다.
+
+BUDGETS = [800000, 1000000, 1300000, 1500000, 2000000, 3000000]
+
+
+def make_hints(budget: int, rnd: random.Random):
+    def price(lo, hi):
+        return int(budget * rnd.uniform(lo, hi)) // 1000 * 1000
+
+    intel = [f"인텔 코어i{rnd.choice([5, 7])}-{gen}세대 {gen}{rnd.randint(100, 999)}" for gen in (12, 13, 14)]
+    amd = [f"AMD 라이젠{rnd.choice([5, 7])} {model}" for model in (5600, 5800, 7600, 7800)]
+    boards = [("MBoard_intel", f"MSI {chip}M 박격포") for chip in ("B660", "B760", "Z790", "H610")] + \
+             [("MBoard_amd", f"ASUS {chip}M-A") for chip in ("B550", "A520", "B650", "X670")]
+
+    hints = {
+        "cpu": [{"name": n, "category": "CPU", "price": price(0.1, 0.3)} for n in rnd.sample(intel + amd, 6)],
+        "gpu": [{"name": f"RTX {rnd.choice([4060, 4070, 5070])} {i}", "category": "VGA", "price": price(0.25, 0.6)} for i in range(8)],
+        "mboard": [
+            {"name": n, "category": c, "price": price(0.05, 0.13), "mem_gen": "DDR5" if any(x in n for x in ("B650", "X670", "Z790")) else "DDR4"}
+            for c, n in rnd.sample(boards, 6)
+        ],
+        "ram": [{"name": f"삼성 {g} 16GB {i}", "category": "RAM", "price": price(0.03, 0.15), "mem_gen": g} for i, g in enumerate(["DDR4", "DDR5"] * 3)],
+        "ssd": [{"name": f"NVMe SSD {i}", "category": "SSD", "price": price(0.02, 0.1)} for i in range(8)],
+        "cooler": [{"name": f"쿨러 {i}", "category": "Cooler_Air", "price": price(0.01, 0.05)} for i in range(6)],
+        "power": [{"name": f"파워 {i}", "category": "Power", "price": price(0.03, 0.1)} for i in range(8)],
+        "case": [{"name": f"케이스 {i}", "category": "Case", "price": price(0.02, 0.05)} for i in range(8)],
+    }
+    for items in hints.values():
+        for item in items:
+            item["link"] = ""
+    return hints
+
+
+def check_estimate(estimate, hints, budget: int):
+    """후보 목록 기준 총액 / 예산 준수 / 호환성 / 목록 밖 부품 수"""
+    by_name = {(key, item["name"]): item for key, items in hints.items() for item in items}
+    total, profiles, violations, unknown = 0, {}, 0, 0
+
+    for key in SLOT_ORDER:
+        picked = (estimate or {}).get(key)
+        if not isinstance(picked, dict): continue
+        item = by_name.get((key, picked.get("name")))
+        if item is None:
+            unknown += 1
+            continue
+        total += item["price"]
+        profile = part_profile(key, item)
+        if not compatible(key, profile, profiles):
+            violations += 1
+        profiles[key] = profile
+
+    return {"total": total, "within_budget": total <= budget, "violations": violations, "unknown": unknown}
+
+
+def run_solver(scenarios):
+    rows = []
+    for budget, hints in scenarios:
+        start = time.perf_counter()
+        estimate, _ = solve_build(hints, budget)
+        rows.append(dict(check_estimate(estimate, hints, budget), ms=(time.perf_counter() - start) * 1000, budget=budget))
+    return rows
+
+
+def run_llm(scenarios):
+    from app.services.ai_service import request_llm_estimate
+
+    async def one(budget, hints):
+        start = time.perf_counter()
+        estimate = await request_llm_estimate(f"{budget // 10000}만원 게임용 컴퓨터 맞춰줘", hints)
+        return dict(check_estimate(estimate, hints, budget), ms=(time.perf_counter() - start) * 1000, budget=budget)
+
+    async def run_all():
+        return [await one(budget, hints) for budget, hints in scenarios]
+
+    return asyncio.run(run_all())
+
+
+def report(label, rows):
+    latencies = sorted(r["ms"] for r in rows)
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+    within = sum(r["within_budget"] for r in rows)
+    usage = statistics.mean(r["total"] / r["budget"] for r in rows)
+    print(f"\n📊 {label} ({len(rows)}건)")
+    print(f"   지연시간 p50 {statistics.median(latencies):.2f}ms / p95 {p95:.2f}ms / 최대 {latencies[-1]:.2f}ms")
+    print(f"   예산 준수 {within}/{len(rows)} ({within / len(rows):.0%}) / 평균 예산 사용률 {usage:.0%}")
+    print(f"   호환성 위반 {sum(r['violations'] for r in rows)}건 / 목록 밖 부품 {sum(r['unknown'] for r in rows)}건")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="견적 엔진 벤치마크 (조합기 vs GPT)")
+    parser.add_argument("--scenarios", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--llm", action="store_true", help="GPT 경로도 같은 시나리오로 측정")
+    args = parser.parse_args()
+
+    rnd = random.Random(args.seed)
+    scenarios = []
+    for i in range(args.scenarios):
+        budget = BUDGETS[i % len(BUDGETS)]
+        scenarios.append((budget, make_hints(budget, rnd)))
+
+    report("solver", run_solver(scenarios))
+    if args.llm:
+        report("llm (gpt-4o-mini)", run_llm(scenarios))
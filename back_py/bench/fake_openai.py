@@ -0,0 +1,149 @@
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import random
+import time
+
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import StreamingResponse
+
+# -------------------------------------
+# 🧪 로컬 가짜 OpenAI 서버 (네트워크/키 없이 파이프라인 측정용)
+# -------------------------------------
+# 실행: python -m bench.fake_openai --port 9100 --latency 0.2 --fail-rate 0.1
+# 사용: OPENAI_BASE_URL=http://localhost:9100/v1 OPENAI_API_KEY=fake python crawler.py ...
+#
+# - POST /v1/embeddings : 문장 해시로 만든 결정적 벡터 반환 (같은 문장 → 같은 벡터)
+# - POST /v1/chat/completions : 프롬프트 후보 표에서 슬롯별 첫 후보 id로 견적 JSON 생성
+#                                (stream=true 면 SSE 조각으로 나눠서 전송)
+
+FAKE_LATENCY = float(os.getenv("FAKE_OPENAI_LATENCY", "0.05"))     # 요청당 지연(초)
+FAKE_PER_ITEM = float(os.getenv("FAKE_OPENAI_PER_ITEM", "0.001"))  # 임베딩 문장당 추가 지연(초)
+FAKE_FAIL_RATE = float(os.getenv("FAKE_OPENAI_FAIL_RATE", "0"))    # 429 응답 비율
+FAKE_DIMS = int(os.getenv("FAKE_OPENAI_DIMS", "1536"))
+FAKE_CHAT_LATENCY = float(os.getenv("FAKE_OPENAI_CHAT_LATENCY", "0.3"))      # 첫 토큰까지 지연(초)
+FAKE_TOKEN_LATENCY = float(os.getenv("FAKE_OPENAI_TOKEN_LATENCY", "0.01"))   # 조각당 지연(초)
+FAKE_CHUNK_CHARS = int(os.getenv("FAKE_OPENAI_CHUNK_CHARS", "8"))            # 스트리밍 조각 크기(글자)
+
+ESTIMATE_SLOTS = ["cpu", "gpu", "mboard", "ram", "ssd", "cooler", "power", "case"]
+
+app = FastAPI(title="fake-openai")
+stats = {"embedding_requests": 0, "embedding_inputs": 0, "chat_requests": 0, "failures": 0}
+
+
+def fake_embedding(text: str, dims: int | None = None):
+    dims = dims or FAKE_DIMS   # 기본값은 호출 시점에 읽음 (--dims / 벤치에서 바꾼 값 반영)
+    rnd = random.Random(hashlib.sha256(text.encode("utf-8")).digest())
+    vec = [rnd.uniform(-1, 1) for _ in range(dims)]
+    norm = sum(v * v for v in vec) ** 0.5
+    return [v / norm for v in vec]
+
+
+async def maybe_fail():
+    if FAKE_FAIL_RATE and random.random() < FAKE_FAIL_RATE:
+        stats["failures"] += 1
+        raise HTTPException(status_code=429, detail={"error": {"message": "fake rate limit", "type": "rate_limit"}})
+
+
+@app.post("/v1/embeddings")
+async def embeddings(request: Request):
+    body = await request.json()
+    inputs = body["input"] if isinstance(body["input"], list) else [body["input"]]
+    stats["embedding_requests"] += 1
+    stats["embedding_inputs"] += len(inputs)
+
+    await asyncio.sleep(FAKE_LATENCY + FAKE_PER_ITEM * len(inputs))
+    await maybe_fail()
+
+    return {
+        "object": "list",
+        "model": body.get("model", "text-embedding-3-small"),
+        "data": [{"object": "embedding", "index": i, "embedding": fake_embedding(text)} for i, text in enumerate(inputs)],
+        "usage": {"prompt_tokens": sum(len(t) for t in inputs), "total_tokens": sum(len(t) for t in inputs)},
+    }
+
+
+def extract_first_ids(prompt: str):
+    """프롬프트 후보 표에서 슬롯별 첫 후보 id ("[cpu] id|이름|가격" 다음 줄)"""
+    first, slot = {}, None
+    for line in prompt.splitlines():
+        line = line.strip()
+        if line.startswith("[") and "]" in line:
+            slot = line[1:line.index("]")]
+        elif slot and "|" in line and slot not in first:
+            first[slot] = line.split("|", 1)[0]
+    return first
+
+
+def fake_estimate(messages):
+    prompt = next((m["content"] for m in reversed(messages) if m.get("role") == "user"), "")
+    first = extract_first_ids(prompt)
+    estimate = {slot: {"id": first[slot]} for slot in ESTIMATE_SLOTS if slot in first}
+    return json.dumps(estimate, ensure_ascii=False, indent=2)
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    stats["chat_requests"] += 1
+
+    await asyncio.sleep(FAKE_CHAT_LATENCY)
+    await maybe_fail()
+
+    content = fake_estimate(body.get("messages", []))
+    model = body.get("model", "gpt-4o-mini")
+    completion_id = f"chatcmpl-fake{stats['chat_requests']}"
+    created = int(time.time())
+    usage = {"prompt_tokens": sum(len(m.get("content") or "") for m in body.get("messages", [])) // 2, "completion_tokens": len(content) // 2}
+    usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+
+    if not body.get("stream"):
+        return {
+            "id": completion_id, "object": "chat.completion", "created": created, "model": model,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": usage,
+        }
+
+    async def sse():
+        def chunk(delta, finish_reason=None):
+            data = {
+                "id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+            }
+            return f"data: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+        yield chunk({"role": "assistant", "content": ""})
+        for i in range(0, len(content), FAKE_CHUNK_CHARS):
+            await asyncio.sleep(FAKE_TOKEN_LATENCY)
+            yield chunk({"content": content[i:i + FAKE_CHUNK_CHARS]})
+        yield chunk({}, "stop")
+        if (body.get("stream_options") or {}).get("include_usage"):
+            data = {"id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model, "choices": [], "usage": usage}
+            yield f"data: {json.dumps(data)}\n\n"
+        yield "data: [DONE]\n\n"
+
+    return StreamingResponse(sse(), media_type="text/event-stream")
+
+
+@app.get("/stats")
+def get_stats():
+    return stats
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="로컬 가짜 OpenAI 서버")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--latency", type=float, default=FAKE_LATENCY)
+    parser.add_argument("--fail-rate", type=float, default=FAKE_FAIL_RATE)
+    parser.add_argument("--dims", type=int, default=FAKE_DIMS)
+    parser.add_argument("--chat-latency", type=float, default=FAKE_CHAT_LATENCY)
+    parser.add_argument("--token-latency", type=float, default=FAKE_TOKEN_LATENCY)
+    args = parser.parse_args()
+
+    FAKE_LATENCY, FAKE_FAIL_RATE, FAKE_DIMS = args.latency, args.fail_rate, args.dims
+    FAKE_CHAT_LATENCY, FAKE_TOKEN_LATENCY = args.chat_latency, args.token_latency
+    uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning")
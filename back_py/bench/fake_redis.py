@@ -0,0 +1,255 @@
+import threading
+import time
+
+# -------------------------------------
+# 🧪 인메모리 Redis 대역 (벤치마크용)
+# -------------------------------------
+# 서비스 코드가 쓰는 명령만 구현 (GET/MGET/GETDEL/SET/INCR/DELETE/EXPIRE, 리스트 RPUSH/LRANGE/LTRIM,
+# 해시 HSET/HINCRBY/HMGET, 파이프라인).
+# 동기(redis.Redis) / 비동기(redis.asyncio.Redis) 클라이언트 모두 같은 저장소를 공유한다.
+#
+#   from bench.fake_redis import install_fake_redis
+#   install_fake_redis()   # app.services.* 의 Redis 클라이언트를 교체
+
+
+class FakeRedisStore:
+    def __init__(self):
+        self.data = {}        # 키 → bytes 또는 [bytes] (리스트) 또는 {필드: bytes} (해시)
+        self.expires = {}     # 키 → 만료 시각 (monotonic)
+        self.lock = threading.RLock()
+        self.commands = 0
+
+    def _alive(self, key):
+        expires_at = self.expires.get(key)
+        if expires_at is not None and expires_at <= time.monotonic():
+            self.data.pop(key, None)
+            self.expires.pop(key, None)
+        return key in self.data
+
+
+def _encode(value) -> bytes:
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value)
+    return str(value).encode("utf-8")
+
+
+class FakeRedis:
+    """redis.Redis 와 같은 호출 방식의 동기 클라이언트"""
+
+    def __init__(self, store: FakeRedisStore = None, decode_responses: bool = False):
+        self.store = store or FakeRedisStore()
+        self.decode_responses = decode_responses
+
+    def _out(self, value):
+        if value is None or not self.decode_responses:
+            return value
+        return value.decode("utf-8")
+
+    def _touch(self):
+        self.store.commands += 1
+
+    # --- 문자열 ---
+    def get(self, key):
+        with self.store.lock:
+            self._touch()
+            if not self.store._alive(key):
+                return None
+            return self._out(self.store.data[key])
+
+    def mget(self, keys, *args):
+        keys = [keys, *args] if isinstance(keys, (str, bytes)) else [*keys, *args]
+        with self.store.lock:
+            self._touch()
+            return [self._out(self.store.data[key]) if self.store._alive(key) else None for key in keys]
+
+    def getdel(self, key):
+        with self.store.lock:
+            value = self.get(key)
+            self.store.data.pop(key, None)
+            self.store.expires.pop(key, None)
+            return value
+
+    def set(self, key, value, ex=None, px=None, nx=False):
+        with self.store.lock:
+            self._touch()
+            if nx and self.store._alive(key):
+                return None
+            self.store.data[key] = _encode(value)
+            self.store.expires.pop(key, None)
+            ttl = ex if ex is not None else (px / 1000 if px is not None else None)
+            if ttl is not None:
+                self.store.expires[key] = time.monotonic() + ttl
+            return True
+
+    def incr(self, key, amount: int = 1):
+        with self.store.lock:
+            self._touch()
+            value = int(self.store.data[key]) + amount if self.store._alive(key) else amount
+            self.store.data[key] = _encode(value)
+            return value
+
+    def delete(self, *keys):
+        with self.store.lock:
+            self._touch()
+            removed = 0
+            for key in keys:
+                if self.store._alive(key):
+                    removed += 1
+                self.store.data.pop(key, None)
+                self.store.expires.pop(key, None)
+            return removed
+
+    def exists(self, *keys):
+        with self.store.lock:
+            self._touch()
+            return sum(1 for key in keys if self.store._alive(key))
+
+    def expire(self, key, seconds):
+        with self.store.lock:
+            self._touch()
+            if not self.store._alive(key):
+                return False
+            self.store.expires[key] = time.monotonic() + seconds
+            return True
+
+    def ttl(self, key):
+        with self.store.lock:
+            self._touch()
+            if not self.store._alive(key):
+                return -2
+            expires_at = self.store.expires.get(key)
+            return -1 if expires_at is None else int(expires_at - time.monotonic())
+
+    # --- 리스트 ---
+    def rpush(self, key, *values):
+        with self.store.lock:
+            self._touch()
+            items = self.store.data[key] if self.store._alive(key) else []
+            items.extend(_encode(v) for v in values)
+            self.store.data[key] = items
+            return len(items)
+
+    def lrange(self, key, start, end):
+        with self.store.lock:
+            self._touch()
+            if not self.store._alive(key):
+                return []
+            items = self.store.data[key]
+            end = len(items) if end == -1 else end + 1
+            return [self._out(v) for v in items[start:end]]
+
+    def ltrim(self, key, start, end):
+        with self.store.lock:
+            self._touch()
+            if self.store._alive(key):
+                items = self.store.data[key]
+                end = len(items) if end == -1 else end + 1
+                self.store.data[key] = items[start:end]
+            return True
+
+    # --- 해시 ---
+    def hset(self, key, field=None, value=None, mapping=None):
+        with self.store.lock:
+            self._touch()
+            fields = self.store.data[key] if self.store._alive(key) else {}
+            updates = dict(mapping or {})
+            if field is not None:
+                updates[field] = value
+            added = sum(1 for f in updates if f not in fields)
+            fields.update({f: _encode(v) for f, v in updates.items()})
+            self.store.data[key] = fields
+            return added
+
+    def hincrby(self, key, field, amount: int = 1):
+        with self.store.lock:
+            self._touch()
+            fields = self.store.data[key] if self.store._alive(key) else {}
+            value = int(fields.get(field, b"0")) + amount
+            fields[field] = _encode(value)
+            self.store.data[key] = fields
+            return value
+
+    def hget(self, key, field):
+        return self.hmget(key, [field])[0]
+
+    def hmget(self, key, fields, *args):
+        fields = [fields, *args] if isinstance(fields, (str, bytes)) else [*fields, *args]
+        with self.store.lock:
+            self._touch()
+            values = self.store.data[key] if self.store._alive(key) else {}
+            return [self._out(values.get(f)) for f in fields]
+
+    def ping(self):
+        return True
+
+    def pipeline(self, transaction: bool = True):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    """명령을 모아 두었다가 execute() 에서 한 번에 (락 안에서) 실행"""
+
+    def __init__(self, client: FakeRedis):
+        self.client = client
+        self.queued = []
+
+    def __getattr__(self, name):
+        method = getattr(self.client, name)
+
+        def queue(*args, **kwargs):
+            self.queued.append((method, args, kwargs))
+            return self
+        return queue
+
+    def execute(self):
+        with self.client.store.lock:
+            results = [method(*args, **kwargs) for method, args, kwargs in self.queued]
+        self.queued = []
+        return results
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.queued = []
+        return False
+
+
+class FakeAsyncRedis:
+    """redis.asyncio.Redis 와 같은 호출 방식 (내부는 동기 저장소, 대기 없음)"""
+
+    def __init__(self, store: FakeRedisStore = None, decode_responses: bool = False):
+        self.sync = FakeRedis(store, decode_responses)
+
+    def __getattr__(self, name):
+        method = getattr(self.sync, name)
+
+        async def call(*args, **kwargs):
+            return method(*args, **kwargs)
+        return call
+
+    def pipeline(self, transaction: bool = True):
+        return FakeAsyncPipeline(self.sync)
+
+
+class FakeAsyncPipeline(FakePipeline):
+    async def execute(self):
+        return FakePipeline.execute(self)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.queued = []
+        return False
+
+
+def install_fake_redis(store: FakeRedisStore = None):
+    """세션 / 카탈로그 버전 / 임베딩 캐시의 Redis 클라이언트를 인메모리 대역으로 교체"""
+    from app.services import session_service, catalog_version, embedding_cache
+
+    store = store or FakeRedisStore()
+    session_service.r = FakeAsyncRedis(store, decode_responses=True)
+    catalog_version._redis = FakeRedis(store, decode_responses=True)
+    embedding_cache._redis = FakeRedis(store)
+    return store
@@ -0,0 +1,103 @@
+import argparse
+import asyncio
+import json
+import time
+import uuid
+
+import httpx
+
+# -------------------------------------
+# 🚦 /ai/query 동시 세션 부하 테스트
+# -------------------------------------
+# 실행: python -m bench.load_runner --url http://localhost:8001 --sessions 8
+#       python -m bench.load_runner --stream   (/ai/query/stream 의 첫 바이트 / 첫 부품까지 시간도 측정)
+#
+# 세션 N개가 동시에 견적을 요청했을 때 서버가 요청을 겹쳐서 처리하는지(overlap),
+# 아니면 한 줄로 세워서 처리하는지(queue) 확인한다.
+#   concurrency = 각 요청 지연시간 합 / 전체 소요시간
+#   → 1에 가까우면 직렬 처리, N에 가까우면 완전히 겹쳐서 처리
+
+
+async def send_query(client: httpx.AsyncClient, url: str, message: str, started_at: float):
+    session_id = f"load-{uuid.uuid4().hex[:12]}"
+    start = time.perf_counter()
+    try:
+        res = await client.post(f"{url}/ai/query", json={"message": message}, headers={"session-id": session_id})
+        ok = res.status_code == 200 and res.json().get("success", False)
+    except httpx.HTTPError as e:
+        print(f"❌ {session_id} 요청 실패: {e}")
+        ok = False
+    end = time.perf_counter()
+    return {"session": session_id, "start": start - started_at, "end": end - started_at, "ok": ok}
+
+
+async def send_stream_query(client: httpx.AsyncClient, url: str, message: str, started_at: float):
+    session_id = f"load-{uuid.uuid4().hex[:12]}"
+    start = time.perf_counter()
+    first_byte = first_part = None
+    ok = False
+    try:
+        async with client.stream("POST", f"{url}/ai/query/stream", json={"message": message}, headers={"session-id": session_id}) as res:
+            async for line in res.aiter_lines():
+                if not line: continue
+                now = time.perf_counter() - started_at
+                first_byte = first_byte if first_byte is not None else now
+                event = json.loads(line)
+                if event["type"] == "part" and first_part is None:
+                    first_part = now
+                elif event["type"] == "estimate":
+                    ok = True
+    except httpx.HTTPError as e:
+        print(f"❌ {session_id} 요청 실패: {e}")
+    end = time.perf_counter()
+    return {"session": session_id, "start": start - started_at, "end": end - started_at, "ok": ok,
+            "first_byte": first_byte, "first_part": first_part}
+
+
+def max_in_flight(results):
+    """서버에 동시에 걸려 있던 요청 수의 최댓값"""
+    events = sorted([(r["start"], 1) for r in results] + [(r["end"], -1) for r in results])
+    current = peak = 0
+    for _, delta in events:
+        current += delta
+        peak = max(peak, current)
+    return peak
+
+
+async def run(url: str, sessions: int, message: str, timeout: float, stream: bool = False):
+    send = send_stream_query if stream else send_query
+    async with httpx.AsyncClient(timeout=timeout) as client:
+        started_at = time.perf_counter()
+        results = await asyncio.gather(*[send(client, url, message, started_at) for _ in range(sessions)])
+        wall = time.perf_counter() - started_at
+
+    latencies = sorted(r["end"] - r["start"] for r in results)
+    concurrency = sum(latencies) / wall if wall else 0
+
+    print(f"\n📊 세션 {sessions}개 / 성공 {sum(r['ok'] for r in results)}개")
+    for r in sorted(results, key=lambda r: r["start"]):
+        print(f"   {r['session']}  {r['start']:6.2f}s → {r['end']:6.2f}s  {'OK' if r['ok'] else 'FAIL'}")
+    print(f"   전체 소요: {wall:.2f}s / 평균 지연: {sum(latencies) / len(latencies):.2f}s / 최대 지연: {latencies[-1]:.2f}s")
+    print(f"   최대 동시 처리: {max_in_flight(results)} / 유효 동시성: {concurrency:.2f}")
+    print("   ✅ 요청이 겹쳐서 처리됨" if concurrency > 1.5 else "   ⚠️ 요청이 직렬로 처리되는 것으로 보임")
+
+    if stream:
+        ttfb = [r["first_byte"] - r["start"] for r in results if r["first_byte"] is not None]
+        ttfp = [r["first_part"] - r["start"] for r in results if r["first_part"] is not None]
+        if ttfb:
+            print(f"   첫 바이트까지 평균: {sum(ttfb) / len(ttfb):.2f}s (전체 평균 지연 대비 {sum(ttfb) / len(ttfb) / (sum(latencies) / len(latencies)):.0%})")
+        if ttfp:
+            print(f"   첫 부품까지 평균: {sum(ttfp) / len(ttfp):.2f}s")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="/ai/query 동시 세션 부하 테스트")
+    parser.add_argument("--url", default="http://localhost:8001")
+    parser.add_argument("--sessions", type=int, default=8)
+    parser.add_argument("--message", default="150만원 게임용 컴퓨터 견적 짜줘")
+    parser.add_argument("--timeout", type=float, default=120)
+    parser.add_argument("--stream", action="store_true", help="/ai/query/stream (NDJSON) 으로 요청")
+    args = parser.parse_args()
+
+    asyncio.run(run(args.url, args.sessions, args.message, args.timeout, args.stream))
@@ -0,0 +1,249 @@
+import argparse
+import asyncio
+import json
+import os
+import time
+import uuid
+
+import httpx
+
+from bench.bench_pipeline import add_stand_in_args, percentile, quiet, stand_ins, summarize, print_table
+
+# -------------------------------------
+# 🔁 기록한 /ai/query 트래픽 재생 / 빌드 간 비교
+# -------------------------------------
+# 1) 운영 서버에서 기록: TRAFFIC_RECORD_PATH=/data/traffic.jsonl uvicorn app.main:app ...
+# 2) 재생 (기본: 같은 프로세스 안의 앱 + 로컬 대역 / --url 이면 떠 있는 서버로 전송)
+#      python -m bench.replay run --log traffic.jsonl --speed 1 --out build_a.jsonl
+#      python -m bench.replay run --log traffic.jsonl --speed 4 --out build_b.jsonl   (4배 빠르게)
+#      python -m bench.replay run --log traffic.jsonl --speed 0 --max-in-flight 32   (간격 무시, 최대 속도)
+# 3) 두 빌드 결과 비교 (지연 분포 / 오류율 / 견적이 바뀐 비율)
+#      python -m bench.replay compare build_a.jsonl build_b.jsonl
+#
+# - 세션 안의 턴은 기록 순서대로 하나씩 보냄 (이전 턴이 늦게 끝나면 다음 턴도 밀림 → lag_ms)
+# - 재생할 때 세션 ID 는 실행마다 새로 붙여서 이전 실행의 대화 기록과 섞이지 않게 함
+
+SLOTS = ["cpu", "gpu", "mboard", "ram", "ssd", "cooler", "power", "case"]
+
+
+def load_records(path: str, limit: int = 0):
+    """기록 → 도착 순서대로. t = 첫 요청 기준 도착 시각(초), turn 은 세션 안에서 도착 순서대로 다시 매김
+    (워커 여러 개가 같은 세션을 나눠 받으면 워커별 턴 번호가 겹치므로)"""
+    with open(path, encoding="utf-8") as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    # 예전 기록은 프로세스 기준 상대 시각 t 만 있음
+    records.sort(key=lambda r: (r.get("ts", r.get("t")), r["turn"]))
+    base = records[0].get("ts", records[0].get("t")) if records else 0
+    turns = {}
+    for record in records:
+        record["t"] = round(record.get("ts", record.get("t")) - base, 3)
+        turns[record["session"]] = record["turn"] = turns.get(record["session"], 0) + 1
+    return records[:limit] if limit else records
+
+
+def load_results(path: str):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def estimate_names(estimate):
+    return {slot: item.get("name") for slot, item in (estimate or {}).items() if slot in SLOTS and isinstance(item, dict)}
+
+
+# -------------------------------------
+# 📤 요청 전송
+# -------------------------------------
+async def send(client: httpx.AsyncClient, record, session_id: str):
+    """→ (status, estimate 또는 None, 오류 메시지 또는 None)"""
+    payload, headers = {"message": record["message"]}, {"session-id": session_id}
+
+    if record["path"].endswith("/stream"):
+        estimate, error = None, None
+        async with client.stream("POST", record["path"], json=payload, headers=headers) as res:
+            async for line in res.aiter_lines():
+                if not line: continue
+                event = json.loads(line)
+                if event.get("type") == "estimate":
+                    estimate = event["estimate"]
+                elif event.get("type") == "error":
+                    error = event.get("error")
+            return res.status_code, estimate, error
+
+    res = await client.post(record["path"], json=payload, headers=headers)
+    try:
+        body = res.json()
+    except ValueError:
+        return res.status_code, None, res.text[:200]
+    if body.get("success"):
+        return res.status_code, body.get("estimate"), None
+    return res.status_code, None, body.get("error") or body.get("message") or "success=false"
+
+
+async def replay(client: httpx.AsyncClient, records, speed: float, max_in_flight: int):
+    run_id = uuid.uuid4().hex[:8]
+    sessions = {}
+    for record in records:
+        sessions.setdefault(record["session"], []).append(record)
+
+    semaphore = asyncio.Semaphore(max_in_flight)
+    base_t = records[0]["t"] if records else 0
+    started = time.perf_counter()
+    results = []
+
+    async def play_session(session, turns):
+        session_id = f"replay-{run_id}-{session}"
+        for record in turns:
+            # 기록된 도착 시각에 맞춰 대기 (speed 배 빠르게, 0 이면 대기 없음)
+            due = (record["t"] - base_t) / speed if speed > 0 else 0
+            delay = due - (time.perf_counter() - started)
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            async with semaphore:
+                sent = time.perf_counter()
+                try:
+                    status, estimate, error = await send(client, record, session_id)
+                except httpx.HTTPError as e:
+                    status, estimate, error = None, None, f"{type(e).__name__}: {e}"
+                done = time.perf_counter()
+
+            results.append({
+                "session": session,
+                "turn": record["turn"],
+                "t": record["t"],
+                "path": record["path"],
+                "message": record["message"],
+                "status": status,
+                "ok": status == 200 and error is None and bool(estimate),
+                "error": error,
+                "latency_ms": round((done - sent) * 1000, 1),
+                "lag_ms": round(max(0.0, (sent - started) - due) * 1000, 1),
+                "recorded_latency_ms": record.get("latency_ms"),
+                "estimate": estimate_names(estimate),
+                "total_price": (estimate or {}).get("total_price"),
+            })
+
+    await asyncio.gather(*[play_session(session, turns) for session, turns in sessions.items()])
+    return results, time.perf_counter() - started
+
+
+def report_run(results, wall: float, records):
+    latencies = [r["latency_ms"] for r in results]
+    errors = [r for r in results if not r["ok"]]
+    recorded_span = (records[-1]["t"] - records[0]["t"]) if records else 0
+
+    stages = {"latency": latencies, "schedule_lag": [r["lag_ms"] for r in results]}
+    recorded = [r["recorded_latency_ms"] for r in results if r.get("recorded_latency_ms") is not None]
+    if recorded:
+        stages["recorded_latency"] = recorded
+    for path in sorted({r["path"] for r in results}):
+        stages[f"latency {path}"] = [r["latency_ms"] for r in results if r["path"] == path]
+    print_table(f"재생 {len(results)}건 / 세션 {len({r['session'] for r in results})}개", summarize(stages))
+
+    print(f"\n   기록 구간 {recorded_span:.1f}s → 재생 {wall:.1f}s / 처리량 {len(results) / wall if wall else 0:.2f} req/s")
+    print(f"   오류 {len(errors)}건 ({len(errors) / len(results) * 100 if results else 0:.1f}%)")
+    for r in errors[:5]:
+        print(f"     - [{r['status']}] {r['message'][:40]} → {r['error']}")
+
+
+# -------------------------------------
+# 🆚 두 빌드 결과 비교
+# -------------------------------------
+def compare(path_a: str, path_b: str):
+    a = {(r["session"], r["turn"]): r for r in load_results(path_a)}
+    b = {(r["session"], r["turn"]): r for r in load_results(path_b)}
+    keys = sorted(set(a) & set(b))
+    both_ok = [k for k in keys if a[k]["ok"] and b[k]["ok"]]
+
+    changed, slot_changes, price_deltas = 0, {slot: 0 for slot in SLOTS}, []
+    for k in both_ok:
+        ea, eb = a[k]["estimate"], b[k]["estimate"]
+        diff = [slot for slot in SLOTS if ea.get(slot) != eb.get(slot)]
+        changed += bool(diff)
+        for slot in diff:
+            slot_changes[slot] += 1
+        if a[k].get("total_price") is not None and b[k].get("total_price") is not None:
+            price_deltas.append(b[k]["total_price"] - a[k]["total_price"])
+
+    def error_rate(rows):
+        return sum(1 for r in rows if not r["ok"]) / len(rows) * 100 if rows else 0.0
+
+    lat_a = [a[k]["latency_ms"] for k in keys]
+    lat_b = [b[k]["latency_ms"] for k in keys]
+    print(f"\n🆚 {path_a}  vs  {path_b}  (공통 요청 {len(keys)}건, 둘 다 성공 {len(both_ok)}건)")
+    print(f"   {'':<10}{'p50':>10}{'p95':>10}{'p99':>10}{'오류율':>10}")
+    for label, lat, rows in (("A", lat_a, [a[k] for k in keys]), ("B", lat_b, [b[k] for k in keys])):
+        print(f"   {label:<10}{percentile(lat, 50):>10.1f}{percentile(lat, 95):>10.1f}{percentile(lat, 99):>10.1f}{error_rate(rows):>9.1f}%")
+    if lat_a and lat_b:
+        print(f"   p50 변화 {percentile(lat_b, 50) - percentile(lat_a, 50):+.1f}ms / p95 변화 {percentile(lat_b, 95) - percentile(lat_a, 95):+.1f}ms")
+
+    if both_ok:
+        print(f"\n   견적이 바뀐 요청: {changed}/{len(both_ok)} ({changed / len(both_ok) * 100:.1f}%)")
+        if changed:
+            print("   슬롯별 변경: " + ", ".join(f"{slot} {count}" for slot, count in slot_changes.items() if count))
+    if price_deltas:
+        print(f"   총액 변화: 평균 {sum(price_deltas) / len(price_deltas):+,.0f}원 / 절대값 평균 {sum(abs(d) for d in price_deltas) / len(price_deltas):,.0f}원")
+    return {"common": len(keys), "both_ok": len(both_ok), "changed": changed, "slot_changes": slot_changes}
+
+
+# -------------------------------------
+# 🚀 실행
+# -------------------------------------
+async def run_against(url: str, records, args):
+    timeout = httpx.Timeout(args.timeout)
+    if url:
+        async with httpx.AsyncClient(base_url=url, timeout=timeout) as client:
+            return await replay(client, records, args.speed, args.max_in_flight)
+
+    # 같은 프로세스 안의 앱 (미들웨어/라우터 포함, 외부 의존성은 대역)
+    from app.main import app
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://replay", timeout=timeout) as client:
+        return await replay(client, records, args.speed, args.max_in_flight)
+
+
+def run(args):
+    records = load_records(args.log, args.limit)
+    if not records:
+        print("기록이 없습니다.")
+        return
+    os.environ.pop("TRAFFIC_RECORD_PATH", None)   # 재생하면서 다시 기록하지 않도록
+
+    if args.url:
+        results, wall = asyncio.run(run_against(args.url, records, args))
+    else:
+        with stand_ins(args, prefix="bench_replay_"):
+            with quiet(args.verbose):
+                results, wall = asyncio.run(run_against("", records, args))
+
+    results.sort(key=lambda r: (r["t"], r["turn"]))
+    report_run(results, wall, records)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            for r in results:
+                f.write(json.dumps(r, ensure_ascii=False) + "\n")
+        print(f"   결과 저장: {args.out}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="/ai/query 트래픽 재생")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = sub.add_parser("run", help="기록 재생")
+    run_parser.add_argument("--log", required=True, help="TRAFFIC_RECORD_PATH 로 기록한 파일")
+    run_parser.add_argument("--speed", type=float, default=1.0, help="기록 속도 배수 (1=그대로, 0=간격 무시)")
+    run_parser.add_argument("--max-in-flight", type=int, default=64)
+    run_parser.add_argument("--limit", type=int, default=0, help="앞에서부터 N건만 재생")
+    run_parser.add_argument("--timeout", type=float, default=120)
+    run_parser.add_argument("--url", default="", help="떠 있는 서버로 보낼 때 (예: http://localhost:8001)")
+    run_parser.add_argument("--out", default="", help="요청별 결과 JSONL (compare 입력)")
+    add_stand_in_args(run_parser)
+
+    compare_parser = sub.add_parser("compare", help="두 재생 결과 비교")
+    compare_parser.add_argument("a")
+    compare_parser.add_argument("b")
+
+    args = parser.parse_args()
+    if args.command == "run":
+        run(args)
+    else:
+        compare(args.a, args.b)
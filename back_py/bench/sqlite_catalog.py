@@ -0,0 +1,308 @@
+import os
+import random
+import re
+import sqlite3
+import threading
+import time
+
+from app.services.product_classifier import classify_product, CLASSIFIED_COLUMNS
+
+# -------------------------------------
+# 🧪 SQLite 카탈로그 (MySQL 대역, 벤치마크용)
+# -------------------------------------
+# - make_catalog(n) : 크롤러 CONFIG 카테고리 비율대로 실제와 비슷한 이름/스펙/가격의 상품 n개 생성
+#                     (분류 컬럼 is_accessory / mem_gen / is_nvme / socket ... 은 적재 때와 같은 classify_product 로 계산)
+# - create_catalog_db(path, products) : product 테이블 생성 + 적재 (MySQL 과 같은 인덱스)
+# - install_sqlite_pool(path) : db_pool 의 공용 풀을 SQLite 어댑터로 교체
+#     → get_connection() / cursor(dictionary=True) / %s 파라미터 / pd.read_sql 이 그대로 동작
+
+# 크롤러 CONFIG 카테고리별 상품 비율 (목록 페이지 수 비례)
+CATEGORY_WEIGHTS = {
+    "CPU": 4, "RAM": 10, "VGA": 10, "MBoard_intel": 10, "MBoard_amd": 10, "SSD": 5, "HDD": 2,
+    "Power": 10, "Case": 10, "Cooler_Liquid": 5, "Cooler_Air": 5,
+}
+
+PRICE_RANGES = {
+    "CPU": (90000, 900000), "RAM": (25000, 400000), "VGA": (150000, 3500000),
+    "MBoard_intel": (80000, 700000), "MBoard_amd": (70000, 700000), "SSD": (40000, 500000),
+    "HDD": (50000, 400000), "Power": (40000, 400000), "Case": (30000, 300000),
+    "Cooler_Liquid": (60000, 400000), "Cooler_Air": (10000, 150000),
+}
+
+ACCESSORY_RATE = 0.04   # 부품 카테고리에 섞여 있는 주변기기(팬/케이블/방열판 등) 비율
+
+INTEL_CPUS = ["12400F", "12600K", "13400F", "13600K", "13700K", "14400F", "14600K", "14700K", "14900K"]
+INTEL_ULTRA = {"245K": 5, "265K": 7, "285K": 9}
+AMD_CPUS = ["5600", "5700X3D", "5800X", "7500F", "7600", "7700X", "7800X3D", "9600X", "9700X", "9800X3D"]
+INTEL_CHIPSETS = [("H610", "DDR4"), ("B660", "DDR4"), ("B760", "DDR5"), ("B760", "DDR4"), ("Z790", "DDR5"), ("B860", "DDR5"), ("Z890", "DDR5")]
+AMD_CHIPSETS = [("A520", "DDR4"), ("B550", "DDR4"), ("X570", "DDR4"), ("A620", "DDR5"), ("B650", "DDR5"), ("X670E", "DDR5"), ("B850", "DDR5")]
+BOARD_MAKERS = ["ASUS", "MSI", "GIGABYTE", "ASRock", "BIOSTAR"]
+GPU_MODELS = ["RTX 4060", "RTX 4060 Ti", "RTX 4070", "RTX 4070 SUPER", "RTX 5060", "RTX 5070", "RTX 5070 Ti", "RTX 5080", "RX 7600", "RX 7800 XT", "RX 9070 XT"]
+GPU_MAKERS = ["MSI", "GIGABYTE", "ZOTAC", "PALIT", "이엠텍", "갤럭시", "SAPPHIRE", "PowerColor"]
+ACCESSORY_NAMES = {
+    "VGA": ["그래픽카드 지지대", "VGA 쿨러 FAN", "PCIe 연장 CABLE"],
+    "CPU": ["CPU 쿨러 FAN 교체용", "CPU 팬 브라켓"],
+    "SSD": ["M.2 SSD 방열판", "NVMe 외장 케이스 ENCLOSURE"],
+    "RAM": ["메모리 방열판 HEATSINK"],
+}
+
+
+def _spec(rnd: random.Random, *fixed):
+    extra = [f"항목{j} 값{rnd.randint(1, 999)}" for j in range(rnd.randint(4, 16))]
+    return " / ".join(list(fixed) + extra)
+
+
+def _product_fields(category: str, rnd: random.Random, i: int):
+    """→ (이름, 스펙)"""
+    if category in ACCESSORY_NAMES and rnd.random() < ACCESSORY_RATE:
+        return f"{rnd.choice(ACCESSORY_NAMES[category])} {i}", _spec(rnd, "주변기기")
+
+    if category == "CPU":
+        kind = rnd.random()
+        if kind < 0.45:
+            model = rnd.choice(INTEL_CPUS)
+            return f"인텔 코어i{rnd.choice([5, 7, 9])}-{model[:2]}세대 {model} (정품) {i}", _spec(rnd, "인텔(소켓1700)", "DDR5, DDR4")
+        if kind < 0.55:
+            model = rnd.choice(list(INTEL_ULTRA))
+            return f"인텔 코어 울트라{INTEL_ULTRA[model]} 시리즈2 {model} (정품) {i}", _spec(rnd, "인텔(소켓1851)", "DDR5")
+        model = rnd.choice(AMD_CPUS)
+        socket, mem = ("AM4", "DDR4") if model.startswith("5") else ("AM5", "DDR5")
+        return f"AMD 라이젠{rnd.choice([5, 7, 9])}-{model[0]}세대 {model} (정품) {i}", _spec(rnd, f"AMD(소켓{socket})", mem)
+
+    if category in ("MBoard_intel", "MBoard_amd"):
+        chipset, mem = rnd.choice(INTEL_CHIPSETS if category == "MBoard_intel" else AMD_CHIPSETS)
+        suffix = f" {mem}" if mem == "DDR4" and chipset != "B660" else ""
+        platform = "인텔" if category == "MBoard_intel" else "AMD"
+        return f"{rnd.choice(BOARD_MAKERS)} PRO {chipset}M-A{suffix} {i}", _spec(rnd, f"{platform}({chipset})", f"{mem} 메모리", rnd.choice(["M-ATX", "ATX", "M-ITX"]))
+
+    if category == "RAM":
+        gen = rnd.choice(["DDR4", "DDR5", "DDR5"])
+        speed = rnd.choice([3200, 3600]) if gen == "DDR4" else rnd.choice([5600, 6000, 6400])
+        return f"{rnd.choice(['삼성전자', 'SK하이닉스', 'TeamGroup', 'G.SKILL'])} {gen}-{speed} ({rnd.choice([8, 16, 32])}GB) {i}", _spec(rnd, gen, f"{speed}MHz")
+
+    if category == "VGA":
+        return f"{rnd.choice(GPU_MAKERS)} {rnd.choice(GPU_MODELS)} {rnd.choice(['D6', 'D7', 'OC', 'GAMING'])} {i}", _spec(rnd, "GDDR6", "PCIe4.0")
+
+    if category == "SSD":
+        nvme = rnd.random() < 0.7
+        interface = "M.2 NVMe" if nvme else "SATA3"
+        return f"{rnd.choice(['삼성전자', 'WD', 'SK하이닉스', 'Crucial'])} {interface} SSD ({rnd.choice(['500GB', '1TB', '2TB'])}) {i}", _spec(rnd, "PCIe4.0 x4 (NVMe)" if nvme else "SATA 6Gb/s")
+
+    if category == "HDD":
+        return f"{rnd.choice(['Seagate', 'WD'])} BarraCuda HDD ({rnd.choice(['1TB', '2TB', '4TB'])}) {i}", _spec(rnd, "SATA 6Gb/s", "7200RPM")
+
+    if category == "Power":
+        watt = rnd.choice([500, 600, 700, 750, 850, 1000, 1200])
+        return f"{rnd.choice(['마이크로닉스', '시소닉', 'FSP', '잘만'])} {rnd.choice(['Classic II', 'FOCUS', 'Hydro'])} {watt}W 80PLUS {i}", _spec(rnd, f"정격 {watt}W", "ATX")
+
+    if category == "Case":
+        return f"{rnd.choice(['앱코', '리안리', 'NZXT', '다크플래쉬'])} 미들타워 케이스 {i}", _spec(rnd, rnd.choice(["ATX", "M-ATX"]))
+
+    if category == "Cooler_Liquid":
+        return f"{rnd.choice(['3RSYS', 'ARCTIC', 'DEEPCOOL'])} {rnd.choice([240, 280, 360])} 수랭 쿨러 {i}", _spec(rnd, "수랭", "LGA1700, AM5")
+
+    return f"{rnd.choice(['쿨러마스터', 'DEEPCOOL', '써멀라이트'])} 타워형 공랭 쿨러 {i}", _spec(rnd, "공랭", "LGA1700, AM5")
+
+
+def make_catalog(n: int, seed: int = 11):
+    rnd = random.Random(seed)
+    categories, weights = zip(*CATEGORY_WEIGHTS.items())
+    products = []
+    for i in range(n):
+        category = rnd.choices(categories, weights)[0]
+        name, spec = _product_fields(category, rnd, i)
+        lo, hi = PRICE_RANGES[category]
+        product = {
+            "id": i + 1,
+            "fingerprint": f"{i:032x}",
+            "name": name,
+            "category": category,
+            "spec": spec,
+            "price": int(rnd.uniform(lo, hi)) // 100 * 100,
+            "capacity": "N/A",
+            "link": f"https://prod.danawa.com/info/?pcode={100000 + i}",
+        }
+        product.update(classify_product(product))
+        products.append(product)
+    return products
+
+
+# -------------------------------------
+# 🗄️ 테이블 생성 / 적재
+# -------------------------------------
+SCHEMA_SQL = """
+CREATE TABLE product (
+    id INTEGER PRIMARY KEY,
+    fingerprint TEXT UNIQUE,
+    name TEXT NOT NULL,
+    category TEXT NOT NULL,
+    spec TEXT,
+    price INTEGER,
+    capacity TEXT,
+    link TEXT,
+    source TEXT DEFAULT 'danawa',
+    updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    is_accessory INTEGER NOT NULL DEFAULT 0,
+    mem_gen TEXT NOT NULL DEFAULT '',
+    is_nvme INTEGER NOT NULL DEFAULT 0,
+    socket TEXT NOT NULL DEFAULT '',
+    chipset TEXT NOT NULL DEFAULT '',
+    storage_if TEXT NOT NULL DEFAULT '',
+    wattage INTEGER NOT NULL DEFAULT 0,
+    form_factor TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX idx_category_price ON product (category, price);
+CREATE INDEX idx_name ON product (name);
+"""
+
+PRODUCT_COLUMNS = ["id", "fingerprint", "name", "category", "spec", "price", "capacity", "link", *CLASSIFIED_COLUMNS]
+
+
+def create_catalog_db(path: str, products):
+    if os.path.exists(path):
+        os.remove(path)
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA_SQL)
+    conn.executemany(
+        f"INSERT INTO product ({', '.join(PRODUCT_COLUMNS)}) VALUES ({', '.join('?' * len(PRODUCT_COLUMNS))})",
+        [tuple(p[col] for col in PRODUCT_COLUMNS) for p in products]
+    )
+    conn.commit()
+    conn.close()
+
+
+# -------------------------------------
+# 🔌 mysql.connector 모양의 어댑터
+# -------------------------------------
+_PARAM = re.compile(r"%s")
+
+
+class SQLiteCursor:
+    def __init__(self, raw_cursor, dictionary: bool = False):
+        self._cursor = raw_cursor
+        self.dictionary = dictionary
+
+    def execute(self, sql, params=()):
+        self._cursor.execute(_PARAM.sub("?", sql), tuple(params or ()))
+        return self
+
+    def executemany(self, sql, seq_params):
+        self._cursor.executemany(_PARAM.sub("?", sql), [tuple(p) for p in seq_params])
+        return self
+
+    def _row(self, row):
+        if row is None or not self.dictionary:
+            return row
+        return {col[0]: value for col, value in zip(self._cursor.description, row)}
+
+    def fetchone(self):
+        return self._row(self._cursor.fetchone())
+
+    def fetchmany(self, size: int = 1):
+        return [self._row(row) for row in self._cursor.fetchmany(size)]
+
+    def fetchall(self):
+        return [self._row(row) for row in self._cursor.fetchall()]
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    def close(self):
+        self._cursor.close()
+
+
+class SQLiteConnection:
+    """PooledConnection 처럼 with 블록 / close() 로 반납 (실제 연결은 스레드별로 재사용)"""
+
+    def __init__(self, pool, raw):
+        self._pool = pool
+        self._raw = raw
+
+    def cursor(self, dictionary: bool = False, **kwargs):
+        return SQLiteCursor(self._raw.cursor(), dictionary)
+
+    def commit(self):
+        self._raw.commit()
+
+    def rollback(self):
+        self._raw.rollback()
+
+    @property
+    def in_transaction(self):
+        return self._raw.in_transaction
+
+    def invalidate(self):
+        self.rollback()
+
+    def close(self):
+        self._pool.release()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.rollback()
+        self.close()
+        return False
+
+
+class SQLitePool:
+    """db_pool.ConnectionPool 과 같은 acquire() / stats() 를 제공"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.created = 0
+        self.acquired = 0
+        self.in_use = 0
+
+    def acquire(self):
+        raw = getattr(self._local, "conn", None)
+        if raw is None:
+            raw = self._local.conn = sqlite3.connect(self.path, check_same_thread=False)
+            with self._lock:
+                self.created += 1
+        with self._lock:
+            self.acquired += 1
+            self.in_use += 1
+        return SQLiteConnection(self, raw)
+
+    def release(self):
+        with self._lock:
+            self.in_use -= 1
+
+    def stats(self):
+        with self._lock:
+            return {"backend": "sqlite", "path": self.path, "created": self.created, "acquired": self.acquired, "in_use": self.in_use}
+
+
+def install_sqlite_pool(path: str):
+    """app.services.db_pool 의 공용 풀을 SQLite 로 교체 (get_connection() 을 쓰는 코드는 수정 없음)"""
+    import warnings
+    from app.services import db_pool
+
+    # pandas 는 SQLAlchemy/sqlite3 가 아닌 DBAPI 연결에 경고만 하고 그대로 동작
+    warnings.filterwarnings("ignore", message="pandas only supports SQLAlchemy")
+    db_pool._pool = SQLitePool(path)
+    return db_pool._pool
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="벤치마크용 SQLite 카탈로그 생성")
+    parser.add_argument("path")
+    parser.add_argument("--products", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    create_catalog_db(args.path, make_catalog(args.products, args.seed))
+    print(f"✅ {args.products}개 상품 → {args.path} ({time.perf_counter() - started:.1f}s)")
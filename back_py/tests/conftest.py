@@ -0,0 +1,10 @@
+import os
+import sys
+import tempfile
+
+# back_py 를 루트로 app / bench 패키지 import
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# 서비스 모듈은 import 시점에 환경변수를 읽으므로 외부 서비스 없이 import 되도록 먼저 지정
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("CHROMA_PATH", os.path.join(tempfile.gettempdir(), "back_py_test_chroma"))
@@ -0,0 +1,110 @@
+import itertools
+
+import pytest
+
+from app.services import build_solver
+from app.services.build_solver import SLOT_ORDER, compatible, part_profile, solve_build
+
+
+def product(name, price, **extra):
+    return {"name": name, "price": price, "link": "", **extra}
+
+
+CATALOG = {
+    "cpu": [
+        product("AMD 라이젠7-6세대 9700X", 420000, socket="AM5"),
+        product("인텔 코어i5-14세대 14400F", 210000),
+        product("AMD 라이젠5-4세대 5600", 110000),
+    ],
+    "mboard": [
+        product("ASUS PRIME B650M-A", 190000, category="mboard_amd", mem_gen="DDR5"),
+        product("MSI B760M 박격포", 180000, category="mboard_intel", mem_gen="DDR5"),
+        product("ASRock B550M Pro4", 110000, category="mboard_amd", mem_gen="DDR4"),
+    ],
+    "ram": [
+        product("삼성 DDR5-5600 32GB", 120000, mem_gen="DDR5"),
+        product("삼성 DDR4-3200 16GB", 45000, mem_gen="DDR4"),
+    ],
+    "gpu": [product("RTX 4070", 800000), product("RTX 4060", 400000)],
+    "ssd": [product("SSD 1TB", 90000)],
+    "power": [product("파워 750W", 100000)],
+    "cooler": [product("쿨러", 30000, category="Cooler_Air")],
+    "case": [product("케이스", 60000)],
+}
+
+
+def brute_force(hint_products, budget):
+    """모든 조합 중 (점수 최대, 같으면 총액 최소)"""
+    candidates = build_solver.build_candidates(hint_products, budget)
+    slots = [key for key in SLOT_ORDER if key in candidates]
+    best = None
+    for combo in itertools.product(*(candidates[key] for key in slots)):
+        cost = sum(price for price, _, _ in combo)
+        if cost > budget:
+            continue
+        chosen = {}
+        ok = True
+        for key, (_, _, profile) in zip(slots, combo):
+            if not compatible(key, profile, chosen):
+                ok = False
+                break
+            chosen[key] = profile
+        if not ok:
+            continue
+        score = sum(build_solver.SLOT_WEIGHTS[key] * price for key, (price, _, _) in zip(slots, combo))
+        if best is None or (score, -cost) > (best[0], -best[1]):
+            best = (score, cost, {key: item["name"] for key, (_, item, _) in zip(slots, combo)})
+    return best
+
+
+@pytest.mark.parametrize("budget", [1000000, 1500000, 2000000])
+def test_matches_brute_force_on_small_catalog(budget):
+    estimate, info = solve_build(CATALOG, budget)
+    expected = brute_force(CATALOG, budget)
+
+    assert info["within_budget"]
+    assert estimate["total_price"] == expected[1] <= budget
+    assert {key: estimate[key]["name"] for key in expected[2]} == expected[2]
+
+
+def test_picks_are_compatible():
+    estimate, _ = solve_build(CATALOG, 2000000)
+    cpu = part_profile("cpu", next(p for p in CATALOG["cpu"] if p["name"] == estimate["cpu"]["name"]))
+    board = part_profile("mboard", next(p for p in CATALOG["mboard"] if p["name"] == estimate["mboard"]["name"]))
+    ram = part_profile("ram", next(p for p in CATALOG["ram"] if p["name"] == estimate["ram"]["name"]))
+
+    assert cpu["socket"] == board["socket"] and cpu["brand"] == board["brand"]
+    assert board["mem_gen"] == ram["mem_gen"]
+
+
+def test_equal_score_prefers_cheaper_combination(monkeypatch):
+    # cpu 0.5 × 200000 + gpu 200000 = cpu 0.5 × 100000 + gpu 250000 → 같은 점수면 싼 쪽
+    monkeypatch.setattr(build_solver, "get_price_window", lambda key, budget: (0, 10 ** 9))
+    monkeypatch.setattr(build_solver, "SLOT_WEIGHTS", {"cpu": 0.5, "gpu": 1.0})
+    hint_products = {
+        "cpu": [product("CPU A", 200000), product("CPU B", 100000)],
+        "gpu": [product("GPU A", 150000), product("GPU B", 200000), product("GPU C", 250000)],
+    }
+
+    estimate, info = solve_build(hint_products, 400000)
+
+    assert (estimate["cpu"]["name"], estimate["gpu"]["name"]) == ("CPU B", "GPU C")
+    assert estimate["total_price"] == 350000
+    assert info["missing_slots"] == [key for key in SLOT_ORDER if key not in hint_products]
+
+
+def test_over_budget_falls_back_to_cheapest_compatible_build(monkeypatch):
+    monkeypatch.setattr(build_solver, "get_price_window", lambda key, budget: (0, 10 ** 9))
+    hint_products = {key: CATALOG[key] for key in ("cpu", "mboard", "ram")}
+
+    estimate, info = solve_build(hint_products, 100000)
+
+    assert not info["within_budget"]
+    assert [estimate[key]["name"] for key in ("cpu", "mboard", "ram")] == [
+        "AMD 라이젠5-4세대 5600", "ASRock B550M Pro4", "삼성 DDR4-3200 16GB",
+    ]
+    assert estimate["total_price"] == 265000
+
+
+def test_no_candidates_returns_none():
+    assert solve_build({}, 1000000)[0] is None
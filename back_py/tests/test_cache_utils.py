@@ -0,0 +1,59 @@
+from app.services import cache_utils
+from app.services.cache_utils import LRUCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(cache_utils.time, "monotonic", clock)
+    cache = LRUCache(maxsize=4, ttl=10)
+
+    cache.set("a", 1)
+    clock.now += 9.9
+    assert cache.get("a") == 1
+
+    clock.now += 0.2
+    assert cache.get("a", "expired") == "expired"
+    assert len(cache) == 0   # 만료된 항목은 조회 시 제거
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_set_refreshes_ttl(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(cache_utils.time, "monotonic", clock)
+    cache = LRUCache(ttl=10)
+
+    cache.set("a", 1)
+    clock.now += 8
+    cache.set("a", 2)
+    clock.now += 8
+    assert cache.get("a") == 2
+
+
+def test_without_ttl_entries_never_expire(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(cache_utils.time, "monotonic", clock)
+    cache = LRUCache()
+
+    cache.set("a", 1)
+    clock.now += 10 ** 9
+    assert cache.get("a") == 1
+
+
+def test_least_recently_used_is_evicted_first():
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
@@ -0,0 +1,65 @@
+from app.services.prompt_builder import CandidateTable, build_candidate_table
+
+
+def product(name, price, **extra):
+    return {"name": name, "price": price, "link": f"https://example.com/{name}", **extra}
+
+
+def hint_products():
+    return {
+        "cpu": [product(f"CPU {i}", 200000 + i, socket="AM5") for i in range(6)],
+        "gpu": [product(f"GPU {i}", 400000 + i) for i in range(2)],
+        "ram": [product("RAM 0", 60000, mem_gen="DDR5")],
+    }
+
+
+def test_ids_are_short_per_slot_and_duplicates_reuse_the_id():
+    table = CandidateTable()
+    assert table.add("cpu", product("A", 1)) == "C1"
+    assert table.add("cpu", product("B", 2)) == "C2"
+    assert table.add("cpu", product("A", 3)) == "C1"
+    assert table.add("gpu", product("A", 1)) == "G1"
+    assert table.add("unknown", product("A", 1)) is None
+    assert table.add("cpu", {"price": 1}) is None
+    assert "C1|A|1|-" in table.render()
+
+
+def test_trim_drops_lowest_priority_rows_of_the_largest_slot():
+    table, _ = build_candidate_table(hint_products(), budget=10 ** 6)
+    full = table.tokens()
+    last_cpu = table.rows["cpu"][-1]
+
+    remaining = table.trim(full - 1)
+
+    assert remaining < full and remaining == table.tokens()
+    assert table.trimmed == 1
+    assert last_cpu not in table.rows["cpu"] and last_cpu[0] not in table.by_id
+    assert len(table.rows["gpu"]) == 2
+
+
+def test_trim_keeps_pinned_rows_and_one_row_per_slot():
+    previous = {"cpu": product("CPU 5", 200005, socket="AM5"), "gpu": product("OLD GPU", 1)}
+    table, refs = build_candidate_table(hint_products(), pinned_estimates=[previous], budget=0)
+
+    assert refs == [{"cpu": {"id": "C1"}, "gpu": {"id": "G1"}}]
+    assert [row[1]["name"] for row in table.rows["cpu"]] == ["CPU 5"]
+    assert [row[1]["name"] for row in table.rows["gpu"]] == ["OLD GPU"]
+    assert [row[1]["name"] for row in table.rows["ram"]] == ["RAM 0"]
+
+
+def test_resolve_maps_ids_back_to_products():
+    table, _ = build_candidate_table(hint_products(), budget=10 ** 6)
+    parsed = {
+        "cpu": {"id": "C2"},
+        "gpu": "G1",
+        "ram": {"id": "R9", "name": "모르는 id"},
+        "total_price": 123,
+    }
+
+    resolved = table.resolve(parsed)
+
+    assert resolved["cpu"] == {"name": "CPU 1", "price": 200001, "link": "https://example.com/CPU 1"}
+    assert resolved["gpu"]["name"] == "GPU 0"
+    assert resolved["ram"] == {"id": "R9", "name": "모르는 id"}   # 표에 없는 id 는 그대로
+    assert resolved["total_price"] == 123
+    assert table.resolve(None) == {}
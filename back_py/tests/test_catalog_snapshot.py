@@ -0,0 +1,89 @@
+import time
+
+import pytest
+
+from app.services import catalog_snapshot
+from app.services.catalog_snapshot import CatalogSnapshot
+
+
+def _row(id_, category, price, **extra):
+    return dict({"id": id_, "name": f"{category}-{id_}", "category": category, "price": price,
+                 "link": "", "spec": "", "is_accessory": 0, "mem_gen": "", "is_nvme": 0}, **extra)
+
+
+def test_mixed_case_categories_in_case_insensitive_order():
+    # utf8mb4_0900_ai_ci 의 ORDER BY category 순서: Case < Cooler_Liquid < CPU < RAM
+    rows = [
+        _row(1, "Case", 50000), _row(2, "Case", 90000),
+        _row(3, "Cooler_Liquid", 120000),
+        _row(4, "CPU", 200000), _row(5, "CPU", 300000), _row(6, "CPU", 400000),
+        _row(7, "RAM", 80000),
+    ]
+    snapshot = CatalogSnapshot(rows)
+
+    assert [item["price"] for item in snapshot.query("CPU", k=10)] == [200000, 300000, 400000]
+    assert [item["name"] for item in snapshot.query("Case", k=10)] == ["Case-1", "Case-2"]
+    assert [item["name"] for item in snapshot.query("Cooler_Liquid", k=10)] == ["Cooler_Liquid-3"]
+    assert snapshot.stats()["categories"] == {"CPU": 3, "Case": 2, "Cooler_Liquid": 1, "RAM": 1}
+
+
+def test_price_window_and_flags():
+    rows = [
+        _row(1, "RAM", 50000, mem_gen="DDR4"),
+        _row(2, "RAM", 70000, mem_gen="DDR5"),
+        _row(3, "RAM", 90000, mem_gen="DDR5", is_accessory=1),
+        _row(4, "RAM", 120000, mem_gen="DDR5"),
+    ]
+    snapshot = CatalogSnapshot(list(reversed(rows)))
+
+    assert [i["price"] for i in snapshot.query("RAM", min_price=60000, max_price=100000)] == [70000, 90000]
+    assert [i["price"] for i in snapshot.query("RAM", k=2, descending=True)] == [120000, 90000]
+    from app.services.catalog_snapshot import FLAG_ACCESSORY, FLAG_DDR5
+    picked = snapshot.query("RAM", require_flags=FLAG_DDR5, exclude_flags=FLAG_ACCESSORY)
+    assert [i["price"] for i in picked] == [70000, 120000]
+    assert snapshot.query("VGA") == []
+
+
+def test_rows_carry_parsed_columns_not_spec_text():
+    snapshot = CatalogSnapshot([_row(1, "CPU", 200000, spec="아주 긴 스펙 본문 " * 100, socket="AM5")])
+
+    (item,) = snapshot.query("CPU")
+    assert "spec" not in item
+    assert item["socket"] == "AM5"
+
+
+@pytest.fixture
+def reload_state(monkeypatch):
+    version = {"value": 1}
+    monkeypatch.setattr(catalog_snapshot, "get_catalog_version", lambda: version["value"])
+    monkeypatch.setattr(catalog_snapshot, "_snapshot", None)
+    monkeypatch.setattr(catalog_snapshot, "_retry_after", 0.0)
+    return version
+
+
+def test_failed_load_is_not_retried_until_the_cooldown_passes(monkeypatch, reload_state):
+    loads = []
+
+    def failing_load(version):
+        loads.append(version)
+        raise RuntimeError("db down")
+
+    monkeypatch.setattr(catalog_snapshot, "load_snapshot", failing_load)
+
+    assert catalog_snapshot.get_catalog_snapshot() is None   # → 호출한 쪽은 SQL 로
+    assert catalog_snapshot.get_catalog_snapshot() is None
+    assert loads == [1]
+    assert catalog_snapshot._retry_after > time.monotonic() + catalog_snapshot.SNAPSHOT_RETRY_SECONDS - 5
+
+    monkeypatch.setattr(catalog_snapshot, "_retry_after", 0.0)   # 쿨다운 경과
+    monkeypatch.setattr(catalog_snapshot, "load_snapshot", lambda version: CatalogSnapshot([_row(1, "CPU", 1)], version))
+    assert catalog_snapshot.get_catalog_snapshot().version == 1
+
+
+def test_failed_reload_keeps_serving_the_previous_snapshot(monkeypatch, reload_state):
+    previous = CatalogSnapshot([_row(1, "CPU", 1)], version=1)
+    monkeypatch.setattr(catalog_snapshot, "_snapshot", previous)
+    monkeypatch.setattr(catalog_snapshot, "load_snapshot", lambda version: (_ for _ in ()).throw(RuntimeError("db down")))
+
+    reload_state["value"] = 2
+    assert catalog_snapshot.get_catalog_snapshot() is previous
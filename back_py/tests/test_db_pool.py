@@ -0,0 +1,88 @@
+import threading
+import time
+
+import pytest
+
+from app.services import db_pool
+
+
+class FakeRaw:
+    in_transaction = False
+
+    def ping(self, reconnect=False):
+        pass
+
+    def close(self):
+        pass
+
+    def rollback(self):
+        pass
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    monkeypatch.setattr(db_pool.mysql.connector, "connect", lambda **config: FakeRaw())
+    return db_pool.ConnectionPool(size=1, timeout=5, recycle=0, pre_ping=False, host="test")
+
+
+def _acquire_in_thread(pool):
+    result = {}
+
+    def run():
+        started = time.monotonic()
+        conn = pool.acquire()
+        result["waited"] = time.monotonic() - started
+        conn.close()
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread, result
+
+
+def test_waiter_opens_new_connection_when_broken_one_is_discarded(pool):
+    conn = pool.acquire()
+    thread, result = _acquire_in_thread(pool)
+    time.sleep(0.1)
+
+    conn.invalidate()
+    conn.close()   # 버림 → 자리가 생기면 대기자가 바로 새로 연결
+    thread.join(timeout=2)
+
+    assert not thread.is_alive()
+    assert result["waited"] < 1
+    assert pool.stats()["created"] == 2 and pool.stats()["discarded"] == 1
+
+
+def test_waiter_reuses_returned_connection(pool):
+    conn = pool.acquire()
+    thread, result = _acquire_in_thread(pool)
+    time.sleep(0.1)
+    conn.close()
+    thread.join(timeout=2)
+
+    assert result["waited"] < 1
+    assert pool.stats()["created"] == 1
+
+
+def test_timeout_when_pool_stays_full(pool):
+    pool.timeout = 0.2
+    conn = pool.acquire()
+    with pytest.raises(db_pool.errors.PoolError):
+        pool.acquire()
+    assert pool.stats()["timeouts"] == 1
+    conn.close()
+
+
+def test_pool_stats_are_served_under_admin(monkeypatch):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from app.routers import admin_router, data_router
+
+    monkeypatch.setattr(admin_router, "pool_stats", lambda: {"in_use": 1})
+    app = FastAPI()
+    app.include_router(data_router.router, prefix="/data")
+    app.include_router(admin_router.router, prefix="/admin")
+    http = TestClient(app)
+
+    assert http.get("/admin/pool").json() == {"in_use": 1}
+    assert http.get("/data/pool").status_code == 404
@@ -0,0 +1,94 @@
+import os
+import sys
+from contextlib import contextmanager
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app", "crawler"))
+
+from app.crawler import db_utils
+
+
+class FakeCursor:
+    """save_many_to_mysql 이 쓰는 SELECT ... IN / executemany(UPSERT) 만 흉내 (fingerprint → 행)"""
+
+    def __init__(self, table, fail_on=None):
+        self.table = table
+        self.fail_on = fail_on
+        self.result = []
+
+    def execute(self, sql, params):
+        assert sql.lstrip().startswith("SELECT fingerprint, spec, price, capacity")
+        self.result = [(fp, *self.table[fp]) for fp in params if fp in self.table]
+
+    def fetchall(self):
+        return self.result
+
+    def executemany(self, sql, rows):
+        if self.fail_on and any(row[0] == self.fail_on for row in rows):
+            raise RuntimeError("deadlock")
+        for row in rows:
+            self.table[row[0]] = (row[3], row[4], row[5], *row[8:])   # spec, price, capacity, 분류 컬럼
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self.commits = self.rollbacks = 0
+
+    def cursor(self):
+        return self._cursor
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+@pytest.fixture
+def db(monkeypatch):
+    table = {}
+    state = {"fail_on": None, "conn": None}
+
+    @contextmanager
+    def fake_connection():
+        state["conn"] = FakeConnection(FakeCursor(table, state["fail_on"]))
+        yield state["conn"]
+
+    monkeypatch.setattr(db_utils, "get_connection", fake_connection)
+    state["table"] = table
+    return state
+
+
+def product(id_, price=100000, spec="AMD(소켓AM5) / 6코어"):
+    return {"id": id_, "name": f"CPU {id_}", "category": "CPU", "spec": spec, "price": price, "capacity": None, "link": f"https://x/{id_}"}
+
+
+def test_counts_inserted_updated_and_unchanged(db):
+    assert db_utils.save_many_to_mysql([product("a"), product("b")]) == {"inserted": 2, "updated": 0, "unchanged": 0, "failed": 0}
+
+    stats = db_utils.save_many_to_mysql([product("a"), product("b", price=90000), product("c")])
+
+    assert stats == {"inserted": 1, "updated": 1, "unchanged": 1, "failed": 0}
+    assert db["table"]["b"][1] == 90000
+
+
+def test_duplicate_ids_in_a_chunk_keep_the_last_value(db):
+    stats = db_utils.save_many_to_mysql([product("a", price=1), product("a", price=2)])
+
+    assert stats["inserted"] == 1
+    assert db["table"]["a"][1] == 2
+
+
+def test_failed_chunk_is_rolled_back_and_counted(db):
+    db["fail_on"] = "bad"
+
+    stats = db_utils.save_many_to_mysql([product("a"), product("bad"), product("c")], chunk_size=2)
+
+    assert stats == {"inserted": 1, "updated": 0, "unchanged": 0, "failed": 2}
+    assert db["conn"].rollbacks == 1 and db["conn"].commits == 1
+    assert set(db["table"]) == {"c"}
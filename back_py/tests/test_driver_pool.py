@@ -0,0 +1,76 @@
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app", "crawler"))
+
+from app.crawler import crawler
+
+
+class FakeDriver:
+    def __init__(self, n):
+        self.n = n
+        self.quit_called = False
+
+    def quit(self):
+        self.quit_called = True
+
+
+@pytest.fixture
+def drivers(monkeypatch):
+    created = []
+
+    def init_driver():
+        created.append(FakeDriver(len(created)))
+        return created[-1]
+
+    monkeypatch.setattr(crawler, "init_driver", init_driver)
+    return created
+
+
+def test_reuses_idle_drivers_up_to_size(drivers):
+    pool = crawler.DriverPool(2)
+    a, b = pool.acquire(), pool.acquire()
+    pool.release(a)
+
+    assert pool.acquire() is a
+    assert len(drivers) == 2
+
+    pool.release(a)
+    pool.release(b)
+    pool.quit_all()
+    assert all(d.quit_called for d in drivers)
+
+
+def test_waiter_gets_released_driver(drivers):
+    pool = crawler.DriverPool(1)
+    held = pool.acquire()
+    got = []
+    waiter = threading.Thread(target=lambda: got.append(pool.acquire()))
+    waiter.start()
+    waiter.join(0.1)
+    assert waiter.is_alive()   # 자리가 없으니 대기
+
+    pool.release(held)
+    waiter.join(2)
+    assert got == [held] and len(drivers) == 1
+
+
+def test_failed_creation_frees_the_slot(monkeypatch, drivers):
+    def crash():
+        raise RuntimeError("chrome crashed")
+
+    pool = crawler.DriverPool(1)
+    monkeypatch.setattr(crawler, "init_driver", crash)
+    with pytest.raises(RuntimeError):
+        pool.acquire()
+
+    # 예약했던 자리가 풀려서 다음 호출은 새로 만들 수 있어야 함 (예전에는 영원히 대기)
+    monkeypatch.setattr(crawler, "init_driver", lambda: FakeDriver(99))
+    result = []
+    t = threading.Thread(target=lambda: result.append(pool.acquire()))
+    t.start()
+    t.join(2)
+    assert not t.is_alive() and result[0].n == 99
@@ -0,0 +1,97 @@
+import pytest
+import redis
+
+from app.services import embedding_cache
+from bench.fake_redis import FakeRedis
+
+
+class CountingRedis(FakeRedis):
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+
+    def get(self, key):
+        self.calls.append("get")
+        return super().get(key)
+
+    def mget(self, keys, *args):
+        self.calls.append("mget")
+        return super().mget(keys, *args)
+
+
+class BrokenRedis:
+    def mget(self, keys, *args):
+        raise redis.ConnectionError("down")
+
+    def pipeline(self, transaction=True):
+        raise redis.ConnectionError("down")
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    client = CountingRedis()
+    monkeypatch.setattr(embedding_cache, "_redis", client)
+    monkeypatch.setattr(embedding_cache, "_stats", {"redis_hits": 0, "misses": 0, "api_calls": 0, "redis_errors": 0})
+    embedding_cache.clear_memory()
+    yield client
+    embedding_cache.clear_memory()
+
+
+def fake_fetch(batches):
+    def fetch_many(texts):
+        batches.append(list(texts))
+        return [[float(len(t)), 0.5] for t in texts]
+    return fetch_many
+
+
+def test_one_mget_for_all_memory_misses(cache):
+    model = "m"
+    embedding_cache.get_cached_embeddings(["in redis"], model, fake_fetch([]))
+    embedding_cache.clear_memory()                                      # Redis 에만 남김
+    embedding_cache.get_cached_embeddings(["in memory"], model, fake_fetch([]))
+    cache.calls.clear()
+
+    batches = []
+    texts = ["in memory", "in redis", "new one", "new  one", "another"]
+    result = embedding_cache.get_cached_embeddings(texts, model, fake_fetch(batches))
+
+    assert cache.calls == ["mget"]                    # 문장별 GET 없음
+    assert batches == [["new one", "another"]]        # 정규화 후 같은 문장은 한 번만
+    assert result[2] == result[3] == [7.0, 0.5]
+    assert result[1] == [8.0, 0.5]
+
+    stats = embedding_cache.cache_stats()
+    assert stats["redis_hits"] == 1
+    assert stats["misses"] == 2 + 3 and stats["api_calls"] == 3       # 앞선 두 호출의 미스 2 포함
+
+
+def test_misses_count_texts_not_requests(cache):
+    embedding_cache.get_cached_embeddings(["a", "b", "c"], "m", fake_fetch([]))
+    stats = embedding_cache.cache_stats()
+    assert stats["misses"] == 3 and stats["api_calls"] == 1
+
+
+def test_fetched_embeddings_are_written_back_to_redis(cache):
+    embedding_cache.get_cached_embeddings(["a", "bb"], "m", fake_fetch([]))
+    embedding_cache.clear_memory()
+
+    batches = []
+    assert embedding_cache.get_cached_embeddings(["bb", "a"], "m", fake_fetch(batches)) == [[2.0, 0.5], [1.0, 0.5]]
+    assert batches == []
+
+
+def test_redis_outage_falls_back_to_api(monkeypatch, cache):
+    monkeypatch.setattr(embedding_cache, "_redis", BrokenRedis())
+    batches = []
+    assert embedding_cache.get_cached_embeddings(["a"], "m", fake_fetch(batches)) == [[1.0, 0.5]]
+    assert batches == [["a"]]
+    assert embedding_cache.cache_stats()["redis_errors"] == 2   # 조회 1 + 저장 1
+
+
+def test_short_fetch_result_raises_and_caches_nothing(cache):
+    with pytest.raises(ValueError):
+        embedding_cache.get_cached_embeddings(["a", "bb"], "m", lambda texts: [[1.0, 0.5]])
+
+    batches = []
+    assert embedding_cache.get_cached_embeddings(["a", "bb"], "m", fake_fetch(batches)) == [[1.0, 0.5], [2.0, 0.5]]
+    assert batches == [["a", "bb"]]   # 앞선 실패에서 아무것도 남지 않음
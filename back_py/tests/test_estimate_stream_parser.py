@@ -0,0 +1,56 @@
+import json
+
+import pytest
+
+from app.services.ai_service import EstimateStreamParser
+
+ESTIMATE = {
+    "cpu": {"name": "인텔 코어i5-14세대 14400F", "price": 215000, "reason": "가성비 \"최고\" {게임용}"},
+    "gpu": {"name": "RTX 4060 \\ 8GB", "price": 399000, "reason": "1080p }"},
+    "total_price": 614000,
+    "summary": "{cpu} 와 gpu 조합",
+}
+RAW = "```json\n" + json.dumps(ESTIMATE, ensure_ascii=False, indent=2) + "\n```"
+
+
+def feed_all(chunks):
+    parser = EstimateStreamParser()
+    found = []
+    for chunk in chunks:
+        found.extend(parser.feed(chunk))
+    return found
+
+
+def expected_parts():
+    return [("cpu", ESTIMATE["cpu"]), ("gpu", ESTIMATE["gpu"])]
+
+
+def test_whole_text_at_once():
+    assert feed_all([RAW]) == expected_parts()
+
+
+def test_one_character_per_chunk():
+    assert feed_all(list(RAW)) == expected_parts()
+
+
+@pytest.mark.parametrize("size", [2, 3, 5, 7, 16])
+def test_fixed_size_chunks(size):
+    assert feed_all([RAW[i:i + size] for i in range(0, len(RAW), size)]) == expected_parts()
+
+
+def test_every_two_way_split():
+    # 문자열 안의 따옴표/역슬래시/중괄호 직후에서 잘려도 같은 결과
+    for cut in range(1, len(RAW)):
+        assert feed_all([RAW[:cut], RAW[cut:]]) == expected_parts(), cut
+
+
+def test_part_is_reported_on_the_chunk_that_closes_it():
+    parser = EstimateStreamParser()
+    close = RAW.index("\n  }") + 4   # cpu 객체를 닫는 중괄호 (문자열 안의 } 는 제외)
+    assert parser.feed(RAW[:close - 1]) == []
+    assert parser.feed(RAW[close - 1:close]) == [("cpu", ESTIMATE["cpu"])]
+
+
+def test_broken_object_is_skipped():
+    parser = EstimateStreamParser()
+    assert parser.feed('{"cpu": {"name": "A", "price": }, "gpu": {"name": "B"}}') == [("gpu", {"name": "B"})]
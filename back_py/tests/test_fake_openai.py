@@ -0,0 +1,10 @@
+from bench import fake_openai
+
+
+def test_fake_embedding_reads_dims_at_call_time(monkeypatch):
+    monkeypatch.setattr(fake_openai, "FAKE_DIMS", 256)
+    vec = fake_openai.fake_embedding("CPU 게임 고성능")
+    assert len(vec) == 256
+    assert abs(sum(v * v for v in vec) - 1.0) < 1e-9
+    assert vec == fake_openai.fake_embedding("CPU 게임 고성능")
+    assert len(fake_openai.fake_embedding("x", dims=8)) == 8
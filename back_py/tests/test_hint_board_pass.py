@@ -0,0 +1,68 @@
+import pytest
+
+from app.services import data_service
+
+CPUS = [
+    {"name": f"라이젠 {i}", "category": "CPU", "price": 300000 + i, "socket": "AM5"} for i in range(3)
+]
+BOARDS = {
+    "MBoard_amd": [
+        {"name": "B650M", "category": "MBoard_amd", "price": 180000, "socket": "AM5"},
+        {"name": "B550M", "category": "MBoard_amd", "price": 120000, "socket": "AM4"},
+        {"name": "A620M", "category": "MBoard_amd", "price": 110000, "socket": "AM5"},
+        {"name": "X670E", "category": "MBoard_amd", "price": 400000, "socket": "AM5"},
+    ],
+    "MBoard_intel": [
+        {"name": "B760M", "category": "MBoard_intel", "price": 170000, "socket": "LGA1700"},
+    ],
+}
+
+
+def canned(cat):
+    if cat == "CPU": return CPUS
+    if cat in BOARDS: return BOARDS[cat]
+    return [{"name": f"{cat} {i}", "category": cat, "price": 100000 + i} for i in range(3)]
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    calls = []
+
+    def fake_batch(requests, concurrency=1, timeout=None, errors=None):
+        calls.append(requests)
+        return [canned(req["category_filter"]) for req in requests]
+
+    def fake_search(cat, query_text, min_p, max_p, keyword_filter=None, query_embedding=None, errors=None, sockets=None, n_results=8):
+        calls.append([{"category_filter": cat, "sockets": sockets, "n_results": n_results}])
+        return canned(cat)
+
+    monkeypatch.setattr(data_service, "get_openai_embeddings", lambda texts: [[0.0] * 4 for _ in texts])
+    monkeypatch.setattr(data_service, "get_chroma_products_batch", fake_batch)
+    monkeypatch.setattr(data_service, "search_hint_category", fake_search)
+    monkeypatch.setattr(data_service, "get_mysql_products", lambda cat, limit=10: [])
+    return calls
+
+
+def retrieve(concurrency):
+    errors = []
+    result = data_service._retrieve_hint_products(2000000, "게임", "DDR5", "NVME", concurrency, 5, errors)
+    return result, errors
+
+
+def test_boards_are_searched_in_the_same_round_as_cpus(calls):
+    result, errors = retrieve(concurrency=8)
+
+    assert errors == []
+    assert len(calls) == 1   # 메인보드용 두 번째 검색 라운드 없음
+    boards = [req for req in calls[0] if req["category_filter"].startswith("MBoard")]
+    assert {req["category_filter"] for req in boards} == {"MBoard_amd", "MBoard_intel"}
+    assert all(req.get("sockets") is None and req["n_results"] == 8 * data_service.BOARD_OVERFETCH for req in boards)
+
+
+@pytest.mark.parametrize("concurrency", [1, 8])
+def test_boards_are_filtered_by_cpu_candidate_sockets(calls, concurrency):
+    result, _ = retrieve(concurrency)
+
+    # CPU 후보가 모두 AM5 → AM4 보드는 빠지고, 인텔 후보가 없으니 인텔 보드는 그대로
+    assert [b["name"] for b in result["mboard"]] == ["A620M", "B760M", "B650M", "X670E"]
+    assert list(result) == list(data_service.HINT_CATEGORIES)
@@ -0,0 +1,63 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import data_service
+
+
+@pytest.fixture
+def hints(monkeypatch):
+    calls = []
+    version = {"value": 1}
+
+    def fake_retrieve(total_budget, purpose, target_memory_type, ssd_type, concurrency, timeout, errors):
+        calls.append(total_budget)
+        if purpose == "실패":
+            errors.append("CPU 검색")
+        return {"cpu": [{"name": f"CPU v{version['value']}", "price": total_budget // 5}]}
+
+    monkeypatch.setattr(data_service, "_retrieve_hint_products", fake_retrieve)
+    monkeypatch.setattr(data_service, "get_catalog_version", lambda: version["value"])
+    monkeypatch.setattr(data_service, "HINT_CACHE_ENABLED", True)
+    monkeypatch.setattr(data_service, "HINT_BUDGET_BUCKET", 50000)
+    monkeypatch.setattr(data_service, "_hint_cache_version", {"version": None})
+    data_service.flush_hint_cache()
+    yield SimpleNamespace(calls=calls, version=version)
+    data_service.flush_hint_cache()
+
+
+def test_budgets_in_the_same_bucket_share_one_search(hints):
+    first = data_service.get_hint_products(1500000, "게임")
+    again = data_service.get_hint_products(1520000, "게임 ")
+
+    assert hints.calls == [1500000]
+    assert again == first
+    data_service.get_hint_products(1550000, "게임")
+    assert hints.calls == [1500000, 1550000]
+
+
+def test_hit_returns_a_copy(hints):
+    data_service.get_hint_products(1500000, "게임")["cpu"].clear()
+    assert data_service.get_hint_products(1500000, "게임")["cpu"]
+
+
+def test_catalog_version_bump_invalidates(hints):
+    data_service.get_hint_products(1500000, "게임")
+    hints.version["value"] = 2
+
+    result = data_service.get_hint_products(1500000, "게임")
+
+    assert hints.calls == [1500000, 1500000]
+    assert result["cpu"][0]["name"] == "CPU v2"
+
+
+def test_incomplete_results_are_not_cached(hints):
+    data_service.get_hint_products(1500000, "실패")
+    data_service.get_hint_products(1500000, "실패")
+    assert len(hints.calls) == 2
+
+
+def test_bucket_keeps_memory_and_ssd_thresholds():
+    assert data_service.bucket_budget(1299999) == 1250000
+    assert data_service.bucket_budget(1300000) == 1300000
+    assert data_service.bucket_budget(10000) == 50000
@@ -0,0 +1,62 @@
+import os
+
+import pytest
+
+from app.crawler.listing_parser import (
+    clean_capacity, parse_listing_html, parse_memory_price, parse_plain_price, stable_id_from_link,
+)
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "..", "app", "crawler", "fixtures", "danawa_list_snapshot.html")
+BASE_URL = "https://prod.danawa.com/list/"
+
+
+@pytest.fixture(scope="module")
+def page_source():
+    with open(FIXTURE, encoding="utf-8") as f:
+        return f.read()
+
+
+def test_plain_category_one_product_per_item(page_source):
+    products = parse_listing_html(page_source, "CPU", BASE_URL)
+
+    assert [(p["name"], p["price"], p["capacity"]) for p in products] == [
+        ("테스트 상품 1-1", 101000, "N/A"),
+        ("테스트 상품 1-2", 102000, "N/A"),
+        ("테스트 상품 1-3", 11500, "N/A"),
+    ]
+    assert products[0]["link"] == "https://prod.danawa.com/info/?pcode=101"
+    assert products[0]["spec"] == "소켓 LGA1700 / DDR5 / PCIe 5.0 / 페이지 1"
+    assert products[0]["id"] == stable_id_from_link(products[0]["link"], "CPU", "N/A", "테스트 상품 1-1")
+
+
+def test_memory_category_expands_capacity_variants(page_source):
+    products = parse_listing_html(page_source, "RAM", BASE_URL)
+    variants = [p for p in products if p["name"].startswith("테스트 상품 1-3")]
+
+    assert [(p["name"], p["capacity"], p["price"]) for p in variants] == [
+        ("테스트 상품 1-3 (16GB)", "16GB", 11500),
+        ("테스트 상품 1-3 (32GB)", "32GB", None),   # "가격비교예정" → 가격 없음
+    ]
+    assert variants[0]["link"] == "https://prod.danawa.com/info/?pcode=103&cap=16"
+    assert len({p["id"] for p in products}) == len(products)
+
+
+def test_ids_are_stable_across_parses(page_source):
+    first = [p["id"] for p in parse_listing_html(page_source, "RAM", BASE_URL)]
+    second = [p["id"] for p in parse_listing_html(page_source, "RAM", BASE_URL)]
+    assert first == second
+
+
+def test_items_without_name_are_skipped():
+    source = '<div class="main_prodlist"><ul class="product_list"><li class="prod_item"><p class="price_sect"><strong>1,000</strong></p></li></ul></div>'
+    assert parse_listing_html(source, "CPU") == []
+
+
+def test_price_and_capacity_helpers():
+    assert parse_plain_price("12,340원") == 12340
+    assert parse_plain_price("가격비교예정") is None
+    assert parse_plain_price(None) is None
+    assert parse_memory_price(" 1,000원 ") == 1000
+    assert parse_memory_price(None) is None
+    assert clean_capacity("RAM", "16GB 벌크") == ""
+    assert clean_capacity("HDD", "4TB, WD40EZAX") == "4TB"
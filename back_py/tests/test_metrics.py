@@ -0,0 +1,52 @@
+import pytest
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+import app.main
+from app.routers import data_router
+from app.services.metrics import count_db_query, stage
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+@pytest.fixture
+def http(monkeypatch):
+    def fake_fetch_page(fields=None, limit=100, **kwargs):
+        # 동기 라우트는 스레드풀에서 돌아도 요청별 타이밍(contextvars)에 기록되어야 함
+        with stage("test_listing"):
+            count_db_query("test_listing")
+        return {"items": [], "count": 0, "next_cursor": None}
+
+    monkeypatch.setattr(data_router, "fetch_page", fake_fetch_page)
+    return TestClient(app.main.app)   # with 블록 없이 → startup(스키마/backfill) 은 돌지 않음
+
+
+def test_debug_header_returns_server_timing_and_records_histograms(http):
+    stage_before = sample("estimate_stage_seconds_count", stage="test_listing")
+    http_before = sample("http_request_seconds_count", method="GET", route="/data/list", status="200")
+
+    res = http.get("/data/list", headers={"X-Debug-Timing": "1"})
+
+    assert res.status_code == 200
+    timing = res.headers["Server-Timing"]
+    assert "test_listing;dur=" in timing and 'db_queries;desc="1"' in timing and "total;dur=" in timing
+    assert sample("estimate_stage_seconds_count", stage="test_listing") == stage_before + 1
+    assert sample("db_queries_total", query="test_listing") >= 1
+    assert sample("http_request_seconds_count", method="GET", route="/data/list", status="200") == http_before + 1
+
+
+def test_no_server_timing_without_the_debug_header(http):
+    stage_before = sample("estimate_stage_seconds_count", stage="test_listing")
+
+    res = http.get("/data/list")
+
+    assert "Server-Timing" not in res.headers
+    assert sample("estimate_stage_seconds_count", stage="test_listing") == stage_before + 1   # 지표는 항상 기록
+
+
+def test_unmatched_paths_share_one_label(http):
+    before = sample("http_request_seconds_count", method="GET", route="unmatched", status="404")
+    http.get("/no/such/path/123")
+    assert sample("http_request_seconds_count", method="GET", route="unmatched", status="404") == before + 1
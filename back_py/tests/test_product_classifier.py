@@ -0,0 +1,67 @@
+import pytest
+
+from app.services.product_classifier import (
+    CLASSIFIED_COLUMNS, classification_where, classify_product, matches_classification,
+)
+
+
+def classify(category, name, spec=""):
+    return classify_product({"category": category, "name": name, "spec": spec})
+
+
+def test_result_has_exactly_the_classified_columns():
+    assert tuple(classify("CPU", "AMD 라이젠5 5600")) == CLASSIFIED_COLUMNS
+    assert tuple(classify("모르는카테고리", None)) == CLASSIFIED_COLUMNS
+
+
+@pytest.mark.parametrize("category, name, accessory", [
+    ("CPU", "써멀라이트 CPU 쿨러", 1),
+    ("CPU", "AMD 라이젠5 5600", 0),
+    ("VGA", "그래픽카드 지지대", 1),
+    ("SSD", "M.2 NVMe SSD 외장 케이스", 1),
+    ("RAM", "TeamGroup 방열판", 1),
+    ("Case", "NZXT H5 Flow 케이스", 0),   # 케이스 카테고리는 네거티브 키워드 없음
+])
+def test_accessories_are_flagged_per_part(category, name, accessory):
+    assert classify(category, name)["is_accessory"] == accessory
+
+
+@pytest.mark.parametrize("category, name, spec, mem_gen", [
+    ("RAM", "삼성전자 DDR5-5600 (16GB)", "", "DDR5"),
+    ("MBoard_intel", "MSI PRO B760M-A WIFI D4", "DDR5", "DDR4"),     # 이름의 D4 접미사가 스펙보다 우선
+    ("MBoard_intel", "ASUS PRIME B660M-K", "", "DDR4"),              # B660 + 표기 없음 → DDR4 모델
+    ("MBoard_intel", "ASUS PRIME B660M-K DDR5", "", "DDR5"),
+    ("MBoard_amd", "ASRock B650M Pro RS", "AMD(소켓AM5) / DDR5", "DDR5"),
+    ("MBoard_amd", "ASRock B650M-HDV/M.2", "", ""),
+    ("VGA", "RTX 4060 GDDR6", "DDR5", ""),                            # 메모리 관련 부품만
+])
+def test_mem_gen(category, name, spec, mem_gen):
+    assert classify(category, name, spec)["mem_gen"] == mem_gen
+
+
+def test_nvme_only_for_ssd():
+    assert classify("SSD", "삼성 990 PRO", "M.2 / NVMe")["is_nvme"] == 1
+    assert classify("SSD", "WD Blue SA510", "2.5형 / SATA3")["is_nvme"] == 0
+    assert classify("MBoard_amd", "B650M", "NVMe 슬롯 2개")["is_nvme"] == 0
+
+
+def test_where_clauses_and_dict_matching_agree():
+    ddr5_board = {"is_accessory": 0, "mem_gen": "DDR5", "socket": "AM5"}
+    unknown_board = {"is_accessory": 0, "mem_gen": "", "socket": ""}
+    ddr4_board = {"is_accessory": 0, "mem_gen": "DDR4", "socket": "AM4"}
+
+    assert classification_where("MBoard_amd", "DDR5", ["AM5"]) == [
+        {"mem_gen": {"$ne": "DDR4"}},
+        {"socket": {"$in": ["", "AM5"]}},
+    ]
+    assert matches_classification(ddr5_board, "MBoard_amd", "DDR5", ["AM5"])
+    assert matches_classification(unknown_board, "MBoard_amd", "DDR5", ["AM5"])   # 모르는 값은 허용
+    assert not matches_classification(ddr4_board, "MBoard_amd", "DDR5")
+    assert not matches_classification(ddr5_board, "MBoard_amd", None, ["AM4"])
+    assert matches_classification({"socket": None}, "MBoard_amd", None, ["AM4"])   # MySQL NULL 도 "모름"
+    assert not matches_classification(unknown_board, "MBoard_amd", "DDR4")
+
+    assert not matches_classification({"is_accessory": 1}, "VGA")
+    assert not matches_classification({"is_accessory": 0, "is_nvme": 0}, "SSD", "NVME")
+    assert matches_classification({"is_accessory": 0, "is_nvme": 0}, "SSD", None)
+    assert classification_where("Case") == []
@@ -0,0 +1,77 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.routers import data_router
+from app.services.product_listing import (
+    PAGE_MAX_LIMIT, ListingError, build_query, decode_cursor, encode_cursor, parse_fields,
+)
+
+COLUMNS = ["category", "price", "id", "name"]
+
+
+def test_query_without_cursor_orders_by_index():
+    sql, params = build_query(COLUMNS, category="CPU", min_price=1000, max_price=5000, limit=11)
+    assert sql == (
+        "SELECT category, price, id, name FROM product"
+        " WHERE category = %s AND price >= %s AND price <= %s"
+        " ORDER BY category, price, id LIMIT %s"
+    )
+    assert params == ["CPU", 1000, 5000, 11]
+
+
+def test_cursor_with_price_continues_after_last_key():
+    cursor = encode_cursor({"category": "CPU", "price": 150000, "id": 42})
+    sql, params = build_query(COLUMNS, cursor=cursor)
+    assert "WHERE (category > %s OR (category = %s AND (price > %s OR (price = %s AND id > %s))))" in sql
+    assert params == ["CPU", "CPU", 150000, 150000, 42]
+
+
+def test_cursor_in_null_price_section_moves_on_to_priced_rows():
+    # MySQL ASC 정렬에서 NULL 가격이 먼저 → 다음은 같은 카테고리의 NULL(id 순) 나머지 + 가격 있는 상품 전부
+    cursor = encode_cursor({"category": "RAM", "price": None, "id": 7})
+    sql, params = build_query(COLUMNS, category="RAM", cursor=cursor, limit=5)
+    assert "category = %s AND (category > %s OR (category = %s AND (price IS NOT NULL OR id > %s)))" in sql
+    assert params == ["RAM", "RAM", "RAM", 7, 5]
+
+
+def test_cursor_round_trip_and_rejects_garbage():
+    row = {"category": "메인보드", "price": None, "id": 3}
+    assert decode_cursor(encode_cursor(row)) == ("메인보드", None, 3)
+    for bad in ["not-a-cursor", encode_cursor({"category": 1, "price": 1, "id": 1}), "W10"]:
+        with pytest.raises(ListingError):
+            decode_cursor(bad)
+
+
+def test_parse_fields_always_includes_cursor_keys():
+    assert parse_fields("name,link")[:3] == ["category", "price", "id"]
+    assert "spec" not in parse_fields(None)
+    with pytest.raises(ListingError):
+        parse_fields("name,password")
+
+
+@pytest.fixture
+def client(monkeypatch):
+    calls = []
+
+    def fake_fetch_page(fields=None, limit=100, **kwargs):
+        calls.append(limit)
+        return {"items": [{"id": i} for i in range(limit)], "count": limit, "next_cursor": None}
+
+    monkeypatch.setattr(data_router, "fetch_page", fake_fetch_page)
+    app = FastAPI()
+    app.include_router(data_router.router, prefix="/data")
+    return TestClient(app), calls
+
+
+def test_legacy_list_clamps_instead_of_rejecting(client):
+    http, calls = client
+    res = http.get("/data/list", params={"limit": PAGE_MAX_LIMIT + 500})
+    assert res.status_code == 200
+    assert len(res.json()) == PAGE_MAX_LIMIT and calls == [PAGE_MAX_LIMIT]
+    assert res.headers["X-Limit-Clamped"] == f"{PAGE_MAX_LIMIT + 500}->{PAGE_MAX_LIMIT}"
+
+    res = http.get("/data/list")
+    assert res.json() == [{"id": i} for i in range(10)]
+    assert "X-Limit-Clamped" not in res.headers
+    assert http.get("/data/list", params={"limit": 0}).json() == []
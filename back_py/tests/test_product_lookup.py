@@ -0,0 +1,77 @@
+import pytest
+
+from app.services import db_pool, product_lookup
+from app.services.product_lookup import NameIndex, fuzzy_match, normalize_name
+from bench.sqlite_catalog import SQLitePool, create_catalog_db
+
+ROWS = [
+    {"name": "MSI 지포스 RTX 4060 Ti 벤투스 2X", "category": "VGA", "price": 560000, "link": "ti"},
+    {"name": "MSI 지포스 RTX 4060 벤투스 2X", "category": "VGA", "price": 420000, "link": "base"},
+    {"name": "삼성전자 DDR5-5600 (16GB)", "category": "RAM", "price": 60000, "link": "ram"},
+    {"name": "AMD 라이젠5-5세대 7600", "category": "CPU", "price": 250000, "link": "cpu"},
+]
+
+
+@pytest.fixture
+def index():
+    return NameIndex(ROWS)
+
+
+def test_exact_and_normalized_hits(index):
+    assert index.find("MSI 지포스 RTX 4060 벤투스 2X", ["VGA"])["link"] == "base"
+    assert index.find("msi 지포스 rtx-4060 벤투스 2x", ["VGA"])["link"] == "base"
+
+
+def test_normalized_match_stays_in_the_requested_category(index):
+    assert index.find("삼성전자 DDR5 5600 16GB", ["VGA"]) is None
+    assert index.find("삼성전자 DDR5 5600 16GB", ["RAM"])["link"] == "ram"
+
+
+def test_fuzzy_matching_is_off_by_default(index):
+    assert product_lookup.FUZZY_CUTOFF == 0
+    assert index.find("MSI 지포스 RTX 4060 벤투스2X OC", ["VGA"]) is None
+
+
+def test_fuzzy_hit_for_a_typo(index, monkeypatch):
+    monkeypatch.setattr(product_lookup, "FUZZY_CUTOFF", 0.9)
+    assert index.find("MSI 지포스 RTX 4060 벤투수 2X", ["VGA"])["link"] == "base"
+
+
+def test_fuzzy_never_maps_a_model_to_its_suffixed_sibling(monkeypatch):
+    # "RTX 4060" 과 "RTX 4060 Ti" 는 ratio 0.875 로 예전 cutoff(0.85)를 넘었음
+    candidates = {normalize_name("RTX 4060 Ti"): {"name": "RTX 4060 Ti"}}
+    assert fuzzy_match(normalize_name("RTX 4060"), [candidates], cutoff=0.85) is None
+    candidates = {normalize_name("라이젠5 7600X"): {"name": "라이젠5 7600X"}}
+    assert fuzzy_match(normalize_name("라이젠5 7500F"), [candidates], cutoff=0.5) is None
+
+
+def test_name_index_reloads_when_the_catalog_changes(tmp_path, monkeypatch):
+    path = str(tmp_path / "catalog.db")
+    create_catalog_db(path, [])
+    pool = SQLitePool(path)
+    monkeypatch.setattr(db_pool, "_pool", pool)
+    version = {"value": 1}
+    monkeypatch.setattr(product_lookup, "get_catalog_version", lambda: version["value"])
+    monkeypatch.setattr(product_lookup, "_index", None)
+    monkeypatch.setattr(product_lookup, "_signature", None)
+    monkeypatch.setattr(product_lookup, "NAME_CACHE_CHECK_INTERVAL", 3600)
+
+    def insert(name, price):
+        with pool.acquire() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "INSERT INTO product (fingerprint, name, category, spec, price, capacity, link) VALUES (%s, %s, %s, %s, %s, %s, %s)",
+                (name, name, "CPU", "", price, "", ""),
+            )
+            conn.commit()
+
+    insert("라이젠5 7600", 250000)
+    first = product_lookup.get_name_index()
+    assert product_lookup.lookup_products({"cpu": "라이젠5 7600"})["cpu"]["price"] == 250000
+
+    insert("라이젠7 7700", 350000)
+    assert product_lookup.get_name_index() is first   # 확인 주기 안 + 버전 그대로 → 다시 안 읽음
+
+    version["value"] = 2   # 크롤러가 버전을 올리면 주기와 상관없이 다시 확인
+    assert product_lookup.get_name_index() is not first
+    assert product_lookup.lookup_products({"cpu": "라이젠7 7700"})["cpu"]["price"] == 350000
@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+
+from app.services import ai_service, embedding_cache, response_cache
+from bench.fake_redis import FakeRedis
+
+PARSED = (1500000, "게임", None, None)
+ESTIMATE = {"cpu": {"name": "라이젠5 7600", "price": 250000}, "gpu": {"name": "RTX 4060", "price": 400000}, "total_price": 650000}
+
+VECTORS = {
+    "150만원 게임용 컴퓨터": [1.0, 0.0, 0.0],
+    "게임용 150만원 PC": [0.98, 0.2, 0.0],   # 코사인 ≈ 0.98
+    "150만원 게임 방송 겸용": [0.5, 0.0, 0.87],   # 코사인 ≈ 0.5
+}
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    version = {"value": 1}
+    monkeypatch.setattr(response_cache, "get_query_embedding", lambda text: VECTORS[text])
+    monkeypatch.setattr(response_cache, "get_catalog_version", lambda: version["value"])
+    monkeypatch.setattr(response_cache, "RESPONSE_CACHE_ENABLED", True)
+    monkeypatch.setattr(response_cache, "RESPONSE_CACHE_THRESHOLD", 0.9)
+    response_cache.flush_response_cache()
+    yield version
+    response_cache.flush_response_cache()
+
+
+def test_miss_then_hit_for_a_similar_question(cache):
+    assert response_cache.lookup("150만원 게임용 컴퓨터", PARSED, "llm") == (None, 0.0)
+    response_cache.store("150만원 게임용 컴퓨터", PARSED, "llm", ESTIMATE)
+
+    cached, score = response_cache.lookup("게임용 150만원 PC", PARSED, "llm")
+    assert cached == ESTIMATE and score > 0.9
+
+
+def test_dissimilar_question_or_other_conditions_miss(cache):
+    response_cache.store("150만원 게임용 컴퓨터", PARSED, "llm", ESTIMATE)
+
+    cached, score = response_cache.lookup("150만원 게임 방송 겸용", PARSED, "llm")
+    assert cached is None and score < 0.9
+    assert response_cache.lookup("150만원 게임용 컴퓨터", (2000000, "게임", None, None), "llm")[0] is None
+    assert response_cache.lookup("150만원 게임용 컴퓨터", PARSED, "solver_llm")[0] is None
+
+
+def test_catalog_version_bump_invalidates(cache):
+    response_cache.store("150만원 게임용 컴퓨터", PARSED, "llm", ESTIMATE)
+    cache["value"] = 2
+
+    assert response_cache.lookup("150만원 게임용 컴퓨터", PARSED, "llm")[0] is None
+    assert response_cache.response_cache_stats()["keys"] == 0
+
+
+def test_hit_is_re_enriched_with_current_prices(cache, monkeypatch):
+    response_cache.store("150만원 게임용 컴퓨터", PARSED, "llm", ESTIMATE)
+    current = {"cpu": {"name": "라이젠5 7600", "price": 230000, "link": "cpu"}, "gpu": {"name": "RTX 4060", "price": 390000, "link": "gpu"}}
+    monkeypatch.setattr(ai_service, "lookup_products", lambda parts: {k: dict(current[k]) for k in parts})
+    monkeypatch.setattr(ai_service, "parse_query", lambda text: PARSED)
+
+    result = asyncio.run(ai_service.lookup_cached_estimate("게임용 150만원 PC", "llm"))
+
+    assert result["cpu"]["price"] == 230000 and result["total_price"] == 620000
+    assert ESTIMATE["cpu"]["price"] == 250000   # 캐시에 있는 견적은 그대로
+    assert asyncio.run(ai_service.lookup_cached_estimate("게임용 150만원 PC", "llm", previous_estimate=ESTIMATE)) is None
+
+
+def test_question_embeddings_are_not_written_to_redis(monkeypatch):
+    client = FakeRedis()
+    monkeypatch.setattr(embedding_cache, "_redis", client)
+    embedding_cache.clear_memory()
+    calls = []
+
+    def fetch(text):
+        calls.append(text)
+        return [0.1, 0.2]
+
+    assert embedding_cache.get_cached_embedding("150만원 게임용", "m", fetch, persist=False) == [0.1, 0.2]
+    assert embedding_cache.get_cached_embedding("150만원 게임용", "m", fetch, persist=False) == [0.1, 0.2]
+    assert calls == ["150만원 게임용"]   # 같은 프로세스 안에서는 LRU 로 재사용
+    assert client.get(embedding_cache.cache_key("m", "150만원 게임용")) is None
+    embedding_cache.clear_memory()
@@ -0,0 +1,95 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.services import data_service
+from app.services.data_service import run_bounded, run_one_bounded
+
+
+def _sleep_then(seconds, value):
+    time.sleep(seconds)
+    return value
+
+
+def _fail():
+    raise RuntimeError("boom")
+
+
+def test_results_keep_input_order_and_failures_become_default():
+    errors = []
+    tasks = [("a", _sleep_then, (0.05, "A")), ("b", _fail, ()), ("c", _sleep_then, (0, "C"))]
+    assert run_bounded(tasks, 2, 1, default=[], errors=errors) == ["A", [], "C"]
+    assert errors == ["b"]
+
+
+def test_timeout_is_per_task_and_frees_the_slot():
+    # 한도 1: 첫 작업이 타임아웃으로 버려지면 다음 작업이 온전히 timeout 만큼 받는다
+    errors = []
+    tasks = [("slow", _sleep_then, (1, "slow")), ("next", _sleep_then, (0.15, "next"))]
+    started = time.monotonic()
+    assert run_bounded(tasks, 1, 0.2, errors=errors) == [None, "next"]
+    assert errors == ["slow"]
+    assert time.monotonic() - started < 0.6
+
+
+def test_queued_task_does_not_inherit_earlier_tasks_time():
+    errors = []
+    tasks = [("first", _sleep_then, (0.15, 1)), ("second", _sleep_then, (0.15, 2))]
+    assert run_bounded(tasks, 1, 0.2, errors=errors) == [1, 2]
+    assert errors == []
+
+
+def test_run_one_bounded_swallows_errors_like_the_concurrent_path():
+    errors = []
+    assert run_one_bounded("mysql", _fail, (), 1, default=[], errors=errors) == []
+    assert run_one_bounded("slow", _sleep_then, (1, "x"), 0.1, default=[], errors=errors) == []
+    assert errors == ["mysql", "slow"]
+
+
+@pytest.fixture
+def one_worker(monkeypatch):
+    executor = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(data_service, "_hint_executor", executor)
+    yield executor
+    executor.shutdown(wait=True)
+
+
+def test_abandoned_work_does_not_eat_the_next_calls_budget(one_worker):
+    # 앞 호출이 버린 작업이 풀 자리를 잡고 있어도, 다음 호출의 타임아웃은 실제 시작부터 잰다
+    errors = []
+    assert run_bounded([("stuck", _sleep_then, (0.3, "stuck"))], 1, 0.05, errors=errors) == [None]
+    assert run_bounded([("next", _sleep_then, (0.1, "next"))], 1, 0.2, errors=errors) == ["next"]
+    assert errors == ["stuck"]
+
+
+def test_queue_wait_is_capped(one_worker, monkeypatch):
+    monkeypatch.setattr(data_service, "HINT_QUEUE_TIMEOUT", 0.05)
+    errors = []
+    run_bounded([("stuck", _sleep_then, (0.3, "stuck"))], 1, 0.01, errors=errors)
+    assert run_bounded([("queued", _sleep_then, (0, "queued"))], 1, 1, default=[], errors=errors) == [[]]
+    assert errors == ["stuck", "queued"]
+
+
+def test_pool_bounds_work_across_concurrent_calls(monkeypatch):
+    executor = ThreadPoolExecutor(max_workers=2)
+    monkeypatch.setattr(data_service, "_hint_executor", executor)
+    lock = threading.Lock()
+    active = {"now": 0, "max": 0}
+
+    def tracked():
+        with lock:
+            active["now"] += 1
+            active["max"] = max(active["max"], active["now"])
+        time.sleep(0.05)
+        with lock:
+            active["now"] -= 1
+
+    callers = [
+        threading.Thread(target=run_bounded, args=([("t", tracked, ())] * 3, 3, 1)) for _ in range(3)
+    ]
+    for t in callers: t.start()
+    for t in callers: t.join()
+    executor.shutdown(wait=True)
+    assert active["max"] == 2
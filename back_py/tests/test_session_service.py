@@ -0,0 +1,103 @@
+import asyncio
+import json
+
+import pytest
+
+from app.services import session_service
+from app.services.session_service import (
+    SESSION_MAX_MESSAGES, append_messages, get_last_estimate, get_messages, legacy_key,
+)
+from bench.fake_redis import FakeAsyncRedis, FakeRedisStore
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def estimate(name):
+    return {"cpu": {"name": name}, "gpu": {"name": "RTX 4060"}, "total_price": 1}
+
+
+def turn(question, answer):
+    return [("user", question), ("assistant", json.dumps(answer, ensure_ascii=False))]
+
+
+@pytest.fixture
+def store(monkeypatch):
+    store = FakeRedisStore()
+    monkeypatch.setattr(session_service, "r", FakeAsyncRedis(store, decode_responses=True))
+    return store
+
+
+def test_last_estimate_is_a_single_lookup(store):
+    run(append_messages("s", turn("견적", estimate("A")), estimate("A")))
+    run(append_messages("s", turn("고마워", {"message": "네"})))
+    assert run(get_last_estimate("s")) == estimate("A")
+
+
+def test_last_estimate_expires_with_the_trimmed_history(store):
+    run(append_messages("s", turn("견적", estimate("A")), estimate("A")))
+    for i in range((SESSION_MAX_MESSAGES - 2) // 2):
+        run(append_messages("s", turn(f"질문 {i}", {"message": "답"})))
+    assert run(get_last_estimate("s")) == estimate("A")          # 견적 메시지가 아직 최근 20개 안
+
+    run(append_messages("s", turn("하나 더", {"message": "답"})))
+    assert estimate("A") not in [json.loads(m["content"]) for m in run(get_messages("s")) if m["role"] == "assistant"]
+    assert run(get_last_estimate("s")) is None                   # 기록에서 잘려 나가면 이전 견적도 없음
+
+
+def test_legacy_history_is_migrated_on_first_write(store):
+    legacy = [{"role": r, "content": c} for r, c in turn("예전 견적", estimate("OLD")) + turn("예전 질문", {"message": "답"})]
+    run(session_service.r.set(legacy_key("s"), json.dumps(legacy, ensure_ascii=False)))
+    assert run(get_last_estimate("s")) == estimate("OLD")
+
+    run(append_messages("s", turn("새 질문", {"message": "새 답"})))
+
+    messages = run(get_messages("s"))
+    assert messages[:4] == legacy and messages[4]["content"] == "새 질문"
+    assert run(session_service.r.get(legacy_key("s"))) is None
+    assert run(get_last_estimate("s")) == estimate("OLD")        # 옮긴 뒤에도 이전 견적 유지
+
+
+def test_new_estimate_replaces_migrated_one(store):
+    legacy = [{"role": r, "content": c} for r, c in turn("예전 견적", estimate("OLD"))]
+    run(session_service.r.set(legacy_key("s"), json.dumps(legacy, ensure_ascii=False)))
+
+    run(append_messages("s", turn("새 견적", estimate("NEW")), estimate("NEW")))
+    assert run(get_last_estimate("s")) == estimate("NEW")
+
+
+def test_unknown_session_is_empty(store):
+    assert run(get_messages("none")) == []
+    assert run(get_last_estimate("none")) is None
+
+
+class LegacyCounter:
+    """세션 Redis 호출 중 예전 키(get/getdel) 접근만 셈"""
+
+    def __init__(self, client):
+        self.client = client
+        self.legacy_calls = []
+
+    def __getattr__(self, name):
+        method = getattr(self.client, name)
+        if name not in ("get", "getdel"):
+            return method
+
+        async def call(key, *args, **kwargs):
+            if key.startswith("chat:") and not key.startswith("chat:v2:"):
+                self.legacy_calls.append(name)
+            return await method(key, *args, **kwargs)
+        return call
+
+
+def test_legacy_key_is_not_touched_after_migration(store, monkeypatch):
+    counter = LegacyCounter(session_service.r)
+    monkeypatch.setattr(session_service, "r", counter)
+
+    run(append_messages("s", turn("질문", {"message": "답"})))
+    assert counter.legacy_calls == ["getdel"]                   # 첫 쓰기에서 한 번 확인
+
+    run(append_messages("s", turn("또 질문", {"message": "답"})))
+    assert run(get_last_estimate("s")) is None                   # 견적 없는 세션도 예전 키 조회 없음
+    assert counter.legacy_calls == ["getdel"]
@@ -0,0 +1,95 @@
+import asyncio
+import threading
+import time
+
+from app.services.single_flight import AsyncSingleFlight, SingleFlight
+
+
+def wait_for_coalesced(flight, count, timeout=2):
+    deadline = time.monotonic() + timeout
+    while flight.stats()["coalesced"] < count and time.monotonic() < deadline:
+        time.sleep(0.001)
+
+
+def test_followers_share_the_leaders_result():
+    flight = SingleFlight("test_shared_result")
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def work():
+        calls.append(1)
+        started.set()
+        release.wait(2)
+        return {"value": 42}
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flight.do("k", work)))
+    leader.start()
+    started.wait(2)
+    followers = [threading.Thread(target=lambda: results.append(flight.do("k", work))) for _ in range(3)]
+    for t in followers:
+        t.start()
+    wait_for_coalesced(flight, 3)
+    release.set()
+    for t in [leader, *followers]:
+        t.join(2)
+
+    assert calls == [1]
+    assert results == [{"value": 42}] * 4
+    assert flight.stats()["executed"] == 1 and flight.in_flight() == 0
+
+
+def test_leader_failure_reaches_followers_and_is_not_remembered():
+    flight = SingleFlight("test_leader_failure")
+    started, release = threading.Event(), threading.Event()
+
+    def fail():
+        started.set()
+        release.wait(2)
+        raise RuntimeError("chroma down")
+
+    errors = []
+
+    def call():
+        try:
+            flight.do("k", fail)
+        except RuntimeError as e:
+            errors.append(str(e))
+
+    leader = threading.Thread(target=call)
+    leader.start()
+    started.wait(2)
+    follower = threading.Thread(target=call)
+    follower.start()
+    wait_for_coalesced(flight, 1)
+    release.set()
+    leader.join(2)
+    follower.join(2)
+
+    assert errors == ["chroma down", "chroma down"]
+    stats = flight.stats()
+    assert stats["failures"] == 1 and stats["shared_failures"] == 1 and stats["in_flight"] == 0
+
+    # 실패는 남기지 않으므로 다음 호출은 새로 실행
+    assert flight.do("k", lambda: "ok") == "ok"
+    assert flight.stats()["executed"] == 2
+
+
+def test_async_leader_failure_reaches_followers():
+    flight = AsyncSingleFlight("test_async_leader_failure")
+    calls = []
+
+    async def fail():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise ValueError("llm error")
+
+    async def main():
+        return await asyncio.gather(*[flight.do("k", fail) for _ in range(3)], return_exceptions=True)
+
+    results = asyncio.run(main())
+
+    assert calls == [1]
+    assert all(isinstance(r, ValueError) for r in results)
+    assert flight.stats()["failures"] == 1 and flight.stats()["shared_failures"] == 2
+    assert flight.in_flight() == 0
@@ -0,0 +1,79 @@
+import pytest
+
+from app.services.spec_parser import EMPTY_ATTRIBUTES, cpu_brand, cpu_socket, find_chipset, parse_spec_attributes
+
+
+def parse(part, category, name, spec=""):
+    return parse_spec_attributes(part, category, name.upper(), spec.upper())
+
+
+@pytest.mark.parametrize("name, spec, socket", [
+    ("AMD 라이젠5-4세대 5600 (버미어)", "", "AM4"),
+    ("AMD 라이젠7-6세대 9800X3D", "", "AM5"),
+    ("AMD 라이젠5-4세대 5600", "AMD(소켓AM5)", "AM5"),               # 스펙의 소켓이 이름 추정보다 우선
+    ("인텔 코어i7-10세대 10700", "", "LGA1200"),
+    ("인텔 코어i5-14세대 14400F", "", "LGA1700"),
+    ("인텔 코어i5-12세대 12400F", "인텔(소켓1700) / 6코어", "LGA1700"),
+    ("인텔 코어 울트라5 시리즈2 245K", "", "LGA1851"),
+    ("이름만 있는 CPU", "", ""),
+])
+def test_cpu_socket(name, spec, socket):
+    assert parse("cpu", "CPU", name, spec)["socket"] == socket
+
+
+def test_cpu_brand_and_socket_helpers():
+    assert cpu_brand("AMD RYZEN 5 7600") == "amd"
+    assert cpu_brand("인텔 코어I5") == "intel"
+    assert cpu_brand("알 수 없음") is None
+    assert cpu_socket("1234", None) is None
+
+
+@pytest.mark.parametrize("name, spec, chipset, socket, form_factor", [
+    ("MSI PRO B760M-A WIFI D4", "인텔(소켓1700) / B760 / M-ATX (24.4x24.4cm)", "B760", "LGA1700", "M-ATX"),
+    ("GIGABYTE X870E AORUS", "E-ATX / DDR5", "X870", "AM5", "E-ATX"),
+    ("ASRock B550M Pro4", "MICRO-ATX", "B550", "AM4", "M-ATX"),
+    ("ASUS ROG STRIX 보드", "AMD B650 / ATX", "B650", "AM5", "ATX"),   # 이름에 없으면 스펙에서 칩셋
+    ("MSI MAG A999", "", "", "", ""),                                # 모르는 칩셋은 비움
+])
+def test_board_attributes(name, spec, chipset, socket, form_factor):
+    attrs = parse("mboard", "MBoard_amd", name, spec)
+    assert (attrs["chipset"], attrs["socket"], attrs["form_factor"]) == (chipset, socket, form_factor)
+
+
+def test_chipset_is_not_taken_from_longer_model_numbers():
+    assert find_chipset("RTX B7600") == ""
+    assert find_chipset("AB650") == ""
+    assert find_chipset("B650M") == "B650"
+
+
+@pytest.mark.parametrize("category, name, spec, storage_if", [
+    ("SSD", "삼성 990 PRO", "M.2 / NVME", "NVME"),
+    ("SSD", "WD Blue SA510", "2.5형 / SATA3", "SATA"),
+    ("SSD", "이름만 있는 SSD", "", ""),
+    ("HDD", "WD BLUE 4TB", "", "SATA"),   # HDD 는 표기가 없어도 SATA
+])
+def test_storage_interface(category, name, spec, storage_if):
+    assert parse("ssd" if category == "SSD" else None, category, name, spec)["storage_if"] == storage_if
+
+
+@pytest.mark.parametrize("name, spec, wattage, form_factor", [
+    ("시소닉 FOCUS GX-750 GOLD", "ATX 파워 / 정격출력 750W / 80 PLUS 골드", 750, "ATX"),
+    ("마이크로닉스 Classic II 600W", "정격출력 500W", 600, ""),      # 이름의 W 가 우선
+    ("SilverStone SX700-PT", "SFX 파워 / 정격출력 700W", 700, "SFX"),
+    ("Corsair SF750", "SFX-L / ATX12V 750 W", 750, "SFX-L"),
+    ("이름만 있는 파워", "", 0, ""),
+])
+def test_power_attributes(name, spec, wattage, form_factor):
+    attrs = parse("power", "Power", name, spec)
+    assert (attrs["wattage"], attrs["form_factor"]) == (wattage, form_factor)
+
+
+def test_case_keeps_the_largest_supported_board():
+    assert parse("case", "Case", "NZXT H5", "미들타워 / ATX / M-ATX / M-ITX")["form_factor"] == "ATX"
+    assert parse("case", "Case", "빅타워", "EATX / ATX")["form_factor"] == "E-ATX"
+    assert parse("case", "Case", "미니", "MINI-ITX")["form_factor"] == "M-ITX"
+
+
+def test_unrelated_parts_get_empty_attributes():
+    assert parse("gpu", "VGA", "RTX 4060 AM5 B650 750W ATX") == EMPTY_ATTRIBUTES
+    assert parse(None, "알 수 없음", "") == EMPTY_ATTRIBUTES
@@ -0,0 +1,35 @@
+import pytest
+
+from app.services import token_utils
+
+
+@pytest.fixture
+def fresh(monkeypatch):
+    monkeypatch.setattr(token_utils, "_encodings", {})
+    monkeypatch.setattr(token_utils, "_lazy_load", {"enabled": True})
+    loads = []
+
+    def fake_load(model):
+        loads.append(model)
+        return None   # tiktoken 없음 / 다운로드 실패와 같은 상태
+    monkeypatch.setattr(token_utils, "_load_encoding", fake_load)
+    return loads
+
+
+def test_heuristic_counts_korean_per_char_and_ascii_per_four():
+    assert token_utils.estimate_tokens("abcdefgh") == 2
+    assert token_utils.estimate_tokens("견적 abcd") == 4
+
+
+def test_encodings_load_once_at_warmup_and_never_on_the_request_path(fresh):
+    assert token_utils.warm_encodings("gpt-4o-mini") == {"gpt-4o-mini": False}
+
+    assert token_utils.count_tokens("abcdefgh", "gpt-4o-mini") == 2
+    assert token_utils.count_tokens("abcdefgh", "other-model") == 2   # 미리 안 읽은 모델 → 근사값
+    assert fresh == ["gpt-4o-mini"]
+
+
+def test_without_warmup_scripts_load_lazily_once(fresh):
+    token_utils.count_tokens("a", "m")
+    token_utils.count_tokens("b", "m")
+    assert fresh == ["m"]
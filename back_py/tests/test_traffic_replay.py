@@ -0,0 +1,49 @@
+import json
+import time
+
+from app.services import traffic_recorder
+from bench.replay import load_records
+
+
+def write_log(path, records):
+    path.write_text("".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records), encoding="utf-8")
+
+
+def test_recorder_writes_absolute_arrival_time_only(tmp_path, monkeypatch):
+    log = tmp_path / "traffic.jsonl"
+    monkeypatch.setattr(traffic_recorder, "TRAFFIC_RECORD_PATH", str(log))
+    monkeypatch.setattr(traffic_recorder, "_file", None)
+
+    before = time.time()
+    traffic_recorder.record_request("/ai/query", "sid", "010-1234-5678 로 연락", 200, time.monotonic() - 0.5, 500)
+    traffic_recorder._file.close()
+
+    (record,) = [json.loads(line) for line in log.read_text(encoding="utf-8").splitlines()]
+    assert "t" not in record
+    assert before - 0.6 < record["ts"] < before
+    assert record["message"] == "<phone> 로 연락"
+
+
+def test_replay_orders_by_ts_across_workers(tmp_path):
+    # 워커 두 개가 같은 세션을 나눠 받아 각자 turn 1 로 기록한 경우
+    log = tmp_path / "traffic.jsonl"
+    write_log(log, [
+        {"ts": 1000.5, "session": "a", "turn": 1, "path": "/ai/query", "message": "두 번째"},
+        {"ts": 1000.0, "session": "a", "turn": 1, "path": "/ai/query", "message": "첫 번째"},
+        {"ts": 1002.25, "session": "b", "turn": 1, "path": "/ai/query", "message": "다른 세션"},
+    ])
+
+    records = load_records(str(log))
+
+    assert [(r["message"], r["t"], r["turn"]) for r in records] == [
+        ("첫 번째", 0.0, 1), ("두 번째", 0.5, 2), ("다른 세션", 2.25, 1),
+    ]
+
+
+def test_replay_reads_old_logs_with_relative_t(tmp_path):
+    log = tmp_path / "old.jsonl"
+    write_log(log, [
+        {"t": 12.0, "session": "a", "turn": 2, "path": "/ai/query", "message": "b"},
+        {"t": 10.0, "session": "a", "turn": 1, "path": "/ai/query", "message": "a"},
+    ])
+    assert [(r["message"], r["t"]) for r in load_records(str(log))] == [("a", 0.0), ("b", 2.0)]
@@ -0,0 +1,64 @@
+import uuid
+
+import chromadb
+import pytest
+
+from app.services import data_service
+
+DOCS = [
+    # (id, name, category, price, 임베딩 문장)
+    ("c1", "AMD 라이젠5 7600", "CPU", 250000, "AMD 라이젠5 7600 AMD(소켓AM5) / 6코어"),
+    ("c2", "인텔 코어i5-14세대 14400F", "CPU", 230000, "인텔 코어i5 14400F 인텔(소켓1700)"),
+    ("c3", "써멀라이트 CPU 쿨러 FAN", "CPU", 240000, "CPU 쿨러"),
+    ("b1", "ASRock B650M Pro RS", "MBoard_amd", 180000, "AMD(소켓AM5) / B650 / M-ATX / DDR5"),
+    ("b2", "ASRock B550M Pro4", "MBoard_amd", 120000, "AMD(소켓AM4) / B550 / M-ATX / DDR4"),
+]
+
+
+@pytest.fixture
+def collection(monkeypatch):
+    client = chromadb.EphemeralClient()
+    collection = client.create_collection(f"products_{uuid.uuid4().hex[:8]}")
+    # 분류 키(is_accessory 등)가 없는 예전 형식 메타데이터
+    collection.add(
+        ids=[d[0] for d in DOCS],
+        embeddings=[[1.0, 0.0, float(i), 0.5] for i in range(len(DOCS))],
+        metadatas=[{"name": d[1], "category": d[2], "price": d[3], "link": ""} for d in DOCS],
+        documents=[d[4] for d in DOCS],
+    )
+    monkeypatch.setattr(data_service, "_chroma_collection", collection)
+    monkeypatch.setattr(data_service, "_unclassified", {"count": None})
+    return collection
+
+
+def query(category, keyword=None, sockets=None, n=8):
+    return data_service._query_chroma("q", category, 0, 99999999, keyword, n, [1.0, 0.0, 0.0, 0.5], sockets)
+
+
+def test_unclassified_docs_are_still_retrieved_and_filtered(collection):
+    cpus = query("CPU")
+    assert sorted(item["name"] for item in cpus) == ["AMD 라이젠5 7600", "인텔 코어i5-14세대 14400F"]   # 쿨러는 제외
+
+    boards = query("MBoard_amd", "DDR5", sockets=["AM5"])
+    assert [item["name"] for item in boards] == ["ASRock B650M Pro RS"]
+    assert boards[0]["socket"] == "AM5"
+
+
+def test_batch_path_uses_the_same_fallback(collection):
+    requests = [{
+        "query_embedding": [1.0, 0.0, 0.0, 0.5], "category_filter": "CPU", "min_price": 0, "max_price": 99999999,
+        "keyword_filter": None, "n_results": 8,
+    }]
+    (items,) = data_service.get_chroma_products_batch(requests, concurrency=2, timeout=5)
+    assert len(items) == 2
+
+
+def test_backfill_classifies_docs_in_place(collection):
+    assert data_service.unclassified_docs() == len(DOCS)
+
+    assert data_service.backfill_unclassified() == len(DOCS)
+
+    assert data_service.unclassified_docs() == 0
+    meta = collection.get(ids=["b2"], include=["metadatas"])["metadatas"][0]
+    assert (meta["mem_gen"], meta["socket"], meta["is_accessory"]) == ("DDR4", "AM4", 0)
+    assert len(query("CPU")) == 2   # 분류된 뒤에는 where 절만으로 같은 결과
@@ -0,0 +1,166 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app", "crawler"))
+
+from app.crawler import vector_utils
+from app.crawler.vector_utils import chunk_documents, ingest_documents
+
+
+class FakeCollection:
+    def __init__(self):
+        self.upserts = []
+
+    def upsert(self, ids, embeddings, metadatas, documents):
+        assert len(ids) == len(embeddings) == len(metadatas) == len(documents)
+        self.upserts.append(ids)
+
+
+def test_chunks_respect_token_and_doc_limits(monkeypatch):
+    monkeypatch.setattr(vector_utils, "count_tokens", lambda text: len(text))
+    texts = ["aaaa", "bbbb", "cc", "dddddddddd", "e", "f", "g"]
+
+    chunks = chunk_documents(texts, max_tokens=8, max_docs=2)
+
+    assert chunks == [([0, 1], 8), ([2], 2), ([3], 10), ([4, 5], 2), ([6], 1)]   # 한도보다 긴 문장도 혼자 한 청크
+    assert [i for idx, _ in chunks for i in idx] == list(range(len(texts)))
+
+
+def test_failed_chunk_is_skipped_and_retries_are_bounded(monkeypatch):
+    collection = FakeCollection()
+    attempts = {}
+
+    def fake_embeddings(texts):
+        attempts[texts[0]] = attempts.get(texts[0], 0) + 1
+        if texts[0] == "bad":
+            raise RuntimeError("429")
+        if texts[0] == "flaky" and attempts[texts[0]] == 1:
+            raise RuntimeError("timeout")
+        return [[0.0] for _ in texts]
+
+    monkeypatch.setattr(vector_utils, "collection", collection)
+    monkeypatch.setattr(vector_utils, "get_openai_embeddings", fake_embeddings)
+    monkeypatch.setattr(vector_utils, "EMBED_BACKOFF", 0)
+    monkeypatch.setattr(vector_utils, "chunk_documents", lambda texts: chunk_documents(texts, max_docs=2))
+
+    texts = ["ok", "ok2", "bad", "bad2", "flaky", "flaky2"]
+    stats = ingest_documents([f"id{i}" for i in range(6)], texts, [{}] * 6, concurrency=3)
+
+    assert stats["docs"] == 4 and stats["chunks"] == 2
+    assert stats["failed_chunks"] == 1 and stats["failed_docs"] == 2
+    assert sorted(sorted(ids) for ids in collection.upserts) == [["id0", "id1"], ["id4", "id5"]]
+    assert attempts["bad"] == vector_utils.EMBED_MAX_RETRIES + 1
+    assert attempts["flaky"] == 2
+
+
+def test_empty_input_does_nothing():
+    assert ingest_documents([], [], [])["docs"] == 0
+
+
+class StoreCollection:
+    """save_to_vector_db 가 쓰는 get / upsert / update / delete 만 흉내 내는 메모리 컬렉션"""
+
+    def __init__(self):
+        self.docs = {}   # id → {"metadata", "document"}
+        self.calls = []
+
+    def get(self, where, include):
+        cond = where["category"]
+        categories = cond["$in"] if isinstance(cond, dict) else [cond]
+        ids = [id_ for id_, d in self.docs.items() if d["metadata"]["category"] in categories]
+        return {
+            "ids": ids,
+            "metadatas": [dict(self.docs[i]["metadata"]) for i in ids],
+            "documents": [self.docs[i]["document"] for i in ids],
+        }
+
+    def upsert(self, ids, embeddings, metadatas, documents):
+        self.calls.append(("upsert", sorted(ids)))
+        for id_, meta, doc in zip(ids, metadatas, documents):
+            self.docs[id_] = {"metadata": dict(meta), "document": doc}
+
+    def update(self, ids, metadatas):
+        self.calls.append(("update", sorted(ids)))
+        for id_, meta in zip(ids, metadatas):
+            self.docs[id_]["metadata"] = dict(meta)
+
+    def delete(self, ids):
+        self.calls.append(("delete", sorted(ids)))
+        for id_ in ids:
+            del self.docs[id_]
+
+
+def _product(id_, name, price=100000, spec="스펙"):
+    return {"id": id_, "name": name, "category": "CPU", "price": price, "link": "", "spec": spec}
+
+
+CATALOG = [_product(f"p{i}", f"CPU {i}") for i in range(4)]
+
+
+@pytest.fixture
+def store(monkeypatch):
+    collection = StoreCollection()
+    embedded = []
+
+    def fake_embeddings(texts):
+        embedded.extend(texts)
+        if any("실패" in t for t in texts):
+            raise RuntimeError("429")
+        return [[0.0] for _ in texts]
+
+    monkeypatch.setattr(vector_utils, "collection", collection)
+    monkeypatch.setattr(vector_utils, "get_openai_embeddings", fake_embeddings)
+    monkeypatch.setattr(vector_utils, "EMBED_BACKOFF", 0)
+    monkeypatch.setattr(vector_utils, "chunk_documents", lambda texts: chunk_documents(texts, max_docs=1))
+    vector_utils.save_to_vector_db(CATALOG)
+    collection.calls.clear()
+    embedded.clear()
+    collection.embedded = embedded
+    return collection
+
+
+def test_unchanged_products_are_not_touched(store):
+    summary = vector_utils.save_to_vector_db(CATALOG)
+
+    assert summary["unchanged"] == 4 and summary["new"] == summary["reembedded"] == summary["metadata_updated"] == 0
+    assert store.calls == [] and store.embedded == []
+
+
+def test_price_change_updates_metadata_without_embedding(store):
+    summary = vector_utils.save_to_vector_db([_product("p0", "CPU 0", price=90000)] + CATALOG[1:])
+
+    assert summary["metadata_updated"] == 1 and summary["unchanged"] == 3
+    assert store.calls == [("update", ["p0"])] and store.embedded == []
+    assert store.docs["p0"]["metadata"]["price"] == 90000
+
+
+def test_changed_text_is_reembedded_and_new_ids_are_added(store):
+    summary = vector_utils.save_to_vector_db([_product("p0", "CPU 0", spec="새 스펙")] + CATALOG[1:] + [_product("p9", "CPU 9")])
+
+    assert (summary["reembedded"], summary["new"], summary["unchanged"]) == (1, 1, 3)
+    assert sorted(call for call in store.calls if call[0] == "upsert") == [("upsert", ["p0"]), ("upsert", ["p9"])]
+
+
+def test_only_stored_documents_are_counted(store):
+    summary = vector_utils.save_to_vector_db(CATALOG + [_product("p8", "CPU 8"), _product("p9", "실패 CPU")])
+
+    assert (summary["new"], summary["embed_failed"]) == (1, 1)
+    assert "p9" not in store.docs
+
+
+def test_missing_ids_are_pruned(store):
+    summary = vector_utils.save_to_vector_db(CATALOG[:3])
+
+    assert summary["removed"] == 1
+    assert ("delete", ["p3"]) in store.calls and "p3" not in store.docs
+
+
+def test_partial_crawl_skips_pruning(store, monkeypatch):
+    monkeypatch.setattr(vector_utils, "VECTOR_PRUNE_MIN_RATIO", 0.5)
+    summary = vector_utils.save_to_vector_db(CATALOG[:1])   # 기존의 25% → 부분 크롤링으로 봄
+
+    assert summary["removed"] == 0 and len(store.docs) == 4
+    assert not any(call[0] == "delete" for call in store.calls)
+    assert vector_utils.save_to_vector_db(CATALOG[:1], prune=False)["removed"] == 0
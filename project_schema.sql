@@ -33,9 +33,18 @@ CREATE TABLE `product` (
   `link` varchar(512) DEFAULT NULL,
   `source` varchar(50) DEFAULT 'danawa',
   `updated_at` datetime DEFAULT CURRENT_TIMESTAMP,
+  `is_accessory` tinyint(1) NOT NULL DEFAULT '0',
+  `mem_gen` varchar(8) NOT NULL DEFAULT '',
+  `is_nvme` tinyint(1) NOT NULL DEFAULT '0',
+  `socket` varchar(16) NOT NULL DEFAULT '',
+  `chipset` varchar(16) NOT NULL DEFAULT '',
+  `storage_if` varchar(8) NOT NULL DEFAULT '',
+  `wattage` smallint unsigned NOT NULL DEFAULT '0',
+  `form_factor` varchar(8) NOT NULL DEFAULT '',
   PRIMARY KEY (`id`),
   UNIQUE KEY `uq_fingerprint` (`fingerprint`),
-  KEY `idx_category_price` (`category`,`price`)
+  KEY `idx_category_price` (`category`,`price`),
+  KEY `idx_name` (`name`)
 ) ENGINE=InnoDB AUTO_INCREMENT=10622 DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 /*!40101 SET character_set_client = @saved_cs_client */;
 